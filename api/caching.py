@@ -0,0 +1,88 @@
+import time
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.db import transaction
+
+DASHBOARD_CACHE_TIMEOUT = getattr(settings, "DASHBOARD_CACHE_TIMEOUT", 300)
+SINGLE_FLIGHT_LOCK_TIMEOUT = getattr(settings, "SINGLE_FLIGHT_LOCK_TIMEOUT", 30)
+SINGLE_FLIGHT_POLL_INTERVAL = 0.05
+
+# Versions and locks must not be culled along with cached results
+COORDINATION_CACHE = "coordination"
+
+_MISSING = object()
+
+
+def _data_version_key(buyer_id):
+    return f"buyer:{buyer_id}:data-version"
+
+
+def get_buyer_data_version(buyer_id):
+    """
+        Return the current data version of a buyer.
+        A missing version is seeded from the clock so it never repeats an old one.
+    """
+    key = _data_version_key(buyer_id)
+    versions = caches[COORDINATION_CACHE]
+    version = versions.get(key)
+    if version is None:
+        versions.add(key, time.time_ns(), None)
+        version = versions.get(key)
+    return version
+
+
+def bump_buyer_data_version(buyer_id):
+    if not buyer_id:
+        return
+    key = _data_version_key(buyer_id)
+    versions = caches[COORDINATION_CACHE]
+    try:
+        versions.incr(key)
+    except ValueError:
+        versions.add(key, time.time_ns(), None)
+
+
+def bump_buyer_data_version_on_commit(buyer_id):
+    """
+        Invalidate the buyer's cached results once the current transaction commits,
+        so no reader can cache pre-commit data under the new version.
+    """
+    transaction.on_commit(lambda: bump_buyer_data_version(buyer_id))
+
+
+def buyer_cache_key(buyer_id, namespace, *parts):
+    version = get_buyer_data_version(buyer_id)
+    return ":".join(str(part) for part in (namespace, buyer_id, version, *parts))
+
+
+def get_or_compute(key, compute, timeout=DASHBOARD_CACHE_TIMEOUT, lock_timeout=SINGLE_FLIGHT_LOCK_TIMEOUT):
+    """
+        Return the cached value of `key`, computing it at most once across
+        concurrent callers: the first caller takes a lock and computes while the
+        others wait for its result, falling back to computing it themselves if
+        the lock holder fails or takes longer than `lock_timeout` seconds.
+    """
+    value = cache.get(key, _MISSING)
+    if value is not _MISSING:
+        return value
+
+    lock_key = f"{key}:lock"
+    locks = caches[COORDINATION_CACHE]
+    if locks.add(lock_key, 1, lock_timeout):
+        try:
+            value = compute()
+            cache.set(key, value, timeout)
+            return value
+        finally:
+            locks.delete(lock_key)
+
+    deadline = time.monotonic() + lock_timeout
+    while time.monotonic() < deadline:
+        time.sleep(SINGLE_FLIGHT_POLL_INTERVAL)
+        value = cache.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+        if locks.get(lock_key) is None:
+            break
+    return compute()
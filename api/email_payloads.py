@@ -0,0 +1,135 @@
+from collections import defaultdict
+
+from django.conf import settings
+
+from api.helper import EmailManager, format_date_for_timezone, get_buyer_timezone
+from api.models import (
+    RequestForQuotation,
+    RequestForQuotationItemResponse,
+    RequestForQuotationItems,
+    RequestForQuotationMetaData,
+    Supplier,
+)
+
+
+def _display_quantity(value):
+    if value is not None and float(value).is_integer():
+        return int(value)
+    return value
+
+
+def rfq_created_email_objs(invitations):
+    """
+        RFQ created emails for (rfq_id, supplier_id) pairs, loaded in the
+        worker with one query each for the RFQs, their items and the
+        suppliers. The result lines up with `invitations`; a pair whose RFQ
+        or supplier no longer exists gives None.
+    """
+    invitations = [(int(rfq_id), str(supplier_id)) for rfq_id, supplier_id in invitations]
+    rfqs = RequestForQuotation.objects.select_related("buyer__user").in_bulk({rfq_id for rfq_id, _ in invitations})
+    suppliers = {
+        str(supplier.id): supplier
+        for supplier in Supplier.objects.filter(id__in={supplier_id for _, supplier_id in invitations})
+    }
+    items = defaultdict(list)
+    for item in RequestForQuotationItems.objects.filter(request_for_quotation_id__in=rfqs.keys()).order_by("id"):
+        rfq = rfqs[item.request_for_quotation_id]
+        items[rfq.id].append(
+            {
+                "product_name": item.product_name,
+                "quantity": _display_quantity(item.quantity),
+                "uom": item.uom,
+                "specifications": item.specifications,
+                "expected_delivery_date": format_date_for_timezone(
+                    item.expected_delivery_date, get_buyer_timezone(rfq.buyer)
+                ),
+            }
+        )
+
+    email_objs = []
+    for rfq_id, supplier_id in invitations:
+        rfq = rfqs.get(rfq_id)
+        supplier = suppliers.get(supplier_id)
+        if not rfq or not supplier:
+            email_objs.append(None)
+            continue
+        buyer = rfq.buyer
+        email_objs.append(
+            {
+                "to": [supplier.email],
+                "cc": [],
+                "bcc": [],
+                "subject": f"New Quotation Requested From {buyer.company_name if buyer.company_name else buyer.user.first_name} ",
+                "items": items[rfq_id],
+                "rfq_id": rfq_id,
+                "total_no_of_items": len(items[rfq_id]),
+                "url": f"{settings.FRONTEND_URL}/rfq-response/{rfq_id}/{supplier_id}",
+                "supplier_name": supplier.company_name,
+                "company_name": buyer.company_name,
+            }
+        )
+    return email_objs
+
+
+def purchase_order_email_objs(response_ids):
+    """
+        Purchase order emails for placed responses, one per supplier and RFQ
+        listing every item ordered, loaded with one query for the responses
+        and one for the RFQ terms.
+    """
+    responses = (
+        RequestForQuotationItemResponse.objects.filter(
+            id__in=response_ids,
+            order_status=RequestForQuotationItemResponse.ORDER_PLACED,
+            supplier__isnull=False,
+        )
+        .select_related("supplier", "request_for_quotation_item__request_for_quotation__buyer__user")
+        .order_by("id")
+    )
+    orders = {}
+    for response in responses:
+        rfq_item = response.request_for_quotation_item
+        orders.setdefault((rfq_item.request_for_quotation_id, response.supplier_id), []).append(response)
+    # The RFQ's terms are its latest metadata row
+    meta_data = {
+        meta.request_for_quotation_id: meta
+        for meta in RequestForQuotationMetaData.objects.filter(
+            request_for_quotation_id__in={rfq_id for rfq_id, _ in orders}
+        ).order_by("id")
+    }
+
+    email_objs = []
+    for (rfq_id, _), lines in orders.items():
+        supplier = lines[0].supplier
+        buyer = lines[0].request_for_quotation_item.request_for_quotation.buyer
+        meta = meta_data.get(rfq_id)
+        currency = buyer.currency if buyer.currency else "(currency not set)"
+        email_objs.append(
+            {
+                "to": [supplier.email],
+                "cc": [buyer.user.email],
+                "subject": f"Purchase order from {buyer.company_name}",
+                "supplier_name": supplier.company_name,
+                "items": [
+                    {
+                        "product_name": response.request_for_quotation_item.product_name,
+                        "quantity": str(response.bought_quantity) + ' ' + str(response.request_for_quotation_item.uom),
+                        "purchase_price": "{0} {1}".format(response.bought_price, currency),
+                        "lead_time": response.lead_time if response.lead_time else "",
+                    }
+                    for response in lines
+                ],
+                "buyer_name": buyer.company_name,
+                "order_date": format_date_for_timezone(lines[0].updated, get_buyer_timezone(buyer)),
+                "shipping_terms": meta.shipping_terms if meta else None,
+                "currency": buyer.currency,
+                "terms_and_conditions": meta.terms_conditions if meta else None,
+                "payment_terms": meta.payment_terms if meta else None,
+            }
+        )
+    return email_objs
+
+
+def send_purchase_orders(response_ids):
+    for email_obj in purchase_order_email_objs(response_ids):
+        EmailManager.send_purchase_order(email_obj)
@@ -0,0 +1,37 @@
+import uuid
+from functools import lru_cache
+
+from django.template.loader import get_template
+from django.utils.html import conditional_escape
+
+
+@lru_cache(maxsize=None)
+def get_email_template(name):
+    """
+        Load and compile templates/email/<name> once per process.
+    """
+    return get_template(f"email/{name}")
+
+
+def render_email(name, context):
+    return get_email_template(name).render(context)
+
+
+class PersonalizedEmail:
+    """
+        An email template rendered once with a placeholder for each
+        per-recipient field. `personalize` fills the placeholders of one
+        recipient in with escaped values, so a fan-out costs one render plus
+        a string substitution per recipient.
+    """
+
+    def __init__(self, name, context, recipient_fields):
+        prefix = uuid.uuid4().hex
+        self.placeholders = {field: f"@@{prefix}:{field}@@" for field in recipient_fields}
+        self.rendered = render_email(name, {**context, **self.placeholders})
+
+    def personalize(self, values):
+        html = self.rendered
+        for field, placeholder in self.placeholders.items():
+            html = html.replace(placeholder, conditional_escape(values.get(field, "")))
+        return html
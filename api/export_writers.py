@@ -0,0 +1,53 @@
+import csv
+import gzip
+
+from openpyxl import Workbook
+
+XLSX = "xlsx"
+CSV_GZ = "csv.gz"
+EXPORT_FORMATS = (XLSX, CSV_GZ)
+
+
+def _row_values(row, columns):
+    return [row.get(column) for column in columns]
+
+
+def write_xlsx(rows, path, columns, sheet_title="Sheet1"):
+    """
+        Write rows into an openpyxl write-only workbook.
+        Rows are flushed to disk as they arrive, so memory stays flat.
+    """
+    workbook = Workbook(write_only=True)
+    worksheet = workbook.create_sheet(title=sheet_title)
+    worksheet.append(columns)
+    count = 0
+    for row in rows:
+        worksheet.append(_row_values(row, columns))
+        count += 1
+    workbook.save(path)
+    return count
+
+
+def write_csv_gz(rows, path, columns):
+    """
+        Write rows as gzip-compressed CSV.
+    """
+    count = 0
+    with gzip.open(path, "wt", newline="", encoding="utf-8") as export_file:
+        writer = csv.writer(export_file)
+        writer.writerow(columns)
+        for row in rows:
+            writer.writerow(_row_values(row, columns))
+            count += 1
+    return count
+
+
+def write_export(rows, path, columns, export_format=XLSX):
+    """
+        Stream rows into `path` using the requested format and return the row count.
+    """
+    if export_format == XLSX:
+        return write_xlsx(rows, path, columns)
+    if export_format == CSV_GZ:
+        return write_csv_gz(rows, path, columns)
+    raise ValueError(f"Unsupported export format : {export_format}")
@@ -0,0 +1,287 @@
+import json
+import zlib
+from itertools import islice
+
+from django.conf import settings
+from django.db.models import Count, Max, OuterRef, Prefetch, Subquery
+
+from api.models import (
+    RequestForQuotation,
+    RequestForQuotationItems,
+    RequestForQuotationItemResponse,
+    RequestForQuotationMetaData,
+    RFQExportChunk,
+    Supplier,
+    SupplierCategory,
+)
+
+EXPORT_CHUNK_SIZE = getattr(settings, "RFQ_EXPORT_CHUNK_SIZE", 200)
+
+EXPORT_COLUMNS = [
+    "RFQ Item Id",
+    "Date",
+    "Terms & Conditions",
+    "Payment Terms",
+    "Shipping Terms",
+    "Product Name",
+    "Quantity",
+    "UOM",
+    "Specification",
+    "Expected Delivery",
+    "RFQ Status",
+    "Supplier Name",
+    "Supplier POC",
+    "Supplier Phone",
+    "Supplier Email",
+    "Supplier Categories",
+    "Supplier Price",
+    "Supplier Quantity",
+    "Lead Time",
+    "Seller Remarks",
+    "Quote Received On",
+    "Order Status",
+    "Order Placed On",
+]
+
+
+def _format_date(value):
+    return value.strftime("%d-%b-%Y") if value else None
+
+
+def _build_rfq_rows(rfq, responses):
+    """
+        Build the export rows of a single RFQ from its prefetched relations.
+        `responses` maps (item_id, supplier_id) to the latest response.
+    """
+    meta_data = rfq.latest_meta_data[-1] if rfq.latest_meta_data else None
+    rows = []
+    for supplier in rfq.suppliers.all():
+        categories = [category.name for category in supplier.active_categories]
+        for item in rfq.request_for_quotation_items.all():
+            res = responses.get((item.id, supplier.id))
+            rows.append({
+                "RFQ Item Id" : rfq.id,
+                "Date" : _format_date(rfq.created),
+                "Terms & Conditions" : meta_data.payment_terms if meta_data else None,
+                "Payment Terms" : meta_data.terms_conditions if meta_data else None,
+                "Shipping Terms" : meta_data.shipping_terms if meta_data else None,
+                "Product Name" : item.product_name,
+                "Quantity":item.quantity,
+                "UOM" : item.uom,
+                "Specification" : item.specifications,
+                "Expected Delivery" : _format_date(item.expected_delivery_date),
+                "RFQ Status" :  item.get_status_display(),
+                "Supplier Name" : supplier.company_name,
+                "Supplier POC" : supplier.person_of_contact,
+                "Supplier Phone" : supplier.phone_no,
+                "Supplier Email" : supplier.email,
+                "Supplier Categories" : " , ".join(categories) if categories else "",
+                "Supplier Price" : res.price if res else None,
+                "Supplier Quantity" : res.quantity if res else None,
+                "Lead Time" : res.lead_time if (res and res.lead_time) else None,
+                "Seller Remarks" : res.remarks if (res and res.remarks) else None,
+                "Quote Received On" : _format_date(res.created) if res else None,
+                "Order Status" : res.get_order_status_display() if res else None,
+                "Order Placed On" : _format_date(res.updated) if (res and res.order_status==RequestForQuotationItemResponse.ORDER_PLACED) else None,
+            })
+    return rows
+
+
+def _iter_rfq_batches(buyer, rfq_ids=None, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+        Yield lists of fully prefetched RFQs together with their response lookup.
+        Every batch costs a fixed number of queries regardless of its size.
+    """
+    if rfq_ids is None:
+        rfq_ids = buyer.request_for_quotations.order_by("id").values_list("id", flat=True)
+    rfq_ids = list(rfq_ids)
+    for start in range(0, len(rfq_ids), chunk_size):
+        batch_ids = rfq_ids[start:start + chunk_size]
+        rfqs = list(
+            RequestForQuotation.objects.filter(id__in=batch_ids, buyer=buyer)
+            .order_by("id")
+            .prefetch_related(
+                Prefetch(
+                    "request_for_quotation_meta_data",
+                    queryset=RequestForQuotationMetaData.objects.order_by("id"),
+                    to_attr="latest_meta_data",
+                ),
+                "suppliers",
+                Prefetch(
+                    "suppliers__categories",
+                    queryset=SupplierCategory.objects.filter(active=True).order_by("id"),
+                    to_attr="active_categories",
+                ),
+                "request_for_quotation_items",
+            )
+        )
+        # Ordered by id so the last response per (item, supplier) wins, like `.last()`.
+        responses = {
+            (response.request_for_quotation_item_id, response.supplier_id): response
+            for response in RequestForQuotationItemResponse.objects.filter(
+                request_for_quotation_item__request_for_quotation_id__in=batch_ids,
+            ).order_by("id")
+        }
+        yield rfqs, responses
+
+
+def iter_rfq_export_rows_by_rfq(buyer, rfq_ids=None, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+        Yield (rfq_id, rows) pairs for the buyer's RFQs in id order.
+    """
+    for rfqs, responses in _iter_rfq_batches(buyer, rfq_ids, chunk_size):
+        for rfq in rfqs:
+            yield rfq.id, _build_rfq_rows(rfq, responses)
+
+
+def iter_rfq_export_rows(buyer, rfq_ids=None, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+        Stream the export rows of the buyer's RFQs one at a time.
+        Only one batch of RFQs is held in memory at any moment.
+    """
+    for _, rows in iter_rfq_export_rows_by_rfq(buyer, rfq_ids, chunk_size):
+        yield from rows
+
+
+def _grouped_subquery(queryset, group_field, aggregate):
+    return Subquery(
+        queryset.order_by().values(group_field).annotate(value=aggregate).values("value")[:1]
+    )
+
+
+def iter_rfq_export_versions(buyer):
+    """
+        Yield (rfq_id, version) for the buyer's RFQs in id order, from one query.
+        The version is the latest `updated` timestamp across the RFQ, its metadata,
+        items, responses, suppliers and supplier categories, plus the row counts so
+        deletions (a deleted category included) and newly invited suppliers also
+        invalidate the cached chunk.
+    """
+    rfq_filter = {"request_for_quotation": OuterRef("pk")}
+    rfqs = (
+        buyer.request_for_quotations.order_by("id")
+        .annotate(
+            meta_updated=_grouped_subquery(
+                RequestForQuotationMetaData.objects.filter(**rfq_filter), "request_for_quotation", Max("updated")
+            ),
+            item_updated=_grouped_subquery(
+                RequestForQuotationItems.objects.filter(**rfq_filter), "request_for_quotation", Max("updated")
+            ),
+            items_total=_grouped_subquery(
+                RequestForQuotationItems.objects.filter(**rfq_filter), "request_for_quotation", Count("id")
+            ),
+            response_updated=_grouped_subquery(
+                RequestForQuotationItemResponse.objects.filter(
+                    request_for_quotation_item__request_for_quotation=OuterRef("pk")
+                ),
+                "request_for_quotation_item__request_for_quotation",
+                Max("updated"),
+            ),
+            responses_total=_grouped_subquery(
+                RequestForQuotationItemResponse.objects.filter(
+                    request_for_quotation_item__request_for_quotation=OuterRef("pk")
+                ),
+                "request_for_quotation_item__request_for_quotation",
+                Count("id"),
+            ),
+            supplier_updated=_grouped_subquery(
+                Supplier.objects.filter(request_for_quotations=OuterRef("pk")),
+                "request_for_quotations",
+                Max("updated"),
+            ),
+            suppliers_total=_grouped_subquery(
+                Supplier.objects.filter(request_for_quotations=OuterRef("pk")),
+                "request_for_quotations",
+                Count("id"),
+            ),
+            category_updated=_grouped_subquery(
+                SupplierCategory.objects.filter(supplier__request_for_quotations=OuterRef("pk")),
+                "supplier__request_for_quotations",
+                Max("updated"),
+            ),
+            categories_total=_grouped_subquery(
+                SupplierCategory.objects.filter(supplier__request_for_quotations=OuterRef("pk"), active=True),
+                "supplier__request_for_quotations",
+                Count("id"),
+            ),
+        )
+        .values_list(
+            "id",
+            "updated",
+            "meta_updated",
+            "item_updated",
+            "response_updated",
+            "supplier_updated",
+            "category_updated",
+            "items_total",
+            "responses_total",
+            "suppliers_total",
+            "categories_total",
+        )
+    )
+    for rfq_id, *timestamps, item_count, response_count, supplier_count, category_count in rfqs.iterator():
+        latest_update = max(timestamp for timestamp in timestamps if timestamp is not None)
+        counts = f"{item_count or 0}.{response_count or 0}.{supplier_count or 0}.{category_count or 0}"
+        yield rfq_id, f"{latest_update.isoformat()}/{counts}"
+
+
+def encode_export_chunk(rows):
+    values = [[row.get(column) for column in EXPORT_COLUMNS] for row in rows]
+    return zlib.compress(json.dumps(values, separators=(",", ":")).encode("utf-8"))
+
+
+def decode_export_chunk(payload):
+    values = json.loads(zlib.decompress(bytes(payload)).decode("utf-8"))
+    return [dict(zip(EXPORT_COLUMNS, row)) for row in values]
+
+
+def _refresh_export_chunks(buyer, stale_versions, chunk_size):
+    """
+        Rebuild the chunks of stale RFQs and return their rows keyed by RFQ id.
+    """
+    rebuilt = {}
+    chunks = []
+    for rfq_id, rows in iter_rfq_export_rows_by_rfq(buyer, list(stale_versions), chunk_size):
+        rebuilt[rfq_id] = rows
+        chunks.append(
+            RFQExportChunk(
+                rfq_id=rfq_id,
+                version=stale_versions[rfq_id],
+                row_count=len(rows),
+                payload=encode_export_chunk(rows),
+            )
+        )
+    RFQExportChunk.objects.bulk_create(
+        chunks,
+        update_conflicts=True,
+        unique_fields=["rfq"],
+        update_fields=["version", "row_count", "payload", "updated"],
+    )
+    return rebuilt
+
+
+def iter_cached_rfq_export_rows(buyer, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+        Stream the buyer's export rows, reusing the cached chunk of every RFQ
+        whose version is unchanged and rebuilding only the RFQs that changed.
+    """
+    versions = iter_rfq_export_versions(buyer)
+    while True:
+        batch = dict(islice(versions, chunk_size))
+        if not batch:
+            return
+        cached = {
+            chunk.rfq_id: chunk
+            for chunk in RFQExportChunk.objects.filter(rfq_id__in=list(batch)).only("rfq_id", "version", "payload")
+        }
+        stale_versions = {
+            rfq_id: version
+            for rfq_id, version in batch.items()
+            if rfq_id not in cached or cached[rfq_id].version != version
+        }
+        rebuilt = _refresh_export_chunks(buyer, stale_versions, chunk_size) if stale_versions else {}
+        for rfq_id in batch:
+            if rfq_id in rebuilt:
+                yield from rebuilt[rfq_id]
+            else:
+                yield from decode_export_chunk(cached[rfq_id].payload)
@@ -3,12 +3,13 @@ from datetime import date, datetime, time
 from zoneinfo import ZoneInfo
 from django.conf import settings
 from django.core.mail import EmailMultiAlternatives
-from django.template.loader import get_template
 from django.utils import timezone as django_timezone
 from api.models import Buyer
-import pandas as pd
+from api.exports import EXPORT_COLUMNS, iter_cached_rfq_export_rows, iter_rfq_export_rows
+from api.export_writers import XLSX, write_export
+from api.email_templates import PersonalizedEmail, render_email
+from api.mailer import BULK, TRANSACTIONAL, send_email_messages
 import logging
-from django.template.loader import render_to_string
 from django.utils.html import strip_tags
 
 # Set logging level to INFO to suppress DEBUG logs
@@ -16,6 +17,30 @@ logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
 DEFAULT_USER_TIMEZONE = getattr(settings, "DEFAULT_USER_TIMEZONE", "Asia/Kolkata")
+# The only fields of the RFQ created email that differ between suppliers
+RFQ_CREATED_RECIPIENT_FIELDS = ("supplier_name", "url")
+# Constraints a repeated quote or order on an RFQ item runs into
+RFQ_RESPONSE_UNIQUE_CONSTRAINTS = ("rfq_response_item_supplier_uniq", "rfq_response_one_placed_order")
+
+def violated_unique_constraint(error, model):
+    """
+        Name of the unique constraint of `model` that an IntegrityError broke,
+        or None. PostgreSQL reports the name; SQLite only lists the columns,
+        so those are matched against the model's constraints.
+    """
+    diag = getattr(error.__cause__, "diag", None)
+    if diag is not None:
+        return getattr(diag, "constraint_name", None)
+    message = str(error)
+    prefix = "UNIQUE constraint failed: "
+    if not message.startswith(prefix):
+        return None
+    columns = {column.strip().rsplit(".", 1)[-1] for column in message[len(prefix):].split(",")}
+    for constraint in model._meta.constraints:
+        fields = getattr(constraint, "fields", ())
+        if fields and {model._meta.get_field(field).column for field in fields} == columns:
+            return constraint.name
+    return None
 
 def check_string(string,variable_name=None):
     pattern = r"^[a-zA-Z0-9\s_.,%'-@]*$"
@@ -73,45 +98,7 @@ def get_buyer_timezone(buyer: Buyer | None) -> str:
     return _resolve_timezone_name(buyer_timezone)
 
 def get_all_rfq_data(buyer):
-    rfq_lists = buyer.request_for_quotations.all()
-    data = []
-    for rfq in rfq_lists:
-        for supplier in rfq.suppliers.all():
-            categories = supplier.categories.filter(active=True)
-            categories = [category.name for category in categories]
-            for item in rfq.request_for_quotation_items.all():
-                res = item.request_for_quotation_item_response.filter(supplier=supplier)
-                if res.exists():
-                    res = res.last()
-                else:
-                    res = None
-                obj = {
-                    "RFQ Item Id" : rfq.id,
-                    "Date" : rfq.created.strftime("%d-%b-%Y"),
-                    "Terms & Conditions" : rfq.request_for_quotation_meta_data.last().payment_terms,
-                    "Payment Terms" : rfq.request_for_quotation_meta_data.last().terms_conditions,
-                    "Shipping Terms" : rfq.request_for_quotation_meta_data.last().shipping_terms,
-                    "Product Name" : item.product_name,
-                    "Quantity":item.quantity,
-                    "UOM" : item.uom,
-                    "Specification" : item.specifications,
-                    "Expected Delivery" : item.expected_delivery_date.strftime("%d-%b-%Y") if item.expected_delivery_date else None,
-                    "RFQ Status" :  item.get_status_display(),
-                    "Supplier Name" : supplier.company_name,
-                    "Supplier POC" : supplier.person_of_contact,
-                    "Supplier Phone" : supplier.phone_no,
-                    "Supplier Email" : supplier.email,
-                    "Supplier Categories" : " , ".join(categories) if categories else "",
-                    "Supplier Price" : res.price if res else None,
-                    "Supplier Quantity" : res.quantity if res else None,
-                    "Lead Time" : res.lead_time if (res and res.lead_time) else None,
-                    "Seller Remarks" : res.remarks if (res and res.remarks) else None,
-                    "Quote Received On" : res.created.strftime("%d-%b-%Y") if res else None,
-                    "Order Status" : res.get_order_status_display() if res else None,
-                    "Order Placed On" : res.updated.strftime("%d-%b-%Y") if (res and res.order_status==1)  else None,
-                }
-                data.append(obj)
-    return data
+    return list(iter_rfq_export_rows(buyer))
 
 class EmailManager:
     @staticmethod
@@ -134,28 +121,64 @@ class EmailManager:
                 "rfq_response_url": email_obj.get("rfq_response_url"),
             }
 
-            html_content = render_to_string("email/rfq_reminder.html", context)
+            html_content = render_email("rfq_reminder.html", context)
             text_content = strip_tags(html_content)  # Create a text version of the HTML email
 
             msg = EmailMultiAlternatives(subject, text_content, from_email, to_email, cc=cc_email, bcc=bcc_email)
             msg.attach_alternative(html_content, "text/html")
 
-            if settings.SEND_EMAILS:
-                msg.send()
+            send_email_messages([msg], BULK)
         except Exception as ex:
             logger.error(f"***** EMAIL ERROR : {ex}")
 
-    def send_rfq_created_email(email_obj):
+    def send_rfq_reminder_digest(email_obj):
         try:
             from_email = settings.EMAIL_HOST_USER
-            message = EmailMultiAlternatives(subject=email_obj.get("subject",""), body=email_obj.get("body",""), 
-            from_email=from_email, to=email_obj['to'], bcc=email_obj.get('bcc',[]) + 
-                settings.DEFAULT_EMAIL_BCC_LIST,cc=email_obj.get('cc',[]) + settings.DEFAULT_EMAIL_CC_LIST)
-            html_template = get_template(os.path.join(settings.BASE_DIR, 'templates/email/') +'RFQ_Created_Email_Template.html').render(email_obj)
-            message.content_subtype = 'html'
-            message.attach_alternative(html_template, "text/html")
-            if settings.SEND_EMAILS:
-                message.send()
+            html_content = render_email("rfq_reminder_digest.html", email_obj)
+            msg = EmailMultiAlternatives(
+                email_obj.get("subject", "Reminder: Quote Request"),
+                strip_tags(html_content),
+                from_email,
+                email_obj.get("to", []),
+                cc=email_obj.get("cc", []),
+                bcc=email_obj.get("bcc", []) + settings.DEFAULT_EMAIL_BCC_LIST,
+            )
+            msg.attach_alternative(html_content, "text/html")
+            send_email_messages([msg], BULK)
+        except Exception as ex:
+            logger.error(f"***** EMAIL ERROR : {ex}")
+
+    def send_messages(messages, lane=TRANSACTIONAL):
+        """
+            Send a batch of EmailMessages over one pooled connection.
+        """
+        return send_email_messages(messages, lane)
+
+    def _rfq_created_message(email_obj, html_template):
+        from_email = settings.EMAIL_HOST_USER
+        message = EmailMultiAlternatives(subject=email_obj.get("subject",""), body=email_obj.get("body",""), 
+        from_email=from_email, to=email_obj['to'], bcc=email_obj.get('bcc',[]) + 
+            settings.DEFAULT_EMAIL_BCC_LIST,cc=email_obj.get('cc',[]) + settings.DEFAULT_EMAIL_CC_LIST)
+        message.content_subtype = 'html'
+        message.attach_alternative(html_template, "text/html")
+        return message
+
+    def build_rfq_created_message(email_obj, shared):
+        """
+            RFQ created email for one supplier. `shared` caches the RFQ's
+            render between the suppliers of a batch, keyed on rfq_id.
+        """
+        if email_obj.get("rfq_id") not in shared:
+            shared[email_obj.get("rfq_id")] = PersonalizedEmail(
+                'RFQ_Created_Email_Template.html', email_obj, RFQ_CREATED_RECIPIENT_FIELDS
+            )
+        html_template = shared[email_obj.get("rfq_id")].personalize(email_obj)
+        return EmailManager._rfq_created_message(email_obj, html_template)
+
+    def send_rfq_created_email(email_obj):
+        try:
+            html_template = render_email('RFQ_Created_Email_Template.html', email_obj)
+            send_email_messages([EmailManager._rfq_created_message(email_obj, html_template)], BULK)
         except Exception as ex:
             logger.error(f"***** EMAIL ERROR : {ex}")
     
@@ -165,39 +188,44 @@ class EmailManager:
             message = EmailMultiAlternatives(subject=email_obj.get("subject",""), body=email_obj.get("body",""), 
             from_email=from_email, to=email_obj['to'], bcc=email_obj.get('bcc',[]) + 
                 settings.DEFAULT_EMAIL_BCC_LIST,cc=email_obj.get('cc',[]) + settings.DEFAULT_EMAIL_CC_LIST)
-            html_template = get_template(os.path.join(settings.BASE_DIR, 'templates/email/') +'new_user_signup.html').render(email_obj)
+            html_template = render_email('new_user_signup.html', email_obj)
             message.content_subtype = 'html'
             message.attach_alternative(html_template, "text/html")
-            if settings.SEND_EMAILS:
-                message.send()
+            send_email_messages([message])
         except Exception as ex:
             logger.error(f"***** EMAIL ERROR : {ex}")
     
+    def build_rfq_response_alert_message(email_obj):
+        """
+            New-quote email for one response, or the digest of several when
+            `email_obj` lists `responses`.
+        """
+        template = 'new_rfq_responses_digest.html' if email_obj.get("responses") else 'new_rfq_response.html'
+        from_email = settings.EMAIL_HOST_USER
+        message = EmailMultiAlternatives(subject=email_obj.get("subject",""), body=email_obj.get("body",""), 
+        from_email=from_email, to=email_obj['to'], bcc=email_obj.get('bcc',[]) + 
+            settings.DEFAULT_EMAIL_BCC_LIST,cc=email_obj.get('cc',[]) + settings.DEFAULT_EMAIL_CC_LIST)
+        html_template = render_email(template, email_obj)
+        message.content_subtype = 'html'
+        message.attach_alternative(html_template, "text/html")
+        return message
+
     def new_rfq_response_alert(email_obj):
         try:
-            from_email = settings.EMAIL_HOST_USER
-            message = EmailMultiAlternatives(subject=email_obj.get("subject",""), body=email_obj.get("body",""), 
-            from_email=from_email, to=email_obj['to'], bcc=email_obj.get('bcc',[]) + 
-                settings.DEFAULT_EMAIL_BCC_LIST,cc=email_obj.get('cc',[]) + settings.DEFAULT_EMAIL_CC_LIST)
-            html_template = get_template(os.path.join(settings.BASE_DIR, 'templates/email/') +'new_rfq_response.html').render(email_obj)
-            message.content_subtype = 'html'
-            message.attach_alternative(html_template, "text/html")
-            if settings.SEND_EMAILS:
-                message.send()
+            send_email_messages([EmailManager.build_rfq_response_alert_message(email_obj)])
         except Exception as ex:
             logger.error(f"***** EMAIL ERROR : {ex}")
-    
+
     def user_create_failed(email_obj):
         try:
             from_email = settings.EMAIL_HOST_USER
             message = EmailMultiAlternatives(subject=email_obj.get("subject",""), body=email_obj.get("body",""), 
             from_email=from_email, to=email_obj['to'], bcc=email_obj.get('bcc',[]) + 
                 settings.DEFAULT_EMAIL_BCC_LIST,cc=email_obj.get('cc',[]) + settings.DEFAULT_EMAIL_CC_LIST)
-            html_template = get_template(os.path.join(settings.BASE_DIR, 'templates/email/') +'user_create_failed.html').render(email_obj)
+            html_template = render_email('user_create_failed.html', email_obj)
             message.content_subtype = 'html'
             message.attach_alternative(html_template, "text/html")
-            if settings.SEND_EMAILS:
-                message.send()
+            send_email_messages([message])
         except Exception as ex:
             logger.error(f"***** EMAIL ERROR : {ex}")
         
@@ -213,9 +241,8 @@ class EmailManager:
                 cc=email_obj.get('cc', []) + settings.DEFAULT_EMAIL_CC_LIST
             )
             
-            template_path = os.path.join(settings.BASE_DIR, 'templates/email/') + 'send_purchase_order.html'
             try:
-                html_template = get_template(template_path).render(email_obj)
+                html_template = render_email('send_purchase_order.html', email_obj)
             except Exception as template_error:
                 logger.error(f"Template rendering error: {template_error}")
                 raise
@@ -223,7 +250,7 @@ class EmailManager:
             message.attach_alternative(html_template, "text/html")
             
             if settings.SEND_EMAILS:
-                message.send()
+                send_email_messages([message])
                 return True
             else:
                 logger.info("Email sending is disabled (SEND_EMAILS=False)")
@@ -236,21 +263,20 @@ class EmailManager:
     def send_all_rfq_email(buyer_id):
         try:
             buyer = Buyer.objects.get(id=buyer_id)
-            data = get_all_rfq_data(buyer=buyer)
-            dataFrame = pd.DataFrame(data)
-            
+            export_format = getattr(settings, "RFQ_EXPORT_FORMAT", XLSX)
+
             # Create the directory if it doesn't exist
             export_dir = os.path.join(settings.BASE_DIR, 'media', 'rfq-exports')
             os.makedirs(export_dir, exist_ok=True)
 
-            file_name = f"media/rfq-exports/{buyer.user.first_name}_{buyer.id}.xlsx"
-            dataFrame.to_excel(file_name,index=False)
+            file_path = os.path.join(export_dir, f"{buyer.user.first_name}_{buyer.id}.{export_format}")
+            write_export(iter_cached_rfq_export_rows(buyer), file_path, EXPORT_COLUMNS, export_format)
+            body = "Please find the below attached excel sheet." if export_format == XLSX else "Please find the below attached compressed csv file."
             from_email = settings.EMAIL_HOST_USER
-            message = EmailMultiAlternatives(subject="Request For Quotation File Available", body="Please find the below attached excel sheet.", 
+            message = EmailMultiAlternatives(subject="Request For Quotation File Available", body=body, 
             from_email=from_email, to=[buyer.user.email], bcc=settings.DEFAULT_EMAIL_BCC_LIST)
-            message.attach_file(f"{settings.BASE_DIR}/{file_name}")
-            if settings.SEND_EMAILS:
-                message.send()
+            message.attach_file(file_path)
+            send_email_messages([message])
         except Exception as ex:
             logger.error(f"***** EMAIL ERROR : {ex}")
     
@@ -259,7 +285,6 @@ class EmailManager:
             from_email = settings.EMAIL_HOST_USER
             message = EmailMultiAlternatives(subject=email_obj.get("subject"), body=email_obj.get("body"), 
             from_email=from_email, to=email_obj.get("to",[]), cc=email_obj.get("cc",[]), bcc = settings.DEFAULT_EMAIL_BCC_LIST)
-            if settings.SEND_EMAILS:
-                message.send()
+            send_email_messages([message])
         except Exception as ex:
             logger.error(f"***** EMAIL ERROR : {ex}")
\ No newline at end of file
@@ -0,0 +1,177 @@
+import atexit
+import logging
+import math
+import os
+import threading
+import time
+
+from celery import current_task
+from django.conf import settings
+from django.core.cache import caches
+from django.core.mail import get_connection
+
+from api.caching import COORDINATION_CACHE
+
+logger = logging.getLogger(__name__)
+
+EMAIL_CONNECTION_IDLE_TIMEOUT = getattr(settings, "EMAIL_CONNECTION_IDLE_TIMEOUT", 30)
+
+# Sending lanes: bulk fan-outs (RFQ invitations, reminders) may not use the
+# slots kept for transactional emails (orders, signups, alerts)
+TRANSACTIONAL = "transactional"
+BULK = "bulk"
+
+
+class EmailRateLimiter:
+    """
+        Token bucket shared by every worker process through the coordination
+        cache. Time is cut into slots of 1 / `rate` seconds and each send
+        claims one with `cache.add`, so no two senders get the same slot. The
+        unclaimed slots among the last `burst` are the bucket's tokens and
+        are used at once; after that a sender claims the next free slot and
+        sleeps until it starts, which paces a burst evenly at `rate`. Every
+        1 / `transactional_share`-th slot is reserved for the transactional
+        lane, so bulk sends can never take the whole rate.
+    """
+
+    def __init__(self, rate, burst=1, transactional_share=0, key="default", clock=time.time, sleep=time.sleep):
+        self.rate = rate
+        self.burst = max(int(burst), 1)
+        self.reserve_every = round(1 / transactional_share) if transactional_share > 0 else 0
+        self.key = key
+        self.clock = clock
+        self.sleep = sleep
+        # The first slot each lane of this process has not seen taken yet
+        self._next_slot = {}
+
+    def _available_to(self, slot, lane):
+        return lane == TRANSACTIONAL or not self.reserve_every or slot % self.reserve_every
+
+    def acquire(self, lane=TRANSACTIONAL):
+        """
+            Wait for a send slot and return the seconds slept.
+        """
+        slots = caches[COORDINATION_CACHE]
+        now = self.clock()
+        current = int(now * self.rate)
+        slot = max(current - self.burst + 1, self._next_slot.get(lane, 0))
+        while True:
+            if self._available_to(slot, lane):
+                # Keep the claim until the slot has left the burst window
+                timeout = math.ceil((slot - current + self.burst) / self.rate) + 1
+                if slots.add(f"email-rate:{self.key}:{slot}", 1, timeout):
+                    break
+            slot += 1
+        self._next_slot[lane] = slot + 1
+        wait = max(slot / self.rate - now, 0)
+        if wait:
+            self.sleep(wait)
+        return wait
+
+
+_rate_limiters = {}
+
+
+def get_rate_limiter():
+    """
+        The limiter configured for the current EMAIL_BACKEND in
+        EMAIL_RATE_LIMITS, or None when that backend is not paced.
+    """
+    limits = getattr(settings, "EMAIL_RATE_LIMITS", {}).get(settings.EMAIL_BACKEND)
+    if not limits or not limits.get("rate"):
+        return None
+    share = getattr(settings, "EMAIL_TRANSACTIONAL_SHARE", 0)
+    key = (settings.EMAIL_BACKEND, getattr(settings, "EMAIL_HOST", ""), limits["rate"], limits.get("burst", 1), share)
+    if key not in _rate_limiters:
+        _rate_limiters[key] = EmailRateLimiter(
+            limits["rate"], limits.get("burst", 1), share, key=f"{settings.EMAIL_BACKEND}:{key[1]}"
+        )
+    return _rate_limiters[key]
+
+
+def running_in_celery_task():
+    return bool(current_task) and not current_task.request.called_directly
+
+
+class PooledEmailConnection:
+    """
+        One email backend connection per worker process and thread, kept open
+        between sends. It is reopened after `idle_timeout` seconds without
+        use, after a fork, when EMAIL_BACKEND changes, and once after a
+        failed send.
+    """
+
+    def __init__(self, idle_timeout=None):
+        self.idle_timeout = EMAIL_CONNECTION_IDLE_TIMEOUT if idle_timeout is None else idle_timeout
+        self._local = threading.local()
+
+    def _current(self):
+        state = self._local
+        connection = getattr(state, "connection", None)
+        if connection is None:
+            return None
+        if state.pid != os.getpid():
+            # A forked worker must not share its parent's socket
+            state.connection = None
+            return None
+        if state.backend != settings.EMAIL_BACKEND or time.monotonic() - state.last_used > self.idle_timeout:
+            self.close()
+            return None
+        return connection
+
+    def _open(self):
+        connection = get_connection(fail_silently=False)
+        connection.open()
+        state = self._local
+        state.connection = connection
+        state.backend = settings.EMAIL_BACKEND
+        state.pid = os.getpid()
+        state.last_used = time.monotonic()
+        return connection
+
+    def close(self):
+        connection = getattr(self._local, "connection", None)
+        self._local.connection = None
+        if connection is not None:
+            try:
+                connection.close()
+            except Exception as ex:
+                logger.warning(f"Failed to close email connection: {ex}")
+
+    def send_messages(self, messages, lane=TRANSACTIONAL):
+        """
+            Send `messages` over the pooled connection and return how many
+            were sent. Inside a Celery task each send is paced by the
+            backend's rate limiter; sends made in a request thread are not,
+            so a request never sleeps waiting for a slot. Each message is
+            retried once on a fresh connection, so a dropped session neither
+            loses nor duplicates earlier messages.
+        """
+        limiter = get_rate_limiter() if running_in_celery_task() else None
+        sent = 0
+        for message in messages:
+            if limiter:
+                limiter.acquire(lane)
+            connection = self._current() or self._open()
+            try:
+                sent += connection.send_messages([message]) or 0
+            except Exception:
+                self.close()
+                sent += self._open().send_messages([message]) or 0
+            self._local.last_used = time.monotonic()
+        return sent
+
+
+pool = PooledEmailConnection()
+atexit.register(pool.close)
+
+
+def send_email_messages(messages, lane=TRANSACTIONAL):
+    """
+        Send a batch of EmailMessages over this worker's pooled connection,
+        honouring SEND_EMAILS. Returns the number of messages sent.
+    """
+    messages = list(messages)
+    if not messages or not settings.SEND_EMAILS:
+        return 0
+    return pool.send_messages(messages, lane)
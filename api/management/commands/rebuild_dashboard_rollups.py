@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from api.models import Buyer
+from api.rollups import rebuild_dashboard_rollups, refresh_dashboard_rollups
+
+
+class Command(BaseCommand):
+    help = "Recompute the daily dashboard rollups from the RFQ, item and response tables."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--buyer-id", type=int, help="Only rebuild the rollups of this buyer.")
+        parser.add_argument(
+            "--incremental",
+            action="store_true",
+            help="Only recompute the days written since the last refresh; the first refresh rebuilds everything.",
+        )
+
+    def handle(self, *args, **options):
+        if options["incremental"]:
+            if options["buyer_id"]:
+                raise CommandError("--incremental refreshes every buyer and cannot take --buyer-id")
+            refreshed = refresh_dashboard_rollups()
+            self.stdout.write(self.style.SUCCESS(f"Refreshed {refreshed} dashboard rollup days"))
+            return
+        buyer = None
+        if options["buyer_id"]:
+            buyer = Buyer.objects.filter(id=options["buyer_id"]).first()
+            if not buyer:
+                raise CommandError(f"Buyer {options['buyer_id']} does not exist")
+        rebuilt = rebuild_dashboard_rollups(buyer)
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt dashboard rollups of {rebuilt} buyers"))
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from api.models import Buyer, SearchDocument
+from api.search import install_search_index, rebuild_search_index
+
+
+class Command(BaseCommand):
+    help = "Recompute the supplier and RFQ search documents and their database index."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--kind",
+            choices=[kind for kind, _ in SearchDocument.KIND_CHOICES],
+            help="Only rebuild documents of this kind.",
+        )
+        parser.add_argument("--buyer-id", type=int, help="Only rebuild the documents of this buyer.")
+
+    def handle(self, *args, **options):
+        buyer = None
+        if options["buyer_id"]:
+            buyer = Buyer.objects.filter(id=options["buyer_id"]).first()
+            if not buyer:
+                raise CommandError(f"Buyer {options['buyer_id']} does not exist")
+        install_search_index()
+        written = rebuild_search_index(options["kind"], buyer)
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {written} search documents"))
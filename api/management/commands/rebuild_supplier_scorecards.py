@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from api.models import Buyer
+from api.scorecards import rebuild_supplier_scorecards
+
+
+class Command(BaseCommand):
+    help = "Recompute supplier scorecards from the RFQ, response and order tables."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--buyer-id", type=int, help="Only rebuild the scorecards of this buyer.")
+
+    def handle(self, *args, **options):
+        buyer = None
+        if options["buyer_id"]:
+            buyer = Buyer.objects.filter(id=options["buyer_id"]).first()
+            if not buyer:
+                raise CommandError(f"Buyer {options['buyer_id']} does not exist")
+        written = rebuild_supplier_scorecards(buyer)
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {written} supplier scorecards"))
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from api.models import Buyer
+from api.rfq_activity import repair_rfq_activity
+
+
+class Command(BaseCommand):
+    help = "Recompute the activity counters stored on RFQs from their items and responses."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--buyer-id", type=int, help="Only repair the RFQs of this buyer.")
+
+    def handle(self, *args, **options):
+        buyer = None
+        if options["buyer_id"]:
+            buyer = Buyer.objects.filter(id=options["buyer_id"]).first()
+            if not buyer:
+                raise CommandError(f"Buyer {options['buyer_id']} does not exist")
+        checked, repaired = repair_rfq_activity(buyer)
+        self.stdout.write(self.style.SUCCESS(f"Checked {checked} RFQs, repaired {repaired}"))
@@ -0,0 +1,44 @@
+# Generated by Django 4.2.8 on 2026-10-18 15:54
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0028_buyer_timezone"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RFQExportChunk",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("version", models.CharField(max_length=100)),
+                ("row_count", models.PositiveIntegerField(default=0)),
+                ("payload", models.BinaryField()),
+                ("created", models.DateTimeField(auto_now_add=True)),
+                ("updated", models.DateTimeField(auto_now=True)),
+                (
+                    "rfq",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="export_chunk",
+                        to="api.requestforquotation",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "rfq_export_chunks",
+            },
+        ),
+    ]
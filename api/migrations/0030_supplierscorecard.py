@@ -0,0 +1,61 @@
+# Generated by Django 4.2.8 on 2026-10-18 15:54
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0029_rfqexportchunk"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SupplierScorecard",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("quotes_requested", models.PositiveIntegerField(default=0)),
+                ("quotes_received", models.PositiveIntegerField(default=0)),
+                ("quotes_value", models.FloatField(default=0)),
+                ("orders_placed", models.PositiveIntegerField(default=0)),
+                ("order_value", models.FloatField(default=0)),
+                ("created", models.DateTimeField(auto_now_add=True)),
+                ("updated", models.DateTimeField(auto_now=True)),
+                (
+                    "buyer",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="supplier_scorecards",
+                        to="api.buyer",
+                    ),
+                ),
+                (
+                    "supplier",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="scorecards",
+                        to="api.supplier",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "supplier_scorecards",
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="supplierscorecard",
+            constraint=models.UniqueConstraint(
+                fields=("buyer", "supplier"),
+                name="supplier_scorecard_buyer_supplier_uniq",
+            ),
+        ),
+    ]
@@ -0,0 +1,168 @@
+# Generated by Django 4.2.8 on 2026-10-18 15:59
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0030_supplierscorecard"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RollupCheckpoint",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=100, unique=True)),
+                ("last_run", models.DateTimeField(blank=True, null=True)),
+                ("updated", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "db_table": "rollup_checkpoints",
+            },
+        ),
+        migrations.AlterField(
+            model_name="requestforquotation",
+            name="updated",
+            field=models.DateTimeField(auto_now=True, db_index=True),
+        ),
+        migrations.AlterField(
+            model_name="requestforquotationitemresponse",
+            name="updated",
+            field=models.DateTimeField(auto_now=True, db_index=True),
+        ),
+        migrations.AlterField(
+            model_name="requestforquotationitems",
+            name="updated",
+            field=models.DateTimeField(auto_now=True, db_index=True),
+        ),
+        migrations.CreateModel(
+            name="DailyBuyerRollup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("day", models.DateField()),
+                ("rfqs_created", models.PositiveIntegerField(default=0)),
+                ("open_rfqs", models.PositiveIntegerField(default=0)),
+                ("sla_seconds_sum", models.FloatField(default=0)),
+                ("sla_count", models.PositiveIntegerField(default=0)),
+                ("updated", models.DateTimeField(auto_now=True)),
+                (
+                    "buyer",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="daily_rollups",
+                        to="api.buyer",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "daily_buyer_rollups",
+            },
+        ),
+        migrations.CreateModel(
+            name="DailySupplierRollup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("day", models.DateField()),
+                ("product_name", models.TextField()),
+                ("response_count", models.PositiveIntegerField(default=0)),
+                ("order_count", models.PositiveIntegerField(default=0)),
+                ("purchase_value", models.FloatField(default=0)),
+                ("lead_time_sum", models.FloatField(default=0)),
+                ("lead_time_count", models.PositiveIntegerField(default=0)),
+                ("updated", models.DateTimeField(auto_now=True)),
+                (
+                    "buyer",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="daily_supplier_rollups",
+                        to="api.buyer",
+                    ),
+                ),
+                (
+                    "supplier",
+                    models.ForeignKey(
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="daily_rollups",
+                        to="api.supplier",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "daily_supplier_rollups",
+                "indexes": [
+                    models.Index(
+                        fields=["buyer", "day"], name="daily_supplier_buyer_day_idx"
+                    )
+                ],
+            },
+        ),
+        migrations.CreateModel(
+            name="DailyProductRollup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("day", models.DateField()),
+                ("product_name", models.TextField()),
+                ("items_created", models.PositiveIntegerField(default=0)),
+                ("open_items", models.PositiveIntegerField(default=0)),
+                ("updated", models.DateTimeField(auto_now=True)),
+                (
+                    "buyer",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="daily_product_rollups",
+                        to="api.buyer",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "daily_product_rollups",
+                "indexes": [
+                    models.Index(
+                        fields=["buyer", "day"], name="daily_product_buyer_day_idx"
+                    )
+                ],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="dailybuyerrollup",
+            constraint=models.UniqueConstraint(
+                fields=("buyer", "day"), name="daily_buyer_rollup_uniq"
+            ),
+        ),
+    ]
@@ -0,0 +1,88 @@
+# Generated by Django 4.2.8 on 2026-10-18 16:02
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def backfill_supplier_documents(apps, schema_editor):
+    Supplier = apps.get_model("api", "Supplier")
+    SupplierCategory = apps.get_model("api", "SupplierCategory")
+    SearchDocument = apps.get_model("api", "SearchDocument")
+    categories = {}
+    for supplier_id, name in SupplierCategory.objects.filter(active=True).order_by("id").values_list(
+        "supplier_id", "name"
+    ):
+        categories.setdefault(supplier_id, []).append(name)
+    documents = []
+    for supplier in Supplier.objects.iterator(chunk_size=1000):
+        values = (
+            supplier.company_name,
+            supplier.person_of_contact,
+            supplier.phone_no,
+            supplier.email,
+            *categories.get(supplier.id, []),
+        )
+        documents.append(
+            SearchDocument(
+                kind="supplier",
+                object_id=str(supplier.id),
+                buyer_id=supplier.buyer_id,
+                document="\n".join(str(value) for value in values if value),
+            )
+        )
+    SearchDocument.objects.bulk_create(documents, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0031_daily_rollups"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SearchDocument",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "kind",
+                    models.CharField(choices=[("supplier", "Supplier")], max_length=20),
+                ),
+                ("object_id", models.CharField(max_length=64)),
+                ("document", models.TextField(blank=True, default="")),
+                ("updated", models.DateTimeField(auto_now=True)),
+                (
+                    "buyer",
+                    models.ForeignKey(
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="search_documents",
+                        to="api.buyer",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "search_documents",
+                "indexes": [
+                    models.Index(
+                        fields=["buyer", "kind"], name="search_document_buyer_kind_idx"
+                    )
+                ],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="searchdocument",
+            constraint=models.UniqueConstraint(
+                fields=("kind", "object_id"), name="search_document_kind_object_uniq"
+            ),
+        ),
+        migrations.RunPython(backfill_supplier_documents, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 4.2.8 on 2026-10-18 16:04
+
+from django.db import migrations, models
+
+
+def backfill_rfq_documents(apps, schema_editor):
+    RequestForQuotation = apps.get_model("api", "RequestForQuotation")
+    RequestForQuotationItems = apps.get_model("api", "RequestForQuotationItems")
+    SearchDocument = apps.get_model("api", "SearchDocument")
+    item_values = {}
+    for rfq_id, product_name, specifications in RequestForQuotationItems.objects.exclude(
+        request_for_quotation=None
+    ).order_by("id").values_list("request_for_quotation_id", "product_name", "specifications"):
+        item_values.setdefault(rfq_id, []).extend([product_name, specifications])
+    supplier_names = {}
+    for rfq_id, company_name in RequestForQuotation.suppliers.through.objects.order_by("id").values_list(
+        "requestforquotation_id", "supplier__company_name"
+    ):
+        supplier_names.setdefault(rfq_id, []).append(company_name)
+    documents = []
+    for rfq in RequestForQuotation.objects.iterator(chunk_size=1000):
+        values = (rfq.title, *item_values.get(rfq.id, []), *supplier_names.get(rfq.id, []))
+        documents.append(
+            SearchDocument(
+                kind="rfq",
+                object_id=str(rfq.id),
+                buyer_id=rfq.buyer_id,
+                document="\n".join(str(value) for value in values if value),
+            )
+        )
+    SearchDocument.objects.bulk_create(documents, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0032_searchdocument"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="searchdocument",
+            name="kind",
+            field=models.CharField(
+                choices=[("supplier", "Supplier"), ("rfq", "RFQ")], max_length=20
+            ),
+        ),
+        migrations.RunPython(backfill_rfq_documents, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,112 @@
+# Generated by Django 4.2.8 on 2026-10-18 16:09
+
+from django.db import migrations, models
+from django.db.models import Count, Max, Min, OuterRef, Subquery
+from django.db.models.functions import Coalesce, Greatest
+
+
+def backfill_activity_counters(apps, schema_editor):
+    RequestForQuotation = apps.get_model("api", "RequestForQuotation")
+    RequestForQuotationItems = apps.get_model("api", "RequestForQuotationItems")
+    RequestForQuotationItemResponse = apps.get_model("api", "RequestForQuotationItemResponse")
+
+    def aggregate(queryset, group_by, expression):
+        return Subquery(queryset.order_by().values(group_by).annotate(value=expression).values("value")[:1])
+
+    items = RequestForQuotationItems.objects.filter(request_for_quotation=OuterRef("pk"))
+    responses = RequestForQuotationItemResponse.objects.filter(
+        request_for_quotation_item__request_for_quotation=OuterRef("pk")
+    )
+    response_rfq = "request_for_quotation_item__request_for_quotation"
+    RequestForQuotation.objects.update(
+        item_count=Coalesce(aggregate(items, "request_for_quotation", Count("id")), 0),
+        open_item_count=Coalesce(aggregate(items.filter(status=1), "request_for_quotation", Count("id")), 0),
+        quotes_count=Coalesce(aggregate(responses, response_rfq, Count("id")), 0),
+        latest_item_update=aggregate(items, "request_for_quotation", Max("updated")),
+        latest_response_update=aggregate(responses, response_rfq, Max("updated")),
+        earliest_delivery_date=aggregate(items, "request_for_quotation", Min("expected_delivery_date")),
+    )
+    RequestForQuotation.objects.update(
+        latest_activity=Greatest(
+            Coalesce("latest_item_update", "updated"),
+            Coalesce("latest_response_update", "updated"),
+            "updated",
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0033_rfq_search_documents"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="requestforquotation",
+            name="earliest_delivery_date",
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="requestforquotation",
+            name="item_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="requestforquotation",
+            name="latest_activity",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="requestforquotation",
+            name="latest_item_update",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="requestforquotation",
+            name="latest_response_update",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="requestforquotation",
+            name="open_item_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="requestforquotation",
+            name="quotes_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name="requestforquotation",
+            index=models.Index(
+                fields=["buyer", "latest_activity"], name="rfq_buyer_activity_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="requestforquotation",
+            index=models.Index(
+                fields=["buyer", "created"], name="rfq_buyer_created_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="requestforquotation",
+            index=models.Index(
+                fields=["buyer", "earliest_delivery_date"],
+                name="rfq_buyer_delivery_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="requestforquotation",
+            index=models.Index(
+                fields=["buyer", "open_item_count"], name="rfq_buyer_open_items_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="requestforquotation",
+            index=models.Index(
+                fields=["buyer", "quotes_count"], name="rfq_buyer_quotes_idx"
+            ),
+        ),
+        migrations.RunPython(backfill_activity_counters, migrations.RunPython.noop),
+    ]
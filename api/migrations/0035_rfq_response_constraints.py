@@ -0,0 +1,82 @@
+# Generated by Django 4.2.8 on 2026-10-18 16:14
+
+from django.db import migrations, models
+from django.db.models import Count
+
+ORDER_PLACED = 1
+
+
+def check_for_conflicts(apps, schema_editor):
+    """
+        Refuse to add the constraints below while existing rows break them,
+        listing the conflicting responses instead of deleting any quote or
+        order. Resolve them by hand (for example with the Django admin) and
+        run the migration again.
+    """
+    Response = apps.get_model("api", "RequestForQuotationItemResponse")
+    conflicts = []
+    duplicate_quotes = (
+        Response.objects.filter(request_for_quotation_item__isnull=False, supplier__isnull=False)
+        .values("request_for_quotation_item", "supplier")
+        .annotate(total=Count("id"))
+        .filter(total__gt=1)
+    )
+    for group in duplicate_quotes:
+        ids = list(
+            Response.objects.filter(
+                request_for_quotation_item=group["request_for_quotation_item"], supplier=group["supplier"]
+            )
+            .order_by("id")
+            .values_list("id", flat=True)
+        )
+        conflicts.append(
+            f"item {group['request_for_quotation_item']} has {len(ids)} quotes from supplier {group['supplier']}: "
+            f"response ids {ids}"
+        )
+    duplicate_orders = (
+        Response.objects.filter(request_for_quotation_item__isnull=False, order_status=ORDER_PLACED)
+        .values("request_for_quotation_item")
+        .annotate(total=Count("id"))
+        .filter(total__gt=1)
+    )
+    for group in duplicate_orders:
+        ids = list(
+            Response.objects.filter(
+                request_for_quotation_item=group["request_for_quotation_item"], order_status=ORDER_PLACED
+            )
+            .order_by("id")
+            .values_list("id", flat=True)
+        )
+        conflicts.append(
+            f"item {group['request_for_quotation_item']} has {len(ids)} placed orders: response ids {ids}"
+        )
+    if conflicts:
+        raise RuntimeError(
+            "Cannot add the RFQ response constraints; resolve these responses first:\n" + "\n".join(conflicts)
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0034_rfq_activity_counters"),
+    ]
+
+    operations = [
+        migrations.RunPython(check_for_conflicts, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="requestforquotationitemresponse",
+            constraint=models.UniqueConstraint(
+                fields=("request_for_quotation_item", "supplier"),
+                name="rfq_response_item_supplier_uniq",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="requestforquotationitemresponse",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("order_status", 1)),
+                fields=("request_for_quotation_item",),
+                name="rfq_response_one_placed_order",
+            ),
+        ),
+    ]
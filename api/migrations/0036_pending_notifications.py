@@ -0,0 +1,83 @@
+# Generated by Django 4.2.8 on 2026-10-18 16:19
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0035_rfq_response_constraints"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PendingNotification",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[("rfq_response", "RFQ response")],
+                        default="rfq_response",
+                        max_length=20,
+                    ),
+                ),
+                ("quotes_count", models.PositiveIntegerField(default=0)),
+                ("created", models.DateTimeField(auto_now_add=True)),
+                (
+                    "buyer",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="pending_notifications",
+                        to="api.buyer",
+                    ),
+                ),
+                (
+                    "request_for_quotation",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="pending_notifications",
+                        to="api.requestforquotation",
+                    ),
+                ),
+                (
+                    "rfq_item",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="+",
+                        to="api.requestforquotationitems",
+                    ),
+                ),
+                (
+                    "supplier",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="+",
+                        to="api.supplier",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "pending_notifications",
+                "indexes": [
+                    models.Index(
+                        fields=["buyer", "created"], name="pending_notif_buyer_idx"
+                    ),
+                    models.Index(fields=["created"], name="pending_notif_created_idx"),
+                ],
+            },
+        ),
+    ]
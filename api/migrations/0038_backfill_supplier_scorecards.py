@@ -0,0 +1,79 @@
+# Generated by Django 4.2.8 on 2026-10-18 18:02
+
+from django.db import migrations
+from django.db.models import Count, F, OuterRef, Q, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+ORDER_PLACED = 1
+BATCH_SIZE = 1000
+
+
+def backfill_supplier_scorecards(apps, schema_editor):
+    """
+        Seed the scorecards from the existing RFQ tables so the stats endpoint
+        shows every buyer's history right after deploy, without a manual
+        `rebuild_supplier_scorecards`.
+    """
+    Supplier = apps.get_model("api", "Supplier")
+    RequestForQuotationItems = apps.get_model("api", "RequestForQuotationItems")
+    SupplierScorecard = apps.get_model("api", "SupplierScorecard")
+
+    placed = Q(request_for_quotation_responses__order_status=ORDER_PLACED)
+    response_value = F("request_for_quotation_responses__price") * F("request_for_quotation_responses__quantity")
+    quotes_requested = (
+        RequestForQuotationItems.objects.filter(
+            request_for_quotation__buyer=OuterRef("buyer"),
+            request_for_quotation__suppliers=OuterRef("pk"),
+        )
+        .order_by()
+        .values("request_for_quotation__suppliers")
+        .annotate(total=Count("id"))
+        .values("total")
+    )
+    rows = (
+        Supplier.objects.filter(buyer__isnull=False)
+        .annotate(
+            quotes_requested_total=Coalesce(Subquery(quotes_requested[:1]), 0),
+            quotes_received_total=Count("request_for_quotation_responses"),
+            quotes_value_total=Sum(response_value),
+            orders_placed_total=Count("request_for_quotation_responses", filter=placed),
+            order_value_total=Sum(response_value, filter=placed),
+        )
+        .values(
+            "id",
+            "buyer_id",
+            "quotes_requested_total",
+            "quotes_received_total",
+            "quotes_value_total",
+            "orders_placed_total",
+            "order_value_total",
+        )
+        .order_by("buyer_id", "id")
+    )
+    SupplierScorecard.objects.all().delete()
+    SupplierScorecard.objects.bulk_create(
+        (
+            SupplierScorecard(
+                buyer_id=row["buyer_id"],
+                supplier_id=row["id"],
+                quotes_requested=row["quotes_requested_total"] or 0,
+                quotes_received=row["quotes_received_total"] or 0,
+                quotes_value=row["quotes_value_total"] or 0,
+                orders_placed=row["orders_placed_total"] or 0,
+                order_value=row["order_value_total"] or 0,
+            )
+            for row in rows.iterator()
+        ),
+        batch_size=BATCH_SIZE,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0037_email_outbox"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_supplier_scorecards, migrations.RunPython.noop),
+    ]
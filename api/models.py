@@ -1,6 +1,7 @@
 from django.db import models
 from django.db.models import Sum
 from django.contrib.auth.models import User
+from django.utils import timezone
 import uuid
 
 # Create your models here.
@@ -62,7 +63,24 @@ class RequestForQuotation(models.Model):
     suppliers = models.ManyToManyField(Supplier,related_name="request_for_quotations")
     title = models.CharField(max_length=255, null=True, blank=True)
     created = models.DateTimeField(auto_now_add=True)
-    updated = models.DateTimeField(auto_now = True)
+    updated = models.DateTimeField(auto_now = True, db_index=True)
+    # Activity counters, maintained by api.rfq_activity
+    item_count = models.PositiveIntegerField(default=0)
+    open_item_count = models.PositiveIntegerField(default=0)
+    quotes_count = models.PositiveIntegerField(default=0)
+    latest_item_update = models.DateTimeField(null=True, blank=True)
+    latest_response_update = models.DateTimeField(null=True, blank=True)
+    earliest_delivery_date = models.DateField(null=True, blank=True)
+    latest_activity = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["buyer", "latest_activity"], name="rfq_buyer_activity_idx"),
+            models.Index(fields=["buyer", "created"], name="rfq_buyer_created_idx"),
+            models.Index(fields=["buyer", "earliest_delivery_date"], name="rfq_buyer_delivery_idx"),
+            models.Index(fields=["buyer", "open_item_count"], name="rfq_buyer_open_items_idx"),
+            models.Index(fields=["buyer", "quotes_count"], name="rfq_buyer_quotes_idx"),
+        ]
 
     def __str__(self):
         return self.get_display_title()
@@ -95,7 +113,7 @@ class RequestForQuotationItems(models.Model):
     specifications = models.TextField(null=True, blank=True)
     expected_delivery_date = models.DateField(null=True, blank=True)
     created = models.DateTimeField(auto_now_add=True)
-    updated = models.DateTimeField(auto_now = True)
+    updated = models.DateTimeField(auto_now = True, db_index=True)
 
 class RequestForQuotationItemResponse(models.Model):
     ORDER_PLACED = 1
@@ -116,13 +134,20 @@ class RequestForQuotationItemResponse(models.Model):
     lead_time = models.IntegerField(null=True, blank=True)
     remarks = models.CharField(max_length=200,null=True, blank=True)
     created = models.DateTimeField(auto_now_add=True)
-    updated = models.DateTimeField(auto_now = True)
-    
-    def save(self, *args, **kwargs):
-        placed_response = self.request_for_quotation_item.request_for_quotation_item_response.filter(order_status=self.ORDER_PLACED)
-        if placed_response.exists():
-            raise Exception("Order already placed for this item")
-        super(RequestForQuotationItemResponse,self).save(*args, **kwargs)
+    updated = models.DateTimeField(auto_now = True, db_index=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["request_for_quotation_item", "supplier"],
+                name="rfq_response_item_supplier_uniq",
+            ),
+            models.UniqueConstraint(
+                fields=["request_for_quotation_item"],
+                condition=models.Q(order_status=1),
+                name="rfq_response_one_placed_order",
+            ),
+        ]
     
     
     
@@ -161,6 +186,260 @@ class RFQItemAttachment(models.Model):
         ]
 
 
+class SupplierScorecard(models.Model):
+    """Running quote and order totals of a supplier for one buyer."""
+
+    buyer = models.ForeignKey(
+        "api.Buyer",
+        on_delete=models.CASCADE,
+        related_name="supplier_scorecards",
+    )
+    supplier = models.ForeignKey(
+        Supplier,
+        on_delete=models.CASCADE,
+        related_name="scorecards",
+    )
+    quotes_requested = models.PositiveIntegerField(default=0)
+    quotes_received = models.PositiveIntegerField(default=0)
+    quotes_value = models.FloatField(default=0)
+    orders_placed = models.PositiveIntegerField(default=0)
+    order_value = models.FloatField(default=0)
+    created = models.DateTimeField(auto_now_add=True)
+    updated = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "supplier_scorecards"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["buyer", "supplier"],
+                name="supplier_scorecard_buyer_supplier_uniq",
+            )
+        ]
+
+
+class RFQExportChunk(models.Model):
+    """Rendered export rows of one RFQ, reused until the RFQ changes."""
+
+    rfq = models.OneToOneField(
+        "api.RequestForQuotation",
+        on_delete=models.CASCADE,
+        related_name="export_chunk",
+    )
+    version = models.CharField(max_length=100)
+    row_count = models.PositiveIntegerField(default=0)
+    payload = models.BinaryField()
+    created = models.DateTimeField(auto_now_add=True)
+    updated = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "rfq_export_chunks"
+
+
+class DailyBuyerRollup(models.Model):
+    """Per-day RFQ totals of a buyer, bucketed by the RFQ creation date."""
+
+    buyer = models.ForeignKey(
+        "api.Buyer",
+        on_delete=models.CASCADE,
+        related_name="daily_rollups",
+    )
+    day = models.DateField()
+    rfqs_created = models.PositiveIntegerField(default=0)
+    open_rfqs = models.PositiveIntegerField(default=0)
+    sla_seconds_sum = models.FloatField(default=0)
+    sla_count = models.PositiveIntegerField(default=0)
+    updated = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "daily_buyer_rollups"
+        constraints = [
+            models.UniqueConstraint(fields=["buyer", "day"], name="daily_buyer_rollup_uniq")
+        ]
+
+
+class DailyProductRollup(models.Model):
+    """Per-day item totals of a buyer per product, bucketed by the RFQ creation date."""
+
+    buyer = models.ForeignKey(
+        "api.Buyer",
+        on_delete=models.CASCADE,
+        related_name="daily_product_rollups",
+    )
+    day = models.DateField()
+    product_name = models.TextField()
+    items_created = models.PositiveIntegerField(default=0)
+    open_items = models.PositiveIntegerField(default=0)
+    updated = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "daily_product_rollups"
+        indexes = [
+            models.Index(fields=["buyer", "day"], name="daily_product_buyer_day_idx")
+        ]
+
+
+class DailySupplierRollup(models.Model):
+    """Per-day response and order totals of a buyer per product and supplier."""
+
+    buyer = models.ForeignKey(
+        "api.Buyer",
+        on_delete=models.CASCADE,
+        related_name="daily_supplier_rollups",
+    )
+    day = models.DateField()
+    product_name = models.TextField()
+    supplier = models.ForeignKey(
+        Supplier,
+        null=True,
+        on_delete=models.CASCADE,
+        related_name="daily_rollups",
+    )
+    response_count = models.PositiveIntegerField(default=0)
+    order_count = models.PositiveIntegerField(default=0)
+    purchase_value = models.FloatField(default=0)
+    lead_time_sum = models.FloatField(default=0)
+    lead_time_count = models.PositiveIntegerField(default=0)
+    updated = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "daily_supplier_rollups"
+        indexes = [
+            models.Index(fields=["buyer", "day"], name="daily_supplier_buyer_day_idx")
+        ]
+
+
+class RollupCheckpoint(models.Model):
+    """Last successful run of an incremental rollup job."""
+
+    name = models.CharField(max_length=100, unique=True)
+    last_run = models.DateTimeField(null=True, blank=True)
+    updated = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "rollup_checkpoints"
+
+
+class SearchDocument(models.Model):
+    """
+        Denormalized search text of a supplier or RFQ, indexed by `api.search`.
+    """
+
+    SUPPLIER = "supplier"
+    RFQ = "rfq"
+    KIND_CHOICES = (
+        (SUPPLIER, "Supplier"),
+        (RFQ, "RFQ"),
+    )
+
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    object_id = models.CharField(max_length=64)
+    buyer = models.ForeignKey(
+        "api.Buyer",
+        null=True,
+        on_delete=models.CASCADE,
+        related_name="search_documents",
+    )
+    document = models.TextField(blank=True, default="")
+    updated = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "search_documents"
+        constraints = [
+            models.UniqueConstraint(fields=["kind", "object_id"], name="search_document_kind_object_uniq")
+        ]
+        indexes = [
+            models.Index(fields=["buyer", "kind"], name="search_document_buyer_kind_idx")
+        ]
+
+
+class PendingNotification(models.Model):
+    """
+        A buyer alert held back so `api.notifications` can coalesce it with
+        the alerts that follow it into one digest email.
+    """
+
+    RFQ_RESPONSE = "rfq_response"
+    KIND_CHOICES = (
+        (RFQ_RESPONSE, "RFQ response"),
+    )
+
+    buyer = models.ForeignKey(
+        "api.Buyer",
+        on_delete=models.CASCADE,
+        related_name="pending_notifications",
+    )
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES, default=RFQ_RESPONSE)
+    request_for_quotation = models.ForeignKey(
+        "api.RequestForQuotation",
+        on_delete=models.CASCADE,
+        related_name="pending_notifications",
+    )
+    rfq_item = models.ForeignKey(
+        "api.RequestForQuotationItems",
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name="+",
+    )
+    supplier = models.ForeignKey(
+        "api.Supplier",
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name="+",
+    )
+    quotes_count = models.PositiveIntegerField(default=0)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    # Cleared once the alert has used up its send attempts
+    next_attempt_at = models.DateTimeField(null=True, blank=True, default=timezone.now)
+    last_error = models.TextField(blank=True, default="")
+    created = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = "pending_notifications"
+        indexes = [
+            models.Index(fields=["buyer", "created"], name="pending_notif_buyer_idx"),
+            models.Index(fields=["created"], name="pending_notif_created_idx"),
+        ]
+
+
+class EmailOutbox(models.Model):
+    """
+        An email written in the same transaction as the change that triggers
+        it. `api.outbox` drains pending rows in batches once they commit, so
+        nothing is sent for a rolled back request.
+    """
+
+    RFQ_CREATED = "rfq_created"
+    KIND_CHOICES = (
+        (RFQ_CREATED, "RFQ created"),
+    )
+
+    PENDING = 1
+    SENT = 2
+    FAILED = 3
+    STATUS_CHOICES = (
+        (PENDING, "Pending"),
+        (SENT, "Sent"),
+        (FAILED, "Failed"),
+    )
+
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    payload = models.JSONField()
+    status = models.PositiveSmallIntegerField(choices=STATUS_CHOICES, default=PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True, default="")
+    created = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = "email_outbox"
+        indexes = [
+            models.Index(fields=["status", "next_attempt_at"], name="email_outbox_due_idx"),
+        ]
+
+
 class AuditLog(models.Model):
     class Actions(models.TextChoices):
         FILE_UPLOAD = ("file_upload", "File Upload")
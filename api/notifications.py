@@ -0,0 +1,132 @@
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from api.helper import EmailManager
+from api.mailer import send_email_messages
+from api.models import PendingNotification
+from api.outbox import EMAIL_OUTBOX_CLAIM_LEASE, EMAIL_OUTBOX_MAX_ATTEMPTS, retry_delay
+
+logger = logging.getLogger(__name__)
+
+RFQ_RESPONSE_ALERT_WINDOW = getattr(settings, "RFQ_RESPONSE_ALERT_WINDOW", 300)
+
+
+def rfq_redirect_url(rfq_id, item_id=None):
+    base_url = (getattr(settings, "FRONTEND_URL", "") or "").rstrip("/")
+    rfq_url = f"{base_url}/rfq/{rfq_id}/items"
+    if item_id:
+        return f"{rfq_url}?item_id={item_id}"
+    return rfq_url
+
+
+def rfq_response_alert(supplier, buyer, url):
+    return {
+        "to": [buyer.user.email],
+        "cc": [supplier.email],
+        "subject": "New quotation received",
+        "supplier_name": str(supplier.company_name),
+        "url": url,
+    }
+
+
+def record_rfq_response_alert(rfq, supplier, rfq_item_id, quotes_count):
+    PendingNotification.objects.create(
+        buyer_id=rfq.buyer_id,
+        kind=PendingNotification.RFQ_RESPONSE,
+        request_for_quotation=rfq,
+        rfq_item_id=rfq_item_id,
+        supplier=supplier,
+        quotes_count=quotes_count,
+    )
+
+
+def build_rfq_response_digest(buyer, notifications):
+    """
+        Email for a buyer's pending response alerts. A lone alert keeps the
+        single-response email; several become one digest, which does not cc
+        the suppliers so they never see each other.
+    """
+    if len(notifications) == 1:
+        notification = notifications[0]
+        return rfq_response_alert(
+            notification.supplier,
+            buyer,
+            rfq_redirect_url(notification.request_for_quotation_id, notification.rfq_item_id),
+        )
+    return {
+        "to": [buyer.user.email],
+        "cc": [],
+        "subject": f"{len(notifications)} new quotations received",
+        "company_name": buyer.company_name,
+        "responses": [
+            {
+                "supplier_name": str(notification.supplier.company_name) if notification.supplier else "A supplier",
+                "rfq_title": notification.request_for_quotation.get_display_title(),
+                "quotes_count": notification.quotes_count,
+                "url": rfq_redirect_url(notification.request_for_quotation_id, notification.rfq_item_id),
+            }
+            for notification in notifications
+        ],
+    }
+
+
+def send_rfq_response_digest(email_obj):
+    """
+        Send a buyer's alert email, raising if it could not be sent.
+    """
+    send_email_messages([EmailManager.build_rfq_response_alert_message(email_obj)])
+
+
+def flush_pending_notifications(window=None, now=None):
+    """
+        Send one email per buyer whose oldest pending alert has waited out the
+        coalescing window, covering every alert of that buyer so far. Alerts
+        are deleted only once their email is sent; a failed send is retried
+        with the email outbox's backoff until it has used up
+        EMAIL_OUTBOX_MAX_ATTEMPTS. Returns the number of emails sent.
+    """
+    window = RFQ_RESPONSE_ALERT_WINDOW if window is None else window
+    now = now or timezone.now()
+    cutoff = now - timedelta(seconds=window)
+    buyer_ids = list(
+        PendingNotification.objects.filter(created__lte=cutoff, next_attempt_at__lte=now)
+        .order_by()
+        .values_list("buyer_id", flat=True)
+        .distinct()
+    )
+    sent = 0
+    for buyer_id in buyer_ids:
+        with transaction.atomic():
+            # skip_locked lets overlapping flushes split the buyers between them
+            notifications = list(
+                PendingNotification.objects.select_for_update(skip_locked=True, of=("self",))
+                .filter(buyer_id=buyer_id, next_attempt_at__lte=now)
+                .select_related("buyer__user", "supplier", "request_for_quotation")
+                .order_by("created", "id")
+            )
+            if not notifications:
+                continue
+            claimed = PendingNotification.objects.filter(id__in=[notification.id for notification in notifications])
+            # The lease hides the claimed alerts from other flushes while this one sends
+            claimed.update(
+                attempts=F("attempts") + 1,
+                next_attempt_at=now + timedelta(seconds=EMAIL_OUTBOX_CLAIM_LEASE),
+            )
+        attempts = max(notification.attempts for notification in notifications) + 1
+        try:
+            send_rfq_response_digest(build_rfq_response_digest(notifications[0].buyer, notifications))
+        except Exception as ex:
+            logger.error(f"***** EMAIL ERROR : alerts of buyer {buyer_id} attempt {attempts}: {ex}")
+            claimed.update(
+                next_attempt_at=None if attempts >= EMAIL_OUTBOX_MAX_ATTEMPTS else now + retry_delay(attempts),
+                last_error=str(ex),
+            )
+            continue
+        claimed.delete()
+        sent += 1
+    return sent
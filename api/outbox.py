@@ -0,0 +1,123 @@
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from api.email_payloads import rfq_created_email_objs
+from api.helper import EmailManager
+from api.mailer import BULK, send_email_messages
+from api.models import EmailOutbox
+
+logger = logging.getLogger(__name__)
+
+EMAIL_OUTBOX_BATCH_SIZE = getattr(settings, "EMAIL_OUTBOX_BATCH_SIZE", 100)
+EMAIL_OUTBOX_MAX_ATTEMPTS = getattr(settings, "EMAIL_OUTBOX_MAX_ATTEMPTS", 5)
+EMAIL_OUTBOX_RETRY_BACKOFF = getattr(settings, "EMAIL_OUTBOX_RETRY_BACKOFF", 60)
+# Seconds a claimed row stays hidden from other drainers; a worker that dies
+# mid-batch leaves its rows to be picked up again once this runs out
+EMAIL_OUTBOX_CLAIM_LEASE = 300
+
+# Payloads hold ids only; a loader turns a batch of them into email objects
+# with a fixed number of queries, and a builder makes each one a message
+PAYLOAD_LOADERS = {
+    EmailOutbox.RFQ_CREATED: lambda payloads: rfq_created_email_objs(
+        [(payload["rfq_id"], payload["supplier_id"]) for payload in payloads]
+    ),
+}
+MESSAGE_BUILDERS = {
+    EmailOutbox.RFQ_CREATED: EmailManager.build_rfq_created_message,
+}
+SEND_LANES = {
+    EmailOutbox.RFQ_CREATED: BULK,
+}
+
+
+def enqueue_emails(kind, payloads):
+    """
+        Write one outbox row per email in the caller's transaction.
+    """
+    return EmailOutbox.objects.bulk_create(
+        [EmailOutbox(kind=kind, payload=payload) for payload in payloads]
+    )
+
+
+def load_email_objs(rows):
+    email_objs = {}
+    for kind in {row.kind for row in rows}:
+        kind_rows = [row for row in rows if row.kind == kind]
+        loaded = PAYLOAD_LOADERS[kind]([row.payload for row in kind_rows])
+        email_objs.update(zip([row.id for row in kind_rows], loaded))
+    return email_objs
+
+
+def retry_delay(attempts):
+    return timedelta(seconds=EMAIL_OUTBOX_RETRY_BACKOFF * 2 ** (attempts - 1))
+
+
+def claim_outbox_batch(batch_size, clock=timezone.now):
+    # Read the clock per batch: a long drain must not write leases that
+    # have already run out, or another drainer would claim the rows again
+    now = clock()
+    with transaction.atomic():
+        # skip_locked lets overlapping drainers take disjoint batches
+        rows = list(
+            EmailOutbox.objects.select_for_update(skip_locked=True)
+            .filter(status=EmailOutbox.PENDING, next_attempt_at__lte=now)
+            .order_by("next_attempt_at", "id")[:batch_size]
+        )
+        if rows:
+            EmailOutbox.objects.filter(id__in=[row.id for row in rows]).update(
+                attempts=F("attempts") + 1,
+                next_attempt_at=now + timedelta(seconds=EMAIL_OUTBOX_CLAIM_LEASE),
+            )
+    for row in rows:
+        row.attempts += 1
+    return rows
+
+
+def send_outbox_batch(rows, clock=timezone.now):
+    """
+        Send claimed rows over this worker's pooled connection and record
+        each outcome. A failed row is retried with exponential backoff from
+        the time it failed until it has used up EMAIL_OUTBOX_MAX_ATTEMPTS.
+    """
+    email_objs = load_email_objs(rows)
+    shared = {}
+    sent_ids = []
+    for row in rows:
+        try:
+            if not email_objs.get(row.id):
+                raise Exception("Email data no longer exists")
+            send_email_messages([MESSAGE_BUILDERS[row.kind](email_objs[row.id], shared)], SEND_LANES[row.kind])
+            sent_ids.append(row.id)
+        except Exception as ex:
+            logger.error(f"***** EMAIL ERROR : outbox row {row.id} attempt {row.attempts}: {ex}")
+            if row.attempts >= EMAIL_OUTBOX_MAX_ATTEMPTS:
+                EmailOutbox.objects.filter(id=row.id).update(status=EmailOutbox.FAILED, last_error=str(ex))
+            else:
+                EmailOutbox.objects.filter(id=row.id).update(
+                    next_attempt_at=clock() + retry_delay(row.attempts), last_error=str(ex)
+                )
+    if sent_ids:
+        EmailOutbox.objects.filter(id__in=sent_ids).update(status=EmailOutbox.SENT, sent_at=clock(), last_error="")
+    return len(sent_ids)
+
+
+def drain_email_outbox(batch_size=None, clock=timezone.now):
+    """
+        Send every committed outbox row that is due, one claimed batch at a
+        time. Returns the number of emails sent.
+    """
+    batch_size = batch_size or EMAIL_OUTBOX_BATCH_SIZE
+    sent = 0
+    while True:
+        rows = claim_outbox_batch(batch_size, clock)
+        if not rows:
+            break
+        sent += send_outbox_batch(rows, clock)
+        if len(rows) < batch_size:
+            break
+    return sent
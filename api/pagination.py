@@ -0,0 +1,153 @@
+import base64
+import json
+import uuid
+from datetime import date, datetime
+
+from django.core.exceptions import ValidationError
+from django.db import connections
+from django.db.models import F, Q
+
+COUNT_EXACT = "exact"
+COUNT_ESTIMATE = "estimate"
+COUNT_NONE = "none"
+COUNT_MODES = (COUNT_EXACT, COUNT_ESTIMATE, COUNT_NONE)
+# Without planner statistics an estimate counts at most this many rows
+ESTIMATE_COUNT_CAP = 10000
+
+
+def parse_ordering(ordering):
+    """
+        Turn `order_by`-style names ("-created", "id") into (field, descending)
+        pairs. The last field must be unique so every row has a distinct key.
+    """
+    return [(name.lstrip("-"), name.startswith("-")) for name in ordering]
+
+
+def order_by_expressions(ordering):
+    """
+        Order expressions for `ordering`, with NULLs last in both directions so
+        offset and cursor pages agree on every database.
+    """
+    return [
+        F(field).desc(nulls_last=True) if descending else F(field).asc(nulls_last=True)
+        for field, descending in parse_ordering(ordering)
+    ]
+
+
+def _encode_value(value):
+    if isinstance(value, datetime):
+        return ["dt", value.isoformat()]
+    if isinstance(value, date):
+        return ["d", value.isoformat()]
+    if isinstance(value, uuid.UUID):
+        return ["s", str(value)]
+    return ["v", value]
+
+
+def _decode_value(value):
+    kind, raw = value
+    if kind == "dt":
+        return datetime.fromisoformat(raw)
+    if kind == "d":
+        return date.fromisoformat(raw)
+    return raw
+
+
+def encode_cursor(values, position):
+    payload = {"k": [_encode_value(value) for value in values], "n": position}
+    return base64.urlsafe_b64encode(json.dumps(payload, separators=(",", ":")).encode()).decode()
+
+
+def decode_cursor(cursor, ordering):
+    """
+        Return (key values, position) of a cursor made by `encode_cursor`.
+        An empty cursor starts at the first row.
+    """
+    if not cursor:
+        return None, 0
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        values = [_decode_value(value) for value in payload["k"]]
+        position = int(payload["n"])
+    except (ValueError, TypeError, KeyError):
+        raise ValidationError("Invalid cursor.")
+    if len(values) != len(ordering):
+        raise ValidationError("Invalid cursor.")
+    return values, position
+
+
+def _seek_filter(ordering, values):
+    """
+        Match the rows that sort strictly after `values`: a row is after the
+        cursor when it equals it on the leading keys and is past it on the next
+        one. NULLs sort last, so they are past every value and equal only to NULL.
+    """
+    seek = Q(pk__in=[])
+    equal = Q()
+    for (field, descending), value in zip(parse_ordering(ordering), values):
+        if value is None:
+            equal &= Q(**{f"{field}__isnull": True})
+            continue
+        past = Q(**{f"{field}__{'lt' if descending else 'gt'}": value}) | Q(**{f"{field}__isnull": True})
+        seek |= equal & past
+        equal &= Q(**{field: value})
+    return seek
+
+
+def _row_value(row, field):
+    return row[field] if isinstance(row, dict) else getattr(row, field)
+
+
+def paginate_keyset(queryset, ordering, cursor, limit):
+    """
+        Return (rows, next_cursor, position) for the page of `queryset` after
+        `cursor`, seeking on the `ordering` keys instead of an OFFSET scan.
+        `next_cursor` is None on the last page and `position` is the number of
+        rows before this page.
+    """
+    values, position = decode_cursor(cursor, ordering)
+    queryset = queryset.order_by(*order_by_expressions(ordering))
+    if values is not None:
+        queryset = queryset.filter(_seek_filter(ordering, values))
+    rows = list(queryset[:limit + 1])
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(
+            [_row_value(last, field) for field, _ in parse_ordering(ordering)],
+            position + limit,
+        )
+    return rows, next_cursor, position
+
+
+def parse_count_mode(value, default=COUNT_EXACT):
+    value = (value or default).lower()
+    if value not in COUNT_MODES:
+        raise ValidationError(f"count must be one of {', '.join(COUNT_MODES)}.")
+    return value
+
+
+def estimate_count(queryset):
+    """
+        Approximate the row count of `queryset` cheaply: the planner's estimate
+        on PostgreSQL, a count capped at ESTIMATE_COUNT_CAP elsewhere.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor == "postgresql":
+        sql, params = queryset.order_by().query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+            plan = cursor.fetchone()[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+    return queryset.order_by()[:ESTIMATE_COUNT_CAP].count()
+
+
+def count_rows(queryset, mode):
+    if mode == COUNT_NONE:
+        return None
+    if mode == COUNT_ESTIMATE:
+        return estimate_count(queryset)
+    return queryset.count()
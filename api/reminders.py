@@ -0,0 +1,107 @@
+from django.conf import settings
+from django.db.models import Exists, F, OuterRef
+
+from api.helper import EmailManager, format_date_for_timezone, get_buyer_timezone
+from api.models import Buyer, RequestForQuotationItemResponse, RequestForQuotationItems
+
+
+def pending_quote_lines(buyer, rfq_item_id=None, rfq_id=None):
+    """
+        Every (invited supplier, open item) pair of the buyer's RFQs without a
+        quote, found with one anti-join. Narrow it to one item or one RFQ;
+        with neither, every open RFQ of the buyer is swept.
+    """
+    items = RequestForQuotationItems.objects.filter(
+        request_for_quotation__buyer=buyer,
+        request_for_quotation__suppliers__isnull=False,
+        status=RequestForQuotationItems.OPEN,
+    )
+    if rfq_item_id:
+        items = items.filter(id=rfq_item_id)
+    if rfq_id:
+        items = items.filter(request_for_quotation_id=rfq_id)
+    quoted = RequestForQuotationItemResponse.objects.filter(
+        request_for_quotation_item=OuterRef("pk"),
+        supplier=OuterRef("supplier_id"),
+    )
+    return (
+        items.annotate(supplier_id=F("request_for_quotation__suppliers"))
+        .filter(~Exists(quoted))
+        .order_by("supplier_id", "request_for_quotation_id", "id")
+        .values(
+            "id",
+            "product_name",
+            "quantity",
+            "uom",
+            "specifications",
+            "expected_delivery_date",
+            "request_for_quotation_id",
+            "supplier_id",
+            supplier_email=F("request_for_quotation__suppliers__email"),
+            supplier_name=F("request_for_quotation__suppliers__person_of_contact"),
+        )
+    )
+
+
+def build_reminder_digests(buyer, lines):
+    """
+        Group pending lines into one reminder email per supplier, with the
+        lines of each RFQ listed under that RFQ's response link.
+    """
+    buyer_timezone = get_buyer_timezone(buyer)
+    digests = {}
+    for line in lines:
+        digest = digests.get(line["supplier_id"])
+        if digest is None:
+            digest = digests[line["supplier_id"]] = {
+                "to": [line["supplier_email"]],
+                "cc": [buyer.user.email],
+                "company_name": buyer.company_name,
+                "supplier_name": line["supplier_name"],
+                "rfqs": [],
+                "total_items": 0,
+            }
+        rfq_id = line["request_for_quotation_id"]
+        if not digest["rfqs"] or digest["rfqs"][-1]["rfq_id"] != rfq_id:
+            digest["rfqs"].append(
+                {
+                    "rfq_id": rfq_id,
+                    "rfq_response_url": f"{settings.FRONTEND_URL}/rfq-response/{rfq_id}/{line['supplier_id']}",
+                    "items": [],
+                }
+            )
+        digest["rfqs"][-1]["items"].append(
+            {
+                "product_name": line["product_name"],
+                "quantity": line["quantity"],
+                "uom": line["uom"],
+                "specifications": line["specifications"],
+                "expected_delivery_date": format_date_for_timezone(line["expected_delivery_date"], buyer_timezone)
+                or "Not specified",
+            }
+        )
+        digest["total_items"] += 1
+
+    for digest in digests.values():
+        if digest["total_items"] == 1:
+            digest["subject"] = f"Reminder: Quote Request for {digest['rfqs'][0]['items'][0]['product_name']}"
+        else:
+            digest["subject"] = f"Reminder: {digest['total_items']} items are awaiting your quote"
+    return list(digests.values())
+
+
+def send_reminder_digests(buyer, lines):
+    digests = build_reminder_digests(buyer, lines)
+    for email_obj in digests:
+        EmailManager.send_rfq_reminder_digest(email_obj)
+    return len(digests)
+
+
+def send_rfq_reminders(buyer_id, rfq_item_id=None, rfq_id=None):
+    """
+        Worker side of a reminder request: find the pending lines again and
+        send the digests, so the task only carries ids. A supplier who quoted
+        in the meantime is no longer reminded.
+    """
+    buyer = Buyer.objects.select_related("user").get(id=buyer_id)
+    return send_reminder_digests(buyer, list(pending_quote_lines(buyer, rfq_item_id=rfq_item_id, rfq_id=rfq_id)))
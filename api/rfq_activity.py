@@ -0,0 +1,99 @@
+from django.db import transaction
+from django.db.models import Count, Max, Min, OuterRef, Subquery
+from django.db.models.functions import Coalesce, Greatest
+
+from api.models import RequestForQuotation, RequestForQuotationItemResponse, RequestForQuotationItems
+
+RFQ_ACTIVITY_FIELDS = (
+    "item_count",
+    "open_item_count",
+    "quotes_count",
+    "latest_item_update",
+    "latest_response_update",
+    "earliest_delivery_date",
+    "latest_activity",
+)
+REPAIR_BATCH_SIZE = 1000
+
+
+def _rfq_aggregate(queryset, group_by, expression):
+    return Subquery(queryset.order_by().values(group_by).annotate(value=expression).values("value")[:1])
+
+
+def _activity_expressions():
+    """
+        Correlated subqueries computing each counter of the outer RFQ, so a
+        refresh is a single UPDATE that never joins items with responses.
+    """
+    items = RequestForQuotationItems.objects.filter(request_for_quotation=OuterRef("pk"))
+    open_items = items.filter(status=RequestForQuotationItems.OPEN)
+    responses = RequestForQuotationItemResponse.objects.filter(
+        request_for_quotation_item__request_for_quotation=OuterRef("pk")
+    )
+    response_rfq = "request_for_quotation_item__request_for_quotation"
+    return {
+        "item_count": Coalesce(_rfq_aggregate(items, "request_for_quotation", Count("id")), 0),
+        "open_item_count": Coalesce(_rfq_aggregate(open_items, "request_for_quotation", Count("id")), 0),
+        "quotes_count": Coalesce(_rfq_aggregate(responses, response_rfq, Count("id")), 0),
+        "latest_item_update": _rfq_aggregate(items, "request_for_quotation", Max("updated")),
+        "latest_response_update": _rfq_aggregate(responses, response_rfq, Max("updated")),
+        "earliest_delivery_date": _rfq_aggregate(items, "request_for_quotation", Min("expected_delivery_date")),
+    }
+
+
+def _latest_activity():
+    return Greatest(
+        Coalesce("latest_item_update", "updated"),
+        Coalesce("latest_response_update", "updated"),
+        "updated",
+    )
+
+
+def refresh_rfq_activity(rfq_ids):
+    """
+        Recompute the activity counters of the given RFQs from their items and
+        responses. `rfq_ids` may be a list or an id subquery. Runs inside the
+        caller's transaction so the counters commit with the writes they describe.
+    """
+    with transaction.atomic():
+        # Lock the RFQs first: a concurrent writer of the same RFQ waits here
+        # until this one commits, and its UPDATE then starts on a snapshot
+        # that sees these items and responses. Without the lock, READ
+        # COMMITTED re-checks the row but keeps the stale subquery results.
+        locked_ids = list(
+            RequestForQuotation.objects.select_for_update()
+            .filter(id__in=rfq_ids)
+            .order_by("id")
+            .values_list("id", flat=True)
+        )
+        rfqs = RequestForQuotation.objects.filter(id__in=locked_ids)
+        rfqs.update(**_activity_expressions())
+        rfqs.update(latest_activity=_latest_activity())
+
+
+def refresh_item_rfq_activity(item_ids):
+    refresh_rfq_activity(
+        RequestForQuotationItems.objects.filter(id__in=item_ids).values("request_for_quotation_id")
+    )
+
+
+def repair_rfq_activity(buyer=None, batch_size=REPAIR_BATCH_SIZE):
+    """
+        Recompute the counters of every RFQ (or a buyer's RFQs) in batches.
+        Returns (checked, repaired): how many RFQs were recomputed and how
+        many of them had drifted.
+    """
+    rfqs = RequestForQuotation.objects.all()
+    if buyer:
+        rfqs = rfqs.filter(buyer=buyer)
+    rfq_ids = list(rfqs.order_by("id").values_list("id", flat=True))
+    repaired = 0
+    for start in range(0, len(rfq_ids), batch_size):
+        batch = rfq_ids[start:start + batch_size]
+        with transaction.atomic():
+            stored = RequestForQuotation.objects.filter(id__in=batch)
+            before = {row[0]: row[1:] for row in stored.values_list("id", *RFQ_ACTIVITY_FIELDS)}
+            refresh_rfq_activity(batch)
+            after = {row[0]: row[1:] for row in stored.values_list("id", *RFQ_ACTIVITY_FIELDS)}
+        repaired += sum(1 for rfq_id, values in after.items() if before.get(rfq_id) != values)
+    return len(rfq_ids), repaired
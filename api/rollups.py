@@ -0,0 +1,301 @@
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+
+from django.db import transaction
+from django.db.models import Count, DurationField, ExpressionWrapper, F, Q, Sum
+from django.db.models.functions import Coalesce, TruncDate
+from django.utils import timezone
+
+from api.caching import bump_buyer_data_version_on_commit
+from api.models import (
+    Buyer,
+    DailyBuyerRollup,
+    DailyProductRollup,
+    DailySupplierRollup,
+    RequestForQuotation,
+    RequestForQuotationItemResponse,
+    RequestForQuotationItems,
+    RollupCheckpoint,
+    Supplier,
+)
+
+DASHBOARD_ROLLUP_CHECKPOINT = "dashboard-rollups"
+# Rows committed by transactions that were still open at the previous run carry
+# an `updated` older than its watermark, so every run looks back a little further.
+DASHBOARD_ROLLUP_OVERLAP = timedelta(minutes=5)
+
+RFQ_PATH = "request_for_quotation__"
+RESPONSE_RFQ_PATH = "request_for_quotation_item__request_for_quotation__"
+
+
+def compute_rollup_rows(rfq_filter):
+    """
+        Aggregate the RFQs matching `rfq_filter` into daily rollup rows, bucketed by
+        buyer and RFQ creation day. Returns (buyer_rows, product_rows, supplier_rows)
+        as unsaved rollup instances.
+    """
+    rfqs = RequestForQuotation.objects.filter(rfq_filter).exclude(buyer=None)
+    items = RequestForQuotationItems.objects.filter(request_for_quotation__in=rfqs)
+    placed = Q(order_status=RequestForQuotationItemResponse.ORDER_PLACED)
+
+    buyer_rows = {}
+    for row in (
+        rfqs.order_by()
+        .annotate(day=TruncDate("created"))
+        .values("buyer_id", "day")
+        .annotate(
+            rfqs_created=Count("id", distinct=True),
+            open_rfqs=Count(
+                "id",
+                distinct=True,
+                filter=Q(request_for_quotation_items__status=RequestForQuotationItems.OPEN),
+            ),
+        )
+    ):
+        buyer_rows[row["buyer_id"], row["day"]] = DailyBuyerRollup(**row)
+
+    for row in (
+        items.filter(status=RequestForQuotationItems.CLOSE)
+        .order_by()
+        .annotate(
+            day=TruncDate(f"{RFQ_PATH}created"),
+            sla=ExpressionWrapper(
+                F("request_for_quotation_item_response__updated") - F("created"),
+                output_field=DurationField(),
+            ),
+        )
+        .values(f"{RFQ_PATH}buyer_id", "day")
+        .annotate(sla_sum=Sum("sla"), sla_count=Count("sla"))
+    ):
+        rollup = buyer_rows[row[f"{RFQ_PATH}buyer_id"], row["day"]]
+        rollup.sla_seconds_sum = row["sla_sum"].total_seconds() if row["sla_sum"] else 0
+        rollup.sla_count = row["sla_count"]
+
+    product_rows = [
+        DailyProductRollup(
+            buyer_id=row[f"{RFQ_PATH}buyer_id"],
+            day=row["day"],
+            product_name=row["product_name"],
+            items_created=row["items_created"],
+            open_items=row["open_items"],
+        )
+        for row in items.order_by()
+        .annotate(day=TruncDate(f"{RFQ_PATH}created"))
+        .values(f"{RFQ_PATH}buyer_id", "day", "product_name")
+        .annotate(
+            items_created=Count("id"),
+            open_items=Count("id", filter=Q(status=RequestForQuotationItems.OPEN)),
+        )
+    ]
+
+    value = F("price") * F("quantity")
+    supplier_rows = [
+        DailySupplierRollup(
+            buyer_id=row[f"{RESPONSE_RFQ_PATH}buyer_id"],
+            day=row["day"],
+            product_name=row["request_for_quotation_item__product_name"],
+            supplier_id=row["supplier_id"],
+            response_count=row["response_count"],
+            order_count=row["order_count"],
+            purchase_value=row["purchase_value"],
+            lead_time_sum=row["lead_time_sum"],
+            lead_time_count=row["lead_time_count"],
+        )
+        for row in RequestForQuotationItemResponse.objects.filter(request_for_quotation_item__in=items)
+        .order_by()
+        .annotate(day=TruncDate(f"{RESPONSE_RFQ_PATH}created"))
+        .values(f"{RESPONSE_RFQ_PATH}buyer_id", "day", "request_for_quotation_item__product_name", "supplier_id")
+        .annotate(
+            response_count=Count("id"),
+            order_count=Count("id", filter=placed),
+            purchase_value=Coalesce(Sum(value, filter=placed), 0.0),
+            lead_time_sum=Coalesce(Sum("lead_time"), 0),
+            lead_time_count=Count("lead_time"),
+        )
+    ]
+    return list(buyer_rows.values()), product_rows, supplier_rows
+
+
+def _write_buyer_rollups(buyer_id, days=None):
+    """
+        Replace the stored rollups of a buyer, for the given days or for all of them.
+    """
+    rfq_filter = Q(buyer_id=buyer_id)
+    rollup_filter = Q(buyer_id=buyer_id)
+    if days is not None:
+        rfq_filter &= Q(created__date__in=days)
+        rollup_filter &= Q(day__in=days)
+    with transaction.atomic():
+        buyer_rows, product_rows, supplier_rows = compute_rollup_rows(rfq_filter)
+        for model, rows in (
+            (DailyBuyerRollup, buyer_rows),
+            (DailyProductRollup, product_rows),
+            (DailySupplierRollup, supplier_rows),
+        ):
+            model.objects.filter(rollup_filter).delete()
+            model.objects.bulk_create(rows)
+        bump_buyer_data_version_on_commit(buyer_id)
+
+
+def _touched_buckets(since, buyer_id=None):
+    """
+        Return {buyer_id: {day, ...}} for every RFQ bucket with an RFQ, item or
+        response written since `since`, for one buyer or all of them.
+    """
+    buckets = defaultdict(set)
+    for queryset, path in (
+        (RequestForQuotation.objects.all(), ""),
+        (RequestForQuotationItems.objects.all(), RFQ_PATH),
+        (RequestForQuotationItemResponse.objects.all(), RESPONSE_RFQ_PATH),
+    ):
+        if buyer_id is not None:
+            queryset = queryset.filter(**{f"{path}buyer_id": buyer_id})
+        rows = (
+            queryset.filter(updated__gte=since)
+            .exclude(**{f"{path}buyer": None})
+            .order_by()
+            .annotate(day=TruncDate(f"{path}created"))
+            .values_list(f"{path}buyer_id", "day")
+            .distinct()
+        )
+        for buyer_id, day in rows:
+            buckets[buyer_id].add(day)
+    return buckets
+
+
+def rebuild_dashboard_rollups(buyer=None):
+    """
+        Recompute every rollup from the RFQ tables, for one buyer or all of them.
+        Returns the number of buyers rebuilt.
+    """
+    buyer_ids = [buyer.id] if buyer else Buyer.objects.values_list("id", flat=True)
+    rebuilt = 0
+    for buyer_id in buyer_ids:
+        _write_buyer_rollups(buyer_id)
+        rebuilt += 1
+    return rebuilt
+
+
+def refresh_dashboard_rollups():
+    """
+        Recompute the rollup buckets touched since the previous run.
+        The first run rebuilds everything. Returns the number of buckets refreshed.
+    """
+    checkpoint, _ = RollupCheckpoint.objects.get_or_create(name=DASHBOARD_ROLLUP_CHECKPOINT)
+    started = timezone.now()
+    if checkpoint.last_run is None:
+        rebuild_dashboard_rollups()
+        refreshed = DailyBuyerRollup.objects.count()
+    else:
+        buckets = _touched_buckets(checkpoint.last_run - DASHBOARD_ROLLUP_OVERLAP)
+        for buyer_id, days in buckets.items():
+            _write_buyer_rollups(buyer_id, sorted(days))
+        refreshed = sum(len(days) for days in buckets.values())
+    checkpoint.last_run = started
+    checkpoint.save(update_fields=["last_run", "updated"])
+    return refreshed
+
+
+def get_dashboard_rollup_stats(buyer, start_day=None):
+    """
+        Summarise the RFQ metrics of the buyer's dashboard from the day `start_day`
+        onwards (or over all time). Stored rollups cover the closed days; today and
+        any past day written since the last refresh are aggregated live, so the
+        result does not wait for the next refresh. Before the first refresh every
+        day is aggregated live.
+    """
+    today = timezone.localdate()
+    today_start = timezone.make_aware(datetime.combine(today, time.min))
+    last_run = (
+        RollupCheckpoint.objects.filter(name=DASHBOARD_ROLLUP_CHECKPOINT)
+        .values_list("last_run", flat=True)
+        .first()
+    )
+    if last_run is None:
+        stored = Q(pk__in=[])
+        live = Q(buyer=buyer)
+        if start_day is not None:
+            live &= Q(created__gte=timezone.make_aware(datetime.combine(start_day, time.min)))
+    else:
+        stale_days = {
+            day
+            for day in _touched_buckets(last_run - DASHBOARD_ROLLUP_OVERLAP, buyer.id)[buyer.id]
+            if day < today and (start_day is None or day >= start_day)
+        }
+        stored = Q(buyer=buyer, day__lt=today) & ~Q(day__in=stale_days)
+        if start_day is not None:
+            stored &= Q(day__gte=start_day)
+        live = Q(buyer=buyer) & (Q(created__gte=today_start) | Q(created__date__in=stale_days))
+    live_buyer_rows, live_product_rows, live_supplier_rows = compute_rollup_rows(live)
+
+    totals = DailyBuyerRollup.objects.filter(stored).aggregate(
+        rfqs_created=Coalesce(Sum("rfqs_created"), 0),
+        open_rfqs=Coalesce(Sum("open_rfqs"), 0),
+        sla_seconds_sum=Coalesce(Sum("sla_seconds_sum"), 0.0),
+        sla_count=Coalesce(Sum("sla_count"), 0),
+    )
+    for row in live_buyer_rows:
+        for field in totals:
+            totals[field] += getattr(row, field)
+
+    items_by_product = defaultdict(int)
+    for row in (
+        DailyProductRollup.objects.filter(stored)
+        .values("product_name")
+        .annotate(items_created=Sum("items_created"))
+        .order_by("product_name")
+    ):
+        items_by_product[row["product_name"]] += row["items_created"]
+    for row in live_product_rows:
+        items_by_product[row.product_name] += row.items_created
+
+    suppliers_by_product = defaultdict(set)
+    orders_by_supplier = defaultdict(lambda: {"count": 0, "value": 0.0})
+    supplier_rows = [
+        (row["product_name"], row["supplier_id"], row["order_count"], row["purchase_value"])
+        for row in DailySupplierRollup.objects.filter(stored)
+        .values("product_name", "supplier_id")
+        .annotate(order_count=Sum("order_count"), purchase_value=Sum("purchase_value"))
+        .order_by("product_name")
+    ]
+    supplier_rows += [
+        (row.product_name, row.supplier_id, row.order_count, row.purchase_value)
+        for row in live_supplier_rows
+    ]
+    for product_name, supplier_id, order_count, purchase_value in supplier_rows:
+        suppliers = suppliers_by_product[product_name]
+        if supplier_id is not None:
+            suppliers.add(supplier_id)
+        if order_count:
+            orders_by_supplier[supplier_id]["count"] += order_count
+            orders_by_supplier[supplier_id]["value"] += purchase_value
+
+    names = dict(
+        Supplier.objects.filter(id__in=[key for key in orders_by_supplier if key is not None])
+        .values_list("id", "company_name")
+    )
+    purchases_by_name = {}
+    for supplier_id, order in orders_by_supplier.items():
+        purchase = purchases_by_name.setdefault(
+            names.get(supplier_id), {"supplier__company_name": names.get(supplier_id), "count": 0, "value": 0.0}
+        )
+        purchase["count"] += order["count"]
+        purchase["value"] += order["value"]
+
+    return {
+        "open_rfqs_count": totals["open_rfqs"],
+        "total_rfqs_count": totals["rfqs_created"],
+        "average_item_sla_in_hours": (
+            totals["sla_seconds_sum"] / totals["sla_count"] / 3600 if totals["sla_count"] else 0
+        ),
+        "rfqs_by_product": [
+            {"product_name": product_name, "count": count}
+            for product_name, count in items_by_product.items()
+        ],
+        "total_purchase_value": sum(order["value"] for order in orders_by_supplier.values()),
+        "suppliers_by_product": [
+            {"request_for_quotation_item__product_name": product_name, "supplier_count": len(suppliers)}
+            for product_name, suppliers in suppliers_by_product.items()
+        ],
+        "purchase_by_supplier": sorted(purchases_by_name.values(), key=lambda row: -row["value"]),
+    }
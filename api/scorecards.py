@@ -0,0 +1,188 @@
+from django.db import transaction
+from django.db.models import Count, F, FilteredRelation, OuterRef, Q, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+from api.models import (
+    Buyer,
+    RequestForQuotationItems,
+    RequestForQuotationItemResponse,
+    Supplier,
+    SupplierScorecard,
+)
+
+SCORECARD_FIELDS = (
+    "quotes_requested",
+    "quotes_received",
+    "quotes_value",
+    "orders_placed",
+    "order_value",
+)
+
+
+def _increment(buyer_id, supplier_ids, **deltas):
+    """
+        Atomically add `deltas` to the scorecards of the given suppliers,
+        creating missing scorecards first.
+    """
+    supplier_ids = list(supplier_ids)
+    if not supplier_ids or not any(deltas.values()):
+        return
+    SupplierScorecard.objects.bulk_create(
+        [SupplierScorecard(buyer_id=buyer_id, supplier_id=supplier_id) for supplier_id in supplier_ids],
+        ignore_conflicts=True,
+    )
+    SupplierScorecard.objects.filter(buyer_id=buyer_id, supplier_id__in=supplier_ids).update(
+        **{field: F(field) + delta for field, delta in deltas.items()}
+    )
+
+
+def record_quotes_requested(buyer, supplier_ids, item_count):
+    _increment(buyer.id, supplier_ids, quotes_requested=item_count)
+
+
+def record_quotes_received(buyer, supplier, responses):
+    responses = list(responses)
+    _increment(
+        buyer.id,
+        [supplier.id],
+        quotes_received=len(responses),
+        quotes_value=sum(float(response.price) * float(response.quantity) for response in responses),
+    )
+
+
+def record_order_placed(buyer, supplier, response):
+    _increment(
+        buyer.id,
+        [supplier.id],
+        orders_placed=1,
+        order_value=float(response.price) * float(response.quantity),
+    )
+
+
+def record_orders_placed(buyer, supplier, responses):
+    responses = list(responses)
+    _increment(
+        buyer.id,
+        [supplier.id],
+        orders_placed=len(responses),
+        order_value=sum(float(response.price) * float(response.quantity) for response in responses),
+    )
+
+
+def compute_supplier_stats_rows(buyer):
+    """
+        Compute every per-supplier metric of the buyer live, in one annotated query.
+        Response metrics are conditional aggregates over a single join, and quotes
+        requested is a correlated subquery so it does not multiply that join.
+    """
+    placed = Q(request_for_quotation_responses__order_status=RequestForQuotationItemResponse.ORDER_PLACED)
+    response_value = F("request_for_quotation_responses__price") * F("request_for_quotation_responses__quantity")
+    quotes_requested = (
+        RequestForQuotationItems.objects.filter(
+            request_for_quotation__buyer=buyer,
+            request_for_quotation__suppliers=OuterRef("pk"),
+        )
+        .order_by()
+        .values("request_for_quotation__suppliers")
+        .annotate(total=Count("id"))
+        .values("total")
+    )
+    return (
+        Supplier.objects.filter(buyer=buyer)
+        .annotate(
+            quotes_requested=Coalesce(Subquery(quotes_requested[:1]), 0),
+            quotes_received=Count("request_for_quotation_responses"),
+            quotes_value=Sum(response_value),
+            orders_placed=Count("request_for_quotation_responses", filter=placed),
+            order_value=Sum(response_value, filter=placed),
+        )
+        .values(
+            "id",
+            "company_name",
+            "quotes_requested",
+            "quotes_received",
+            "quotes_value",
+            "orders_placed",
+            "order_value",
+        )
+    )
+
+
+def _compute_buyer_scorecards(buyer):
+    for row in compute_supplier_stats_rows(buyer):
+        yield SupplierScorecard(
+            buyer=buyer,
+            supplier_id=row["id"],
+            **{field: row[field] or 0 for field in SCORECARD_FIELDS},
+        )
+
+
+def rebuild_supplier_scorecards(buyer=None):
+    """
+        Recompute scorecards from the RFQ tables, for one buyer or all of them.
+        Returns the number of scorecards written.
+    """
+    buyers = [buyer] if buyer else Buyer.objects.all()
+    written = 0
+    for buyer_obj in buyers:
+        with transaction.atomic():
+            scorecards = list(_compute_buyer_scorecards(buyer_obj))
+            SupplierScorecard.objects.filter(buyer=buyer_obj).exclude(
+                supplier_id__in=[scorecard.supplier_id for scorecard in scorecards]
+            ).delete()
+            SupplierScorecard.objects.bulk_create(
+                scorecards,
+                update_conflicts=True,
+                unique_fields=["buyer", "supplier"],
+                update_fields=list(SCORECARD_FIELDS) + ["updated"],
+            )
+        written += len(scorecards)
+    return written
+
+
+def get_supplier_stats_rows(buyer):
+    """
+        Read every supplier of the buyer with its scorecard totals in one query.
+    """
+    return (
+        Supplier.objects.filter(buyer=buyer)
+        .annotate(card=FilteredRelation("scorecards", condition=Q(scorecards__buyer=buyer)))
+        .values(
+            "id",
+            "company_name",
+            quotes_requested=F("card__quotes_requested"),
+            quotes_received=F("card__quotes_received"),
+            quotes_value=F("card__quotes_value"),
+            orders_placed=F("card__orders_placed"),
+            order_value=F("card__order_value"),
+        )
+    )
+
+
+def serialize_supplier_stats(rows):
+    """
+        Shape supplier stats rows into the `get-supplier-stats-data` payload,
+        adding the contribution percentages in a single pass.
+    """
+    data = []
+    for row in rows:
+        quotes_received = row["quotes_received"] or 0
+        orders_placed = row["orders_placed"] or 0
+        data.append({
+            "supplier_id":row["id"],
+            "company_name":row["company_name"],
+            "quotes_requested":row["quotes_requested"] or 0,
+            "quotes_received":quotes_received,
+            "quotes_value":row["quotes_value"] if row["quotes_value"] else "--",
+            "order_placed":orders_placed,
+            "total_order_value":row["order_value"] if row["order_value"] else 0.00,
+            "success_percent":f"{round(((orders_placed/quotes_received)*100),2) if quotes_received else 0.00}%",
+        })
+    total_suppliers_order_value = sum(d["total_order_value"] for d in data)
+    if total_suppliers_order_value>0:
+        for d in data:
+            if d['total_order_value']:
+                d["contribution_percent"] = f"{round((d['total_order_value']/total_suppliers_order_value),2)*100}%"
+            else:
+                d["contribution_percent"] = "--"
+    return data
@@ -0,0 +1,270 @@
+import logging
+import threading
+from collections import defaultdict
+
+from django.db import DatabaseError, connection, connections, transaction
+from django.db.models import F, FloatField, Func, Prefetch, TextField, Value
+from django.db.models.lookups import IContains
+from django.utils import timezone
+
+from api.models import (
+    RequestForQuotation,
+    RequestForQuotationItems,
+    SearchDocument,
+    Supplier,
+    SupplierCategory,
+)
+
+logger = logging.getLogger(__name__)
+
+FTS_TABLE = "search_documents_fts"
+TRIGRAM_INDEX = "search_documents_trgm_idx"
+# Trigram indexes can only answer terms of at least three characters
+MIN_INDEXED_TERM_LENGTH = 3
+REBUILD_CHUNK_SIZE = 1000
+
+
+def _join(*values):
+    return "\n".join(str(value) for value in values if value)
+
+
+def _supplier_documents(object_ids):
+    suppliers = Supplier.objects.filter(id__in=object_ids).prefetch_related(
+        Prefetch(
+            "categories",
+            queryset=SupplierCategory.objects.filter(active=True).order_by("id"),
+            to_attr="active_categories",
+        )
+    )
+    return {
+        str(supplier.id): (
+            supplier.buyer_id,
+            _join(
+                supplier.company_name,
+                supplier.person_of_contact,
+                supplier.phone_no,
+                supplier.email,
+                *(category.name for category in supplier.active_categories),
+            ),
+        )
+        for supplier in suppliers
+    }
+
+
+def _rfq_documents(object_ids):
+    rfqs = RequestForQuotation.objects.filter(id__in=object_ids).prefetch_related(
+        Prefetch(
+            "request_for_quotation_items",
+            queryset=RequestForQuotationItems.objects.only(
+                "request_for_quotation_id", "product_name", "specifications"
+            ).order_by("id"),
+        ),
+        Prefetch("suppliers", queryset=Supplier.objects.only("company_name").order_by("company_name")),
+    )
+    return {
+        str(rfq.id): (
+            rfq.buyer_id,
+            _join(
+                rfq.title,
+                *(
+                    value
+                    for item in rfq.request_for_quotation_items.all()
+                    for value in (item.product_name, item.specifications)
+                ),
+                *(supplier.company_name for supplier in rfq.suppliers.all()),
+            ),
+        )
+        for rfq in rfqs
+    }
+
+
+DOCUMENT_BUILDERS = {
+    SearchDocument.SUPPLIER: (Supplier, _supplier_documents),
+    SearchDocument.RFQ: (RequestForQuotation, _rfq_documents),
+}
+
+_pending = threading.local()
+
+
+@TextField.register_lookup
+class TrigramIContains(IContains):
+    """
+        `icontains` compiled as `ILIKE` on PostgreSQL. Django's own
+        `icontains` becomes `UPPER(document::text) LIKE UPPER(...)`, which the
+        `gin (document gin_trgm_ops)` index cannot serve; `ILIKE` on the bare
+        column can. Other databases get the regular `icontains`.
+    """
+
+    lookup_name = "trigram_icontains"
+
+    def as_sql(self, compiler, connection):
+        return IContains(self.lhs, self.rhs).as_sql(compiler, connection)
+
+    def as_postgresql(self, compiler, connection):
+        lhs_sql, params = self.process_lhs(compiler, connection)
+        rhs_sql, rhs_params = self.process_rhs(compiler, connection)
+        return f"{lhs_sql} ILIKE {rhs_sql}", [*params, *rhs_params]
+
+
+def install_search_index(using="default"):
+    """
+        Create the database-specific search index over `search_documents`:
+        an FTS5 trigram table on SQLite, a pg_trgm GIN index on PostgreSQL.
+        Other databases fall back to `icontains` on the document column.
+    """
+    db = connections[using]
+    try:
+        with db.cursor() as cursor:
+            if db.vendor == "sqlite":
+                cursor.execute(
+                    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(document, tokenize='trigram')"
+                )
+                # Index documents written by data migrations
+                cursor.execute(
+                    f"INSERT INTO {FTS_TABLE}(rowid, document) SELECT id, document FROM {SearchDocument._meta.db_table} "
+                    f"WHERE id NOT IN (SELECT rowid FROM {FTS_TABLE})"
+                )
+            elif db.vendor == "postgresql":
+                cursor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+                cursor.execute(
+                    f"CREATE INDEX IF NOT EXISTS {TRIGRAM_INDEX} ON {SearchDocument._meta.db_table} "
+                    "USING gin (document gin_trgm_ops)"
+                )
+    except DatabaseError as error:
+        logger.warning(f"Search index unavailable, falling back to icontains: {error}")
+
+
+def _has_fts_table():
+    if connection.vendor != "sqlite":
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s", [FTS_TABLE])
+        return cursor.fetchone() is not None
+
+
+def _sync_fts(document_ids, documents=()):
+    """Replace the FTS rows of the given search documents."""
+    if not document_ids or not _has_fts_table():
+        return
+    placeholders = ", ".join(["%s"] * len(document_ids))
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid IN ({placeholders})", list(document_ids))
+        if documents:
+            cursor.executemany(f"INSERT INTO {FTS_TABLE}(rowid, document) VALUES (%s, %s)", list(documents))
+
+
+def remove_search_documents(kind, object_ids):
+    object_ids = [str(object_id) for object_id in object_ids]
+    documents = SearchDocument.objects.filter(kind=kind, object_id__in=object_ids)
+    _sync_fts(list(documents.values_list("id", flat=True)))
+    documents.delete()
+
+
+def refresh_search_documents(kind, object_ids):
+    """
+        Rebuild the search documents of the given objects, dropping the
+        documents of objects that no longer exist.
+    """
+    object_ids = {str(object_id) for object_id in object_ids}
+    if not object_ids:
+        return
+    _, build = DOCUMENT_BUILDERS[kind]
+    built = build(object_ids)
+    remove_search_documents(kind, object_ids - set(built))
+    if not built:
+        return
+    now = timezone.now()
+    SearchDocument.objects.bulk_create(
+        [
+            SearchDocument(kind=kind, object_id=object_id, buyer_id=buyer_id, document=document, updated=now)
+            for object_id, (buyer_id, document) in built.items()
+        ],
+        update_conflicts=True,
+        unique_fields=["kind", "object_id"],
+        update_fields=["buyer", "document", "updated"],
+    )
+    rows = list(
+        SearchDocument.objects.filter(kind=kind, object_id__in=list(built)).values_list("id", "document")
+    )
+    _sync_fts([document_id for document_id, _ in rows], rows)
+
+
+def _flush_pending_refreshes():
+    pending = getattr(_pending, "documents", None)
+    _pending.documents = None
+    for kind, object_ids in (pending or {}).items():
+        refresh_search_documents(kind, object_ids)
+
+
+def refresh_search_documents_on_commit(kind, object_ids):
+    """
+        Refresh the search documents of the given objects once the current
+        transaction commits, so a burst of writes rebuilds each document once.
+    """
+    if getattr(_pending, "documents", None) is None:
+        _pending.documents = defaultdict(set)
+    _pending.documents[kind].update(str(object_id) for object_id in object_ids if object_id)
+    # Every call registers the flush: the first one to run refreshes everything
+    # and the rest are no-ops, and a rolled back transaction only leaves ids
+    # behind that are harmless to refresh later.
+    transaction.on_commit(_flush_pending_refreshes)
+
+
+def rebuild_search_index(kind=None, buyer=None):
+    """
+        Recompute every search document of one kind (or all kinds), optionally
+        for a single buyer. Returns the number of documents written.
+    """
+    written = 0
+    for index_kind, (model, _) in DOCUMENT_BUILDERS.items():
+        if kind and index_kind != kind:
+            continue
+        objects = model.objects.all()
+        stale = SearchDocument.objects.filter(kind=index_kind)
+        if buyer:
+            objects = objects.filter(buyer=buyer)
+            stale = stale.filter(buyer=buyer)
+        object_ids = [str(object_id) for object_id in objects.values_list("id", flat=True).order_by("id")]
+        remove_search_documents(
+            index_kind, set(stale.values_list("object_id", flat=True)) - set(object_ids)
+        )
+        for start in range(0, len(object_ids), REBUILD_CHUNK_SIZE):
+            refresh_search_documents(index_kind, object_ids[start:start + REBUILD_CHUNK_SIZE])
+        written += len(object_ids)
+    return written
+
+
+def _fts_phrase(term):
+    return '"' + term.replace('"', '""') + '"'
+
+
+def search_ids(kind, buyer, term):
+    """
+        Return the ids of the buyer's objects of `kind` whose search document
+        contains `term`, best match first.
+    """
+    term = term.strip()
+    if not term:
+        return []
+    documents = SearchDocument.objects.filter(kind=kind, buyer=buyer)
+    if len(term) >= MIN_INDEXED_TERM_LENGTH:
+        if connection.vendor == "postgresql":
+            return list(
+                documents.filter(document__trigram_icontains=term)
+                .annotate(
+                    rank=Func(Value(term), F("document"), function="word_similarity", output_field=FloatField())
+                )
+                .order_by("-rank", "object_id")
+                .values_list("object_id", flat=True)
+            )
+        if _has_fts_table():
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f"SELECT d.object_id FROM {FTS_TABLE} f "
+                    f"JOIN {SearchDocument._meta.db_table} d ON d.id = f.rowid "
+                    f"WHERE {FTS_TABLE} MATCH %s AND d.kind = %s AND d.buyer_id = %s "
+                    "ORDER BY f.rank, d.object_id",
+                    [_fts_phrase(term), kind, buyer.id],
+                )
+                return [row[0] for row in cursor.fetchall()]
+    return list(documents.filter(document__icontains=term).order_by("object_id").values_list("object_id", flat=True))
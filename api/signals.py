@@ -0,0 +1,117 @@
+from django.db.models.signals import m2m_changed, post_delete, post_migrate, post_save, pre_delete
+from django.dispatch import receiver
+
+from api.caching import bump_buyer_data_version_on_commit
+from api.models import (
+    RequestForQuotation,
+    RequestForQuotationItemResponse,
+    RequestForQuotationItems,
+    SearchDocument,
+    Supplier,
+    SupplierCategory,
+)
+from api.rfq_activity import refresh_item_rfq_activity, refresh_rfq_activity
+from api.search import install_search_index, refresh_search_documents_on_commit
+
+
+def _rfq_buyer_id(**lookup):
+    if not all(lookup.values()):
+        return None
+    return RequestForQuotation.objects.filter(**lookup).values_list("buyer_id", flat=True).first()
+
+
+@receiver([post_save, post_delete], sender=RequestForQuotation)
+def rfq_changed(sender, instance, **kwargs):
+    bump_buyer_data_version_on_commit(instance.buyer_id)
+
+
+@receiver(m2m_changed, sender=RequestForQuotation.suppliers.through)
+def rfq_suppliers_changed(sender, instance, action, **kwargs):
+    if action in ("post_add", "post_remove", "post_clear") and isinstance(instance, RequestForQuotation):
+        bump_buyer_data_version_on_commit(instance.buyer_id)
+
+
+@receiver([post_save, post_delete], sender=RequestForQuotationItems)
+def rfq_item_changed(sender, instance, **kwargs):
+    bump_buyer_data_version_on_commit(_rfq_buyer_id(id=instance.request_for_quotation_id))
+
+
+@receiver([post_save, post_delete], sender=RequestForQuotationItemResponse)
+def rfq_response_changed(sender, instance, **kwargs):
+    bump_buyer_data_version_on_commit(
+        _rfq_buyer_id(request_for_quotation_items=instance.request_for_quotation_item_id)
+    )
+
+
+@receiver([post_save, post_delete], sender=Supplier)
+@receiver([post_save, post_delete], sender=SupplierCategory)
+def supplier_changed(sender, instance, **kwargs):
+    bump_buyer_data_version_on_commit(instance.buyer_id)
+
+
+@receiver([post_save, post_delete], sender=Supplier)
+def supplier_search_changed(sender, instance, **kwargs):
+    refresh_search_documents_on_commit(SearchDocument.SUPPLIER, [instance.id])
+
+
+@receiver([post_save, pre_delete], sender=Supplier)
+def supplier_rfq_search_changed(sender, instance, update_fields=None, **kwargs):
+    # RFQ documents hold the invited suppliers' names. On delete this runs
+    # before the RFQ links are removed, so the RFQs can still be found.
+    if update_fields is not None and "company_name" not in update_fields:
+        return
+    refresh_search_documents_on_commit(
+        SearchDocument.RFQ, instance.request_for_quotations.values_list("id", flat=True)
+    )
+
+
+@receiver([post_save, post_delete], sender=SupplierCategory)
+def supplier_category_search_changed(sender, instance, **kwargs):
+    refresh_search_documents_on_commit(SearchDocument.SUPPLIER, [instance.supplier_id])
+
+
+@receiver([post_save, post_delete], sender=RequestForQuotation)
+def rfq_search_changed(sender, instance, **kwargs):
+    refresh_search_documents_on_commit(SearchDocument.RFQ, [instance.id])
+
+
+@receiver([post_save, post_delete], sender=RequestForQuotationItems)
+def rfq_item_search_changed(sender, instance, **kwargs):
+    refresh_search_documents_on_commit(SearchDocument.RFQ, [instance.request_for_quotation_id])
+
+
+@receiver(m2m_changed, sender=RequestForQuotation.suppliers.through)
+def rfq_suppliers_search_changed(sender, instance, action, pk_set, **kwargs):
+    if action not in ("post_add", "post_remove", "pre_clear"):
+        return
+    if isinstance(instance, RequestForQuotation):
+        refresh_search_documents_on_commit(SearchDocument.RFQ, [instance.id])
+    elif action == "pre_clear":
+        refresh_search_documents_on_commit(
+            SearchDocument.RFQ, instance.request_for_quotations.values_list("id", flat=True)
+        )
+    else:
+        refresh_search_documents_on_commit(SearchDocument.RFQ, pk_set or [])
+
+
+@receiver(post_save, sender=RequestForQuotation)
+def rfq_activity_changed(sender, instance, **kwargs):
+    refresh_rfq_activity([instance.id])
+
+
+@receiver([post_save, post_delete], sender=RequestForQuotationItems)
+def rfq_item_activity_changed(sender, instance, **kwargs):
+    if instance.request_for_quotation_id:
+        refresh_rfq_activity([instance.request_for_quotation_id])
+
+
+@receiver([post_save, post_delete], sender=RequestForQuotationItemResponse)
+def rfq_response_activity_changed(sender, instance, **kwargs):
+    if instance.request_for_quotation_item_id:
+        refresh_item_rfq_activity([instance.request_for_quotation_item_id])
+
+
+@receiver(post_migrate)
+def search_index_migrated(sender, using="default", **kwargs):
+    if sender.name == "api":
+        install_search_index(using)
@@ -1,13 +1,17 @@
 
 from .helper import EmailManager
+from . import email_payloads, notifications, outbox, reminders, rollups
 from vms_backend.celery import app
 
 class CeleryEmailManager:
     
+    # send_rfq_created_email, send_rfq_reminder and send_purchase_order take
+    # the old prebuilt email dicts. Nothing queues them any more; they stay
+    # for one release so messages queued before the deploy still send.
     @app.task(queue="email_queue")
     def send_rfq_created_email(email_obj):
         EmailManager.send_rfq_created_email(email_obj)
-    
+
     @app.task(queue="email_queue")
     def send_all_rfq_email(buyer_id):
         EmailManager.send_all_rfq_email(buyer_id)
@@ -32,7 +36,33 @@ class CeleryEmailManager:
     def send_rfq_reminder(email_obj):
         EmailManager.send_rfq_reminder(email_obj)
 
+    @app.task(queue="email_queue")
+    def send_rfq_reminders(buyer_id, rfq_item_id=None, rfq_id=None):
+        return reminders.send_rfq_reminders(buyer_id, rfq_item_id=rfq_item_id, rfq_id=rfq_id)
+
     @app.task(queue="email_queue")
     def send_purchase_order(email_obj):
-        EmailManager.send_purchase_order(email_obj)   
-        
\ No newline at end of file
+        EmailManager.send_purchase_order(email_obj)
+
+    @app.task(queue="email_queue")
+    def send_purchase_orders(response_ids):
+        email_payloads.send_purchase_orders(response_ids)
+
+    @app.task(queue="email_queue")
+    def drain_email_outbox():
+        return outbox.drain_email_outbox()
+
+
+class CeleryRollupManager:
+
+    # On email_queue, the queue every worker consumes, so beat's refresh runs
+    @app.task(queue="email_queue")
+    def refresh_dashboard_rollups():
+        return rollups.refresh_dashboard_rollups()
+
+
+class CeleryNotificationManager:
+
+    @app.task(queue="email_queue")
+    def flush_pending_notifications():
+        return notifications.flush_pending_notifications()
@@ -0,0 +1,130 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core import mail
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from api.models import (
+    Buyer,
+    RequestForQuotation,
+    RequestForQuotationItemResponse,
+    RequestForQuotationItems,
+    RequestForQuotationMetaData,
+    Supplier,
+    SupplierScorecard,
+)
+from api.email_payloads import send_purchase_orders
+
+
+@override_settings(USE_CELERY=False, SEND_EMAILS=True, FRONTEND_URL="http://localhost:3000")
+class PlaceBulkOrdersTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("award@example.com", password="strongpassword123")
+        self.buyer = Buyer.objects.create(
+            user=self.user,
+            subscription_expiry_date=timezone.now() + timedelta(days=30),
+            company_name="Award Co",
+        )
+        self.client.force_authenticate(user=self.user)
+        self.rfq = RequestForQuotation.objects.create(buyer=self.buyer, title="Award RFQ")
+        RequestForQuotationMetaData.objects.create(request_for_quotation=self.rfq, payment_terms="30 days")
+        self.suppliers = [
+            Supplier.objects.create(
+                buyer=self.buyer, company_name=f"Vendor {index}", person_of_contact="Contact", email=f"v{index}@example.com"
+            )
+            for index in range(2)
+        ]
+        self.items = []
+        self.responses = {}
+        for index in range(6):
+            item = RequestForQuotationItems.objects.create(
+                request_for_quotation=self.rfq, product_name=f"Part {index}", quantity=10, uom="pcs"
+            )
+            self.items.append(item)
+            for supplier in self.suppliers:
+                self.responses[item.id, supplier.id] = RequestForQuotationItemResponse.objects.create(
+                    request_for_quotation_item=item, supplier=supplier, quantity=10, price=2
+                )
+
+    def _award(self, lines):
+        return self.client.post(
+            reverse("place-bulk-orders", args=[self.rfq.id]),
+            {
+                "orders": [
+                    {"rfq_item_id": item.id, "response_id": self.responses[item.id, supplier.id].id, **extra}
+                    for item, supplier, extra in lines
+                ]
+            },
+            format="json",
+        )
+
+    def test_orders_are_placed_with_one_email_per_supplier(self):
+        lines = [(item, self.suppliers[index % 2], {}) for index, item in enumerate(self.items[:5])]
+        lines[0] = (self.items[0], self.suppliers[0], {"bought_quantity": 8, "bought_price": 1.5})
+
+        response = self._award(lines)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["orders_placed"], 5)
+        self.assertEqual(sorted(message.to[0] for message in mail.outbox), ["v0@example.com", "v1@example.com"])
+        first_mail = next(message for message in mail.outbox if message.to == ["v0@example.com"])
+        html = first_mail.alternatives[0][0]
+        self.assertIn("Part 0", html)
+        self.assertIn("Part 4", html)
+        self.assertNotIn("Part 1", html)
+        awarded = self.responses[self.items[0].id, self.suppliers[0].id]
+        awarded.refresh_from_db()
+        self.assertEqual((awarded.order_status, awarded.bought_quantity, awarded.bought_price), (1, 8, 1.5))
+        self.assertEqual(
+            RequestForQuotationItems.objects.filter(status=RequestForQuotationItems.CLOSE).count(), 5
+        )
+        self.rfq.refresh_from_db()
+        self.assertEqual(self.rfq.open_item_count, 1)
+        self.assertEqual(SupplierScorecard.objects.get(supplier=self.suppliers[0]).orders_placed, 3)
+
+    def test_invalid_lines_reject_the_whole_award(self):
+        self._award([(self.items[0], self.suppliers[0], {})])
+        mismatched = self.client.post(
+            reverse("place-bulk-orders", args=[self.rfq.id]),
+            {"orders": [{"rfq_item_id": self.items[1].id, "response_id": self.responses[self.items[2].id, self.suppliers[0].id].id}]},
+            format="json",
+        )
+        already_placed = self._award([(self.items[1], self.suppliers[0], {}), (self.items[0], self.suppliers[1], {})])
+        duplicate = self._award([(self.items[1], self.suppliers[0], {}), (self.items[1], self.suppliers[1], {})])
+
+        for response in (mismatched, already_placed, duplicate):
+            self.assertEqual(response.status_code, 400)
+        self.assertIn("Order already placed", already_placed.json()["error"])
+        self.assertEqual(RequestForQuotationItemResponse.objects.filter(order_status=1).count(), 1)
+
+    @override_settings(SEND_EMAILS=False)
+    def test_query_count_does_not_grow_with_lines(self):
+        with CaptureQueriesContext(connection) as small:
+            self.assertEqual(self._award([(self.items[0], self.suppliers[0], {})]).status_code, 200)
+        with CaptureQueriesContext(connection) as large:
+            lines = [(item, self.suppliers[0], {}) for item in self.items[1:]]
+            self.assertEqual(self._award(lines).status_code, 200)
+        self.assertEqual(len(large.captured_queries), len(small.captured_queries))
+
+    def test_celery_task_carries_response_ids_only(self):
+        lines = [(item, self.suppliers[index % 2], {}) for index, item in enumerate(self.items[:3])]
+        with override_settings(USE_CELERY=True), mock.patch(
+            "api.task.CeleryEmailManager.send_purchase_orders.delay"
+        ) as delay:
+            self.assertEqual(self._award(lines).status_code, 200)
+
+        response_ids = [self.responses[item.id, supplier.id].id for item, supplier, _ in lines]
+        delay.assert_called_once()
+        self.assertEqual(sorted(delay.call_args.args[0]), sorted(response_ids))
+        self.assertEqual(mail.outbox, [])
+
+        with self.assertNumQueries(2):
+            send_purchase_orders(delay.call_args.args[0])
+        self.assertEqual(sorted(message.to[0] for message in mail.outbox), ["v0@example.com", "v1@example.com"])
+        self.assertIn("30 days", mail.outbox[0].alternatives[0][0])
@@ -0,0 +1,85 @@
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core import mail
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from api.models import Buyer, RequestForQuotation, Supplier
+
+
+@override_settings(USE_CELERY=False, SEND_EMAILS=True, FRONTEND_URL="http://localhost:3000")
+class CreateRFQBulkTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("bulk@example.com", password="strongpassword123")
+        self.buyer = Buyer.objects.create(
+            user=self.user,
+            subscription_expiry_date=timezone.now() + timedelta(days=30),
+            company_name="Bulk Co",
+        )
+        self.client.force_authenticate(user=self.user)
+        self.suppliers = [
+            Supplier.objects.create(
+                buyer=self.buyer,
+                company_name=f"Vendor {index}",
+                person_of_contact="Contact",
+                email=f"vendor{index}@example.com",
+            )
+            for index in range(4)
+        ]
+        other_buyer = Buyer.objects.create(
+            user=User.objects.create_user("other@example.com", password="strongpassword123"),
+            subscription_expiry_date=timezone.now() + timedelta(days=30),
+        )
+        self.foreign_supplier = Supplier.objects.create(
+            buyer=other_buyer, company_name="Foreign", person_of_contact="Contact", email="foreign@example.com"
+        )
+
+    def _post(self, item_count, suppliers):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                reverse("create-rfq"),
+                {
+                    "title": "Bulk RFQ",
+                    "items": [
+                        {"product_name": f"Part {index}", "quantity": 5, "expected_delivery_date": "2030-01-01"}
+                        for index in range(item_count)
+                    ],
+                    "suppliers": [str(supplier.id) for supplier in suppliers],
+                },
+                format="json",
+            )
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_items_suppliers_and_counters_are_written_in_bulk(self):
+        suppliers = self.suppliers + [self.suppliers[0], self.foreign_supplier]
+        payload = self._post(5, suppliers)
+
+        rfq = RequestForQuotation.objects.get(id=payload["rfq_id"])
+        self.assertEqual([item["index"] for item in payload["created_items"]], [1, 2, 3, 4, 5])
+        self.assertEqual(
+            list(rfq.request_for_quotation_items.order_by("id").values_list("id", flat=True)),
+            [item["id"] for item in payload["created_items"]],
+        )
+        self.assertEqual(set(rfq.suppliers.all()), set(self.suppliers))
+        self.assertEqual((rfq.item_count, rfq.open_item_count), (5, 5))
+        self.assertEqual(str(rfq.earliest_delivery_date), "2030-01-01")
+
+    def test_emails_go_out_after_commit_in_one_batch(self):
+        payload = self._post(3, self.suppliers)
+
+        self.assertEqual(sorted(message.to[0] for message in mail.outbox), [s.email for s in self.suppliers])
+        self.assertIn(f"/rfq-response/{payload['rfq_id']}/{self.suppliers[0].id}", mail.outbox[0].alternatives[0][0])
+
+    def test_query_count_does_not_grow_with_items_or_suppliers(self):
+        self._post(1, self.suppliers[:1])
+        with CaptureQueriesContext(connection) as small:
+            self._post(1, self.suppliers[:1])
+        with CaptureQueriesContext(connection) as large:
+            self._post(40, self.suppliers)
+        self.assertEqual(len(large.captured_queries), len(small.captured_queries))
@@ -0,0 +1,175 @@
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core import mail
+from django.db import IntegrityError, connection, transaction
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from api.models import (
+    Buyer,
+    RequestForQuotation,
+    RequestForQuotationItemResponse,
+    RequestForQuotationMetaData,
+    RequestForQuotationItems,
+    Supplier,
+    SupplierScorecard,
+)
+from api.helper import violated_unique_constraint
+
+
+@override_settings(USE_CELERY=False, SEND_EMAILS=False, FRONTEND_URL="http://localhost:3000")
+class CreateRFQResponseBatchTests(APITestCase):
+    def setUp(self):
+        self.buyer = Buyer.objects.create(
+            user=User.objects.create_user("quotes@example.com", password="strongpassword123"),
+            subscription_expiry_date=timezone.now() + timedelta(days=30),
+            company_name="Quote Co",
+        )
+        self.supplier = Supplier.objects.create(
+            buyer=self.buyer, company_name="Vendor", person_of_contact="Contact", email="vendor@example.com"
+        )
+        self.rfq = RequestForQuotation.objects.create(buyer=self.buyer, title="Quote RFQ")
+        self.items = [
+            RequestForQuotationItems.objects.create(request_for_quotation=self.rfq, product_name=f"Part {index}", quantity=5)
+            for index in range(30)
+        ]
+
+    def _quote(self, items, supplier=None):
+        return self.client.post(
+            reverse("create-rfq-response"),
+            {
+                "rfq_id": self.rfq.id,
+                "supplier_id": str((supplier or self.supplier).id),
+                "items": [
+                    {"rfq_item_id": item.id, "quantity": 5, "price": 3, "supplier_lead_time": 2}
+                    for item in items
+                ],
+            },
+            format="json",
+        )
+
+    def test_quotes_are_created_once_per_item(self):
+        self.assertEqual(self._quote(self.items[:2] + self.items[:1]).status_code, 200)
+        self.assertEqual(self._quote(self.items[:3]).status_code, 200)
+
+        responses = RequestForQuotationItemResponse.objects.filter(supplier=self.supplier)
+        self.assertEqual(
+            sorted(responses.values_list("request_for_quotation_item_id", flat=True)),
+            [item.id for item in self.items[:3]],
+        )
+        self.rfq.refresh_from_db()
+        self.assertEqual(self.rfq.quotes_count, 3)
+
+    def test_already_quoted_items_are_skipped_even_once_ordered(self):
+        self.assertEqual(self._quote(self.items[:1]).status_code, 200)
+        RequestForQuotationItemResponse.objects.filter(request_for_quotation_item=self.items[0]).update(
+            order_status=RequestForQuotationItemResponse.ORDER_PLACED
+        )
+
+        self.assertEqual(self._quote(self.items[:2]).status_code, 200)
+
+        self.assertEqual(
+            sorted(
+                RequestForQuotationItemResponse.objects.filter(supplier=self.supplier).values_list(
+                    "request_for_quotation_item_id", flat=True
+                )
+            ),
+            [self.items[0].id, self.items[1].id],
+        )
+
+    def test_missing_price_is_a_validation_error(self):
+        response = self.client.post(
+            reverse("create-rfq-response"),
+            {"rfq_id": self.rfq.id, "supplier_id": str(self.supplier.id), "items": [{"rfq_item_id": self.items[0].id, "quantity": 5}]},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()["error"], "Quantity and price are required for every item.")
+        self.assertFalse(RequestForQuotationItemResponse.objects.exists())
+
+    def test_placed_orders_and_foreign_items_reject_the_whole_batch(self):
+        other = Supplier.objects.create(
+            buyer=self.buyer, company_name="Other", person_of_contact="Contact", email="other@example.com"
+        )
+        RequestForQuotationItemResponse.objects.create(
+            request_for_quotation_item=self.items[1],
+            supplier=other,
+            quantity=5,
+            price=2,
+            order_status=RequestForQuotationItemResponse.ORDER_PLACED,
+        )
+        foreign_item = RequestForQuotationItems.objects.create(
+            request_for_quotation=RequestForQuotation.objects.create(buyer=self.buyer, title="Other RFQ"),
+            product_name="Foreign",
+            quantity=1,
+        )
+
+        placed = self._quote(self.items[:2])
+        foreign = self._quote([self.items[0], foreign_item])
+
+        self.assertEqual(placed.status_code, 400)
+        self.assertIn("Order already placed", placed.json()["error"])
+        self.assertEqual(foreign.status_code, 400)
+        self.assertFalse(RequestForQuotationItemResponse.objects.filter(supplier=self.supplier).exists())
+
+    def test_query_count_does_not_grow_with_items(self):
+        second = Supplier.objects.create(
+            buyer=self.buyer, company_name="Second", person_of_contact="Contact", email="second@example.com"
+        )
+        with CaptureQueriesContext(connection) as small:
+            self.assertEqual(self._quote(self.items[:1]).status_code, 200)
+        with CaptureQueriesContext(connection) as large:
+            self.assertEqual(self._quote(self.items, supplier=second).status_code, 200)
+        self.assertEqual(len(large.captured_queries), len(small.captured_queries))
+
+    def test_constraints_reject_duplicate_quotes_and_second_orders(self):
+        self.assertEqual(self._quote(self.items[:1]).status_code, 200)
+        with self.assertRaises(IntegrityError) as duplicate, transaction.atomic():
+            RequestForQuotationItemResponse.objects.create(
+                request_for_quotation_item=self.items[0], supplier=self.supplier, quantity=1, price=1
+            )
+        self.assertEqual(
+            violated_unique_constraint(duplicate.exception, RequestForQuotationItemResponse),
+            "rfq_response_item_supplier_uniq",
+        )
+
+        RequestForQuotationMetaData.objects.create(request_for_quotation=self.rfq)
+        self.client.force_authenticate(user=self.buyer.user)
+        other = Supplier.objects.create(
+            buyer=self.buyer, company_name="Other", person_of_contact="Contact", email="other@example.com"
+        )
+        self.assertEqual(self._quote(self.items[:1], supplier=other).status_code, 200)
+        first, second = RequestForQuotationItemResponse.objects.filter(request_for_quotation_item=self.items[0])
+        url = reverse("rfq-item-data", args=[self.items[0].id])
+
+        self.assertEqual(self.client.post(url, {"response_id": first.id}, format="json").status_code, 200)
+        conflict = self.client.post(url, {"response_id": second.id}, format="json")
+
+        self.assertEqual(conflict.status_code, 400)
+        self.assertEqual(conflict.json()["error"], "Order already placed for this item")
+        second.refresh_from_db()
+        self.assertEqual(second.order_status, RequestForQuotationItemResponse.ORDER_PENDING)
+
+    @override_settings(SEND_EMAILS=True)
+    def test_placing_the_same_order_twice_counts_and_emails_once(self):
+        RequestForQuotationMetaData.objects.create(request_for_quotation=self.rfq)
+        self.client.force_authenticate(user=self.buyer.user)
+        self.assertEqual(self._quote(self.items[:1]).status_code, 200)
+        response = RequestForQuotationItemResponse.objects.get(request_for_quotation_item=self.items[0])
+        url = reverse("rfq-item-data", args=[self.items[0].id])
+        mail.outbox = []
+
+        first = self.client.post(url, {"response_id": response.id}, format="json")
+        repeat = self.client.post(url, {"response_id": response.id}, format="json")
+
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(repeat.status_code, 400)
+        self.assertEqual(repeat.json()["error"], "Order already placed for this item")
+        scorecard = SupplierScorecard.objects.get(supplier=self.supplier)
+        self.assertEqual((scorecard.orders_placed, scorecard.order_value), (1, 15.0))
+        self.assertEqual([message.subject for message in mail.outbox], ["Purchase order from Quote Co"])
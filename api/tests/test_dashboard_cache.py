@@ -0,0 +1,101 @@
+import threading
+import time
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import SimpleTestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from api.caching import get_buyer_data_version, get_or_compute
+from api.models import Buyer, RequestForQuotation, RequestForQuotationItems
+
+
+class DashboardCacheTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user("dash@example.com", password="strongpassword123")
+        self.buyer = Buyer.objects.create(
+            user=self.user,
+            subscription_expiry_date=timezone.now() + timedelta(days=30),
+            company_name="Dash Co",
+        )
+        self.client.force_authenticate(user=self.user)
+        rfq = RequestForQuotation.objects.create(buyer=self.buyer, title="Dash RFQ")
+        RequestForQuotationItems.objects.create(request_for_quotation=rfq, product_name="Bolt", quantity=5)
+
+    def _dashboard(self, filter_type="all"):
+        response = self.client.get(reverse("dashboard-stats"), {"filter": filter_type})
+        self.assertEqual(response.status_code, 200)
+        return response.json()["data"]
+
+    def test_repeated_loads_are_served_from_cache(self):
+        with CaptureQueriesContext(connection) as cold:
+            first = self._dashboard()
+        with CaptureQueriesContext(connection) as warm:
+            second = self._dashboard()
+
+        self.assertEqual(first, second)
+        self.assertEqual(first["rfqs"]["total_rfqs_count"], 1)
+        self.assertLess(len(warm.captured_queries), len(cold.captured_queries))
+        self.assertLessEqual(len(warm.captured_queries), 1)
+
+    def test_buyer_writes_invalidate_cached_stats(self):
+        self._dashboard()
+        with self.captureOnCommitCallbacks(execute=True):
+            rfq = RequestForQuotation.objects.create(buyer=self.buyer, title="Second RFQ")
+            RequestForQuotationItems.objects.create(request_for_quotation=rfq, product_name="Nut", quantity=1)
+
+        self.assertEqual(self._dashboard()["rfqs"]["total_rfqs_count"], 2)
+
+    def test_other_buyers_writes_keep_cache(self):
+        self._dashboard()
+        other_user = User.objects.create_user("other@example.com", password="strongpassword123")
+        other_buyer = Buyer.objects.create(
+            user=other_user,
+            subscription_expiry_date=timezone.now() + timedelta(days=30),
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            RequestForQuotation.objects.create(buyer=other_buyer, title="Other RFQ")
+
+        with CaptureQueriesContext(connection) as warm:
+            self._dashboard()
+        self.assertLessEqual(len(warm.captured_queries), 1)
+
+
+    def test_culling_cached_results_keeps_the_data_version(self):
+        version = get_buyer_data_version(self.buyer.id)
+
+        cache.clear()
+
+        self.assertEqual(get_buyer_data_version(self.buyer.id), version)
+
+
+class SingleFlightTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_concurrent_cold_loads_compute_once(self):
+        calls = []
+
+        def compute():
+            calls.append(1)
+            time.sleep(0.2)
+            return {"value": 42}
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(get_or_compute("single-flight-test", compute)))
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, [{"value": 42}] * 5)
@@ -0,0 +1,156 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from api.models import (
+    Buyer,
+    DailyBuyerRollup,
+    DailySupplierRollup,
+    RequestForQuotation,
+    RequestForQuotationItemResponse,
+    RequestForQuotationItems,
+    Supplier,
+)
+from api.rollups import refresh_dashboard_rollups
+from api.task import CeleryRollupManager
+
+
+class DashboardRollupTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user("rollups@example.com", password="strongpassword123")
+        self.buyer = Buyer.objects.create(
+            user=self.user,
+            subscription_expiry_date=timezone.now() + timedelta(days=30),
+            company_name="Rollup Co",
+        )
+        self.client.force_authenticate(user=self.user)
+        self.supplier = Supplier.objects.create(
+            buyer=self.buyer,
+            company_name="Acme",
+            person_of_contact="Contact",
+            email="acme@example.com",
+        )
+
+    def _rfq(self, days_ago, product_name="Bolt", price=2.0, placed=False):
+        rfq = RequestForQuotation.objects.create(buyer=self.buyer, title="Rollup RFQ")
+        item = RequestForQuotationItems.objects.create(
+            request_for_quotation=rfq, product_name=product_name, quantity=5
+        )
+        RequestForQuotationItemResponse.objects.create(
+            request_for_quotation_item=item,
+            supplier=self.supplier,
+            quantity=5,
+            price=price,
+            lead_time=4,
+            order_status=(
+                RequestForQuotationItemResponse.ORDER_PLACED
+                if placed
+                else RequestForQuotationItemResponse.ORDER_PENDING
+            ),
+        )
+        RequestForQuotation.objects.filter(id=rfq.id).update(created=timezone.now() - timedelta(days=days_ago))
+        return rfq
+
+    def _dashboard(self, filter_type="all"):
+        cache.clear()
+        response = self.client.get(reverse("dashboard-stats"), {"filter": filter_type})
+        self.assertEqual(response.status_code, 200)
+        return response.json()["data"]
+
+    def test_windows_sum_stored_rollups_and_todays_rows(self):
+        self._rfq(40, placed=True)
+        self._rfq(3, product_name="Nut", price=3.0, placed=True)
+        refresh_dashboard_rollups()
+        self._rfq(0, product_name="Nut")
+
+        all_time = self._dashboard("all")
+        self.assertEqual(all_time["rfqs"]["total_rfqs_count"], 3)
+        self.assertEqual(all_time["rfqs"]["open_rfqs_count"], 3)
+        self.assertEqual(all_time["rfqs"]["total_purchase_value"], 25.0)
+        self.assertEqual(
+            sorted((row["product_name"], row["count"]) for row in all_time["rfqs"]["rfqs_by_product"]),
+            [("Bolt", 1), ("Nut", 2)],
+        )
+        self.assertEqual(
+            all_time["suppliers"]["purchase_by_supplier"],
+            [{"supplier__company_name": "Acme", "count": 2, "value": 25.0, "count_percentage": 100.0, "value_percentage": 100.0}],
+        )
+
+        week = self._dashboard("7days")
+        self.assertEqual(week["rfqs"]["total_rfqs_count"], 2)
+        self.assertEqual(week["rfqs"]["total_purchase_value"], 15.0)
+        self.assertEqual(
+            week["suppliers"]["suppliers_by_product"],
+            [{"request_for_quotation_item__product_name": "Nut", "supplier_count": 1}],
+        )
+
+        self.assertEqual(self._dashboard("today")["rfqs"]["total_rfqs_count"], 1)
+
+    def test_refresh_only_recomputes_touched_days(self):
+        old = self._rfq(10)
+        self._rfq(20)
+        self.assertEqual(refresh_dashboard_rollups(), 2)
+        an_hour_ago = timezone.now() - timedelta(hours=1)
+        for model in (RequestForQuotation, RequestForQuotationItems, RequestForQuotationItemResponse):
+            model.objects.update(updated=an_hour_ago)
+
+        self.assertEqual(refresh_dashboard_rollups(), 0)
+
+        response = RequestForQuotationItemResponse.objects.get(request_for_quotation_item__request_for_quotation=old)
+        response.order_status = RequestForQuotationItemResponse.ORDER_PLACED
+        response.save()
+        self.assertEqual(refresh_dashboard_rollups(), 1)
+
+        self.assertEqual(DailyBuyerRollup.objects.filter(buyer=self.buyer).count(), 2)
+        self.assertEqual(DailySupplierRollup.objects.get(order_count=1).purchase_value, 10.0)
+        self.assertEqual(self._dashboard("30days")["rfqs"]["total_purchase_value"], 10.0)
+
+    def test_rebuild_command(self):
+        self._rfq(5, placed=True)
+        output = StringIO()
+        call_command("rebuild_dashboard_rollups", buyer_id=self.buyer.id, stdout=output)
+
+        self.assertIn("Rebuilt dashboard rollups of 1 buyers", output.getvalue())
+        rollup = DailyBuyerRollup.objects.get(buyer=self.buyer)
+        self.assertEqual((rollup.rfqs_created, rollup.open_rfqs), (1, 1))
+
+    def test_incremental_command_backfills_on_first_run(self):
+        self._rfq(5, placed=True)
+        output = StringIO()
+        call_command("rebuild_dashboard_rollups", incremental=True, stdout=output)
+
+        self.assertIn("Refreshed 1 dashboard rollup days", output.getvalue())
+        self.assertTrue(DailyBuyerRollup.objects.filter(buyer=self.buyer).exists())
+
+    def test_stats_are_live_before_the_first_refresh(self):
+        self._rfq(40, placed=True)
+        self._rfq(3, product_name="Nut", price=3.0, placed=True)
+
+        self.assertFalse(DailyBuyerRollup.objects.exists())
+        self.assertEqual(self._dashboard("all")["rfqs"]["total_rfqs_count"], 2)
+        self.assertEqual(self._dashboard("7days")["rfqs"]["total_purchase_value"], 15.0)
+
+    def test_past_days_written_since_the_refresh_are_not_stale(self):
+        old = self._rfq(10)
+        self._rfq(20, placed=True)
+        refresh_dashboard_rollups()
+        an_hour_ago = timezone.now() - timedelta(hours=1)
+        for model in (RequestForQuotation, RequestForQuotationItems, RequestForQuotationItemResponse):
+            model.objects.update(updated=an_hour_ago)
+
+        response = RequestForQuotationItemResponse.objects.get(request_for_quotation_item__request_for_quotation=old)
+        response.order_status = RequestForQuotationItemResponse.ORDER_PLACED
+        response.save()
+
+        self.assertEqual(self._dashboard("30days")["rfqs"]["total_purchase_value"], 20.0)
+        self.assertEqual(self._dashboard("all")["rfqs"]["total_rfqs_count"], 2)
+
+    def test_refresh_runs_on_the_email_queue(self):
+        self.assertEqual(CeleryRollupManager.refresh_dashboard_rollups.queue, "email_queue")
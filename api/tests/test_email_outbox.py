@@ -0,0 +1,187 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core import mail
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from api import outbox
+from api.email_payloads import rfq_created_email_objs
+from api.models import Buyer, EmailOutbox, RequestForQuotation, RequestForQuotationItems, Supplier
+from api.outbox import drain_email_outbox, enqueue_emails
+from api.task import CeleryEmailManager
+from vms_backend.celery import app as celery_app
+
+
+@override_settings(USE_CELERY=True, SEND_EMAILS=True, FRONTEND_URL="http://localhost:3000")
+class CreateRFQOutboxTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("outbox@example.com", password="strongpassword123")
+        self.buyer = Buyer.objects.create(
+            user=self.user,
+            subscription_expiry_date=timezone.now() + timedelta(days=30),
+            company_name="Outbox Co",
+        )
+        self.client.force_authenticate(user=self.user)
+        self.suppliers = [
+            Supplier.objects.create(
+                buyer=self.buyer, company_name=f"Vendor {index}", person_of_contact="Contact", email=f"v{index}@example.com"
+            )
+            for index in range(3)
+        ]
+
+    def _post(self):
+        with self.captureOnCommitCallbacks(execute=True), mock.patch(
+            "api.task.CeleryEmailManager.drain_email_outbox.delay"
+        ) as self.drain_delay:
+            return self.client.post(
+                reverse("create-rfq"),
+                {
+                    "title": "Outbox RFQ",
+                    "items": [{"product_name": "Bolt", "quantity": 5}],
+                    "suppliers": [str(supplier.id) for supplier in self.suppliers],
+                },
+                format="json",
+            )
+
+    def test_emails_are_queued_in_the_transaction_and_drained_later(self):
+        response = self._post()
+
+        self.assertEqual(response.status_code, 200)
+        self.drain_delay.assert_called_once_with()
+        self.assertEqual(mail.outbox, [])
+        self.assertEqual(EmailOutbox.objects.filter(status=EmailOutbox.PENDING).count(), 3)
+
+        self.assertEqual(drain_email_outbox(), 3)
+        self.assertEqual(sorted(message.to[0] for message in mail.outbox), [s.email for s in self.suppliers])
+        self.assertEqual(EmailOutbox.objects.filter(status=EmailOutbox.SENT).count(), 3)
+        self.assertEqual(drain_email_outbox(), 0)
+        self.assertEqual(len(mail.outbox), 3)
+
+    def test_rows_carry_ids_not_rendered_data(self):
+        self._post()
+
+        rfq = RequestForQuotation.objects.get()
+        payloads = EmailOutbox.objects.values_list("payload", flat=True)
+        self.assertEqual(
+            sorted(sorted(payload.items()) for payload in payloads),
+            sorted([("rfq_id", rfq.id), ("supplier_id", str(supplier.id))] for supplier in self.suppliers),
+        )
+
+    def test_failed_request_queues_nothing(self):
+        with mock.patch("api.views.record_quotes_requested", side_effect=Exception("boom")):
+            response = self._post()
+
+        self.assertEqual(response.status_code, 400)
+        self.drain_delay.assert_not_called()
+        self.assertFalse(RequestForQuotation.objects.exists())
+        self.assertFalse(EmailOutbox.objects.exists())
+        self.assertEqual(drain_email_outbox(), 0)
+
+
+@override_settings(SEND_EMAILS=True, FRONTEND_URL="http://localhost:3000")
+class DrainEmailOutboxTests(TestCase):
+    def setUp(self):
+        self.buyer = Buyer.objects.create(
+            user=User.objects.create_user("drain@example.com", password="strongpassword123"),
+            subscription_expiry_date=timezone.now() + timedelta(days=30),
+            company_name="Drain Co",
+        )
+        self.rfq = RequestForQuotation.objects.create(buyer=self.buyer, title="Drain RFQ")
+        self.suppliers = [
+            Supplier.objects.create(
+                buyer=self.buyer, company_name=f"Vendor {index}", person_of_contact="Contact", email=f"v{index}@example.com"
+            )
+            for index in range(5)
+        ]
+
+    def _enqueue(self, suppliers):
+        enqueue_emails(
+            EmailOutbox.RFQ_CREATED,
+            [{"rfq_id": self.rfq.id, "supplier_id": str(supplier.id)} for supplier in suppliers],
+        )
+
+    def test_batches_are_claimed_until_the_outbox_is_empty(self):
+        self._enqueue(self.suppliers)
+
+        with mock.patch.object(outbox, "claim_outbox_batch", wraps=outbox.claim_outbox_batch) as claim:
+            self.assertEqual(drain_email_outbox(batch_size=2), 5)
+
+        self.assertEqual(claim.call_count, 3)
+        self.assertEqual(sorted(message.to[0] for message in mail.outbox), [s.email for s in self.suppliers])
+        self.assertFalse(EmailOutbox.objects.exclude(status=EmailOutbox.SENT).exists())
+
+    def test_each_batch_is_leased_from_the_time_it_is_claimed(self):
+        self._enqueue(self.suppliers[:4])
+        clock = mock.Mock(return_value=timezone.now())
+        reclaimed = []
+        sends = []
+
+        def slow_send(messages, lane):
+            sends.append(messages)
+            clock.return_value += timedelta(seconds=200)
+            if len(sends) == 3:
+                # Another drainer, 600 s in, while this one sends its second batch
+                reclaimed.extend(outbox.claim_outbox_batch(10, clock))
+            return 1
+
+        with mock.patch("api.outbox.send_email_messages", side_effect=slow_send):
+            self.assertEqual(drain_email_outbox(batch_size=2, clock=clock), 4)
+
+        self.assertEqual(reclaimed, [])
+        self.assertEqual(EmailOutbox.objects.filter(status=EmailOutbox.SENT, attempts=1).count(), 4)
+
+    def test_rows_whose_supplier_is_gone_fail_without_blocking_the_batch(self):
+        self._enqueue(self.suppliers[:2])
+        self.suppliers[0].delete()
+
+        self.assertEqual(drain_email_outbox(), 1)
+        self.assertEqual([message.to[0] for message in mail.outbox], [self.suppliers[1].email])
+        self.assertEqual(EmailOutbox.objects.get(status=EmailOutbox.PENDING).last_error, "Email data no longer exists")
+
+    def test_failures_back_off_and_give_up_after_max_attempts(self):
+        self._enqueue(self.suppliers[:1])
+        now = timezone.now()
+
+        with mock.patch("api.outbox.send_email_messages", side_effect=OSError("smtp down")), mock.patch(
+            "api.outbox.EMAIL_OUTBOX_MAX_ATTEMPTS", 2
+        ), mock.patch("api.outbox.EMAIL_OUTBOX_RETRY_BACKOFF", 60):
+            self.assertEqual(drain_email_outbox(clock=lambda: now), 0)
+            row = EmailOutbox.objects.get()
+            self.assertEqual((row.status, row.attempts, row.last_error), (EmailOutbox.PENDING, 1, "smtp down"))
+            self.assertEqual(row.next_attempt_at, now + timedelta(seconds=60))
+
+            self.assertEqual(drain_email_outbox(clock=lambda: now + timedelta(seconds=59)), 0)
+            self.assertEqual(EmailOutbox.objects.get().attempts, 1)
+
+            drain_email_outbox(clock=lambda: now + timedelta(seconds=60))
+            row = EmailOutbox.objects.get()
+            self.assertEqual((row.status, row.attempts), (EmailOutbox.FAILED, 2))
+
+        self.assertEqual(drain_email_outbox(clock=lambda: now + timedelta(days=1)), 0)
+        self.assertEqual(mail.outbox, [])
+
+    def test_loader_query_count_does_not_grow_with_items_or_suppliers(self):
+        RequestForQuotationItems.objects.bulk_create(
+            [RequestForQuotationItems(request_for_quotation=self.rfq, product_name=f"Part {i}", quantity=2) for i in range(30)]
+        )
+        invitations = [(self.rfq.id, str(supplier.id)) for supplier in self.suppliers]
+
+        with self.assertNumQueries(3):
+            email_objs = rfq_created_email_objs(invitations)
+
+        self.assertEqual([email_obj["to"] for email_obj in email_objs], [[s.email] for s in self.suppliers])
+        self.assertEqual(email_objs[0]["total_no_of_items"], 30)
+        self.assertEqual(email_objs[0]["items"][0]["quantity"], 2)
+
+
+class DrainScheduleTests(SimpleTestCase):
+    def test_beat_drains_on_the_email_queue(self):
+        entry = celery_app.conf.beat_schedule["drain-email-outbox"]
+
+        self.assertEqual(entry["task"], CeleryEmailManager.drain_email_outbox.name)
+        self.assertEqual(entry["options"], {"queue": "email_queue"})
+        self.assertIn("api.task", celery_app.conf.imports)
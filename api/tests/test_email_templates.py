@@ -0,0 +1,56 @@
+from django.core import mail
+from django.test import SimpleTestCase, override_settings
+from django.test.signals import template_rendered
+
+from api.email_templates import PersonalizedEmail, render_email
+from api.helper import EmailManager
+
+TEMPLATE = "RFQ_Created_Email_Template.html"
+
+
+@override_settings(
+    SEND_EMAILS=True,
+    EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend",
+    DEFAULT_EMAIL_BCC_LIST=[],
+    DEFAULT_EMAIL_CC_LIST=[],
+)
+class PersonalizedEmailTests(SimpleTestCase):
+    def setUp(self):
+        self.rendered = []
+        template_rendered.connect(self._record)
+        self.addCleanup(template_rendered.disconnect, self._record)
+
+    def _record(self, sender, template, **kwargs):
+        self.rendered.append(template.name)
+
+    def _email_obj(self, index):
+        return {
+            "to": [f"supplier{index}@example.com"],
+            "subject": "New Quotation Requested From Buyer Co ",
+            "items": [{"product_name": f"Part {line}", "quantity": 3, "uom": "pcs"} for line in range(30)],
+            "rfq_id": 7,
+            "total_no_of_items": 30,
+            "url": f"http://localhost:3000/rfq-response/7/{index}?a=1&b=2",
+            "supplier_name": f"Vendor <{index}> & Sons",
+            "company_name": "Buyer Co",
+        }
+
+    def test_personalized_html_matches_a_full_render(self):
+        email_obj = self._email_obj(1)
+
+        html = PersonalizedEmail(TEMPLATE, email_obj, ("supplier_name", "url")).personalize(email_obj)
+
+        self.assertEqual(html, render_email(TEMPLATE, email_obj))
+        self.assertIn("Vendor &lt;1&gt; &amp; Sons", html)
+
+    def test_fan_out_renders_the_template_once(self):
+        shared = {}
+        messages = [EmailManager.build_rfq_created_message(self._email_obj(index), shared) for index in range(12)]
+        EmailManager.send_messages(messages)
+
+        self.assertEqual(self.rendered.count(f"email/{TEMPLATE}"), 1)
+        self.assertEqual(len(mail.outbox), 12)
+        html = mail.outbox[5].alternatives[0][0]
+        self.assertIn("Vendor &lt;5&gt; &amp; Sons", html)
+        self.assertIn("rfq-response/7/5?a=1&amp;b=2", html)
+        self.assertIn("Part 29", html)
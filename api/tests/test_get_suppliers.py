@@ -0,0 +1,85 @@
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from api.models import Buyer, RequestForQuotation, Supplier, SupplierCategory
+
+
+class GetSuppliersTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("suppliers@example.com", password="strongpassword123")
+        self.buyer = Buyer.objects.create(
+            user=self.user,
+            subscription_expiry_date=timezone.now() + timedelta(days=30),
+            company_name="Supplier Co",
+        )
+        self.client.force_authenticate(user=self.user)
+
+    def _supplier(self, name, hours_ago=48, category=None):
+        with self.captureOnCommitCallbacks(execute=True):
+            supplier = Supplier.objects.create(
+                buyer=self.buyer,
+                company_name=name,
+                person_of_contact="Contact",
+                email=f"{name.lower()}@example.com",
+            )
+            Supplier.objects.filter(id=supplier.id).update(created=timezone.now() - timedelta(hours=hours_ago))
+            if category:
+                SupplierCategory.objects.create(buyer=self.buyer, supplier=supplier, name=category)
+                SupplierCategory.objects.create(buyer=self.buyer, supplier=supplier, name="Retired", active=False)
+        return supplier
+
+    def _rfq(self, suppliers, days_ago):
+        rfq = RequestForQuotation.objects.create(buyer=self.buyer, title="Ranking RFQ")
+        rfq.suppliers.set(suppliers)
+        RequestForQuotation.objects.filter(id=rfq.id).update(created=timezone.now() - timedelta(days=days_ago))
+
+    def _get(self, **params):
+        response = self.client.get(reverse("get-suppliers"), params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_suppliers_are_ranked_by_recency_and_recent_rfqs(self):
+        idle = self._supplier("Idle")
+        older_rfq = self._supplier("OlderRfq")
+        latest_rfq = self._supplier("LatestRfq")
+        stale_rfq = self._supplier("StaleRfq")
+        new = self._supplier("New", hours_ago=0, category="Steel")
+        self._rfq([older_rfq], days_ago=3)
+        self._rfq([latest_rfq, new], days_ago=1)
+        self._rfq([stale_rfq], days_ago=10)
+
+        data = self._get()["data"]
+
+        self.assertEqual(
+            [row["company"] for row in data],
+            ["New", "LatestRfq", "OlderRfq", "Idle", "StaleRfq"],
+        )
+        self.assertEqual([category["category_name"] for category in data[0]["categories"]], ["Steel"])
+        self.assertNotIn("meta", self._get())
+
+    def test_search_matches_active_categories_once(self):
+        self._supplier("Forge", category="Steel")
+        self._supplier("Mill", category="Steel works")
+        self._supplier("Other", category="Wood")
+
+        self.assertEqual(sorted(row["company"] for row in self._get(q="steel")["data"]), ["Forge", "Mill"])
+        self.assertEqual(self._get(q="retired")["data"], [])
+
+    def test_pagination_and_constant_query_count(self):
+        for index in range(12):
+            self._supplier(f"Supplier{index}", category="Steel")
+
+        with CaptureQueriesContext(connection) as context:
+            page = self._get(page=2, limit=5)
+
+        self.assertEqual(len(page["data"]), 5)
+        self.assertEqual(page["meta"], {"page": 2, "page_size": 5, "has_more": True, "total_count": 12})
+        with CaptureQueriesContext(connection) as full_context:
+            self.assertEqual(len(self._get()["data"]), 12)
+        self.assertEqual(len(full_context.captured_queries), len(context.captured_queries) - 1)
@@ -0,0 +1,171 @@
+from unittest import mock
+
+from django.core import mail
+from django.core.cache import caches
+from django.core.mail import EmailMessage
+from django.core.mail.backends.locmem import EmailBackend
+from django.test import SimpleTestCase, override_settings
+
+from api.caching import COORDINATION_CACHE
+from api.mailer import (
+    BULK,
+    TRANSACTIONAL,
+    EmailRateLimiter,
+    PooledEmailConnection,
+    get_rate_limiter,
+    running_in_celery_task,
+    send_email_messages,
+)
+from api.task import CeleryEmailManager
+
+
+class CountingBackend(EmailBackend):
+    opened = 0
+    failures = 0
+
+    def open(self):
+        CountingBackend.opened += 1
+        return True
+
+    def send_messages(self, messages):
+        if CountingBackend.failures:
+            CountingBackend.failures -= 1
+            raise ConnectionResetError("connection dropped")
+        return super().send_messages(messages)
+
+
+@override_settings(EMAIL_BACKEND="api.tests.test_mailer.CountingBackend", SEND_EMAILS=True)
+class PooledEmailConnectionTests(SimpleTestCase):
+    def setUp(self):
+        CountingBackend.opened = CountingBackend.failures = 0
+        self.pool = PooledEmailConnection(idle_timeout=60)
+        self.addCleanup(self.pool.close)
+
+    def _messages(self, count):
+        return [EmailMessage(f"Subject {index}", "Body", "from@example.com", [f"to{index}@example.com"]) for index in range(count)]
+
+    def test_batches_share_one_connection(self):
+        self.assertEqual(self.pool.send_messages(self._messages(50)), 50)
+        self.assertEqual(self.pool.send_messages(self._messages(5)), 5)
+
+        self.assertEqual(len(mail.outbox), 55)
+        self.assertEqual(CountingBackend.opened, 1)
+
+    def test_idle_connections_are_reopened(self):
+        self.pool.send_messages(self._messages(1))
+        self.pool.idle_timeout = 0
+        self.pool.send_messages(self._messages(1))
+
+        self.assertEqual(CountingBackend.opened, 2)
+
+    def test_failed_send_reconnects_without_duplicates(self):
+        self.pool.send_messages(self._messages(1))
+        CountingBackend.failures = 1
+
+        self.assertEqual(self.pool.send_messages(self._messages(3)), 3)
+
+        self.assertEqual([message.subject for message in mail.outbox], ["Subject 0", "Subject 0", "Subject 1", "Subject 2"])
+        self.assertEqual(CountingBackend.opened, 2)
+
+    @override_settings(SEND_EMAILS=False)
+    def test_disabled_sending_sends_nothing(self):
+        self.assertEqual(send_email_messages(self._messages(2)), 0)
+        self.assertEqual(mail.outbox, [])
+
+
+class FakeClock:
+    def __init__(self, now, advance=True):
+        self.now = now
+        self.advance = advance
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        if self.advance:
+            self.now += seconds
+
+
+class EmailRateLimiterTests(SimpleTestCase):
+    def setUp(self):
+        caches[COORDINATION_CACHE].clear()
+
+    def _limiter(self, clock, **kwargs):
+        return EmailRateLimiter(key="test", clock=clock, sleep=clock.sleep, **kwargs)
+
+    def test_burst_is_sent_at_once_and_the_rest_is_paced(self):
+        clock = FakeClock(1000.0)
+        limiter = self._limiter(clock, rate=10, burst=3)
+
+        waits = [limiter.acquire(BULK) for _ in range(6)]
+
+        for wait, expected in zip(waits, [0, 0, 0, 0.1, 0.1, 0.1]):
+            self.assertAlmostEqual(wait, expected)
+        self.assertAlmostEqual(clock.now, 1000.3)
+
+    def test_processes_share_one_bucket(self):
+        clock = FakeClock(1000.0, advance=False)
+        first, second = self._limiter(clock, rate=10, burst=3), self._limiter(clock, rate=10, burst=3)
+
+        waits = [first.acquire(), first.acquire(), second.acquire(), second.acquire(), first.acquire()]
+
+        for wait, expected in zip(waits, [0, 0, 0, 0.1, 0.2]):
+            self.assertAlmostEqual(wait, expected)
+
+    def test_bulk_sends_cannot_starve_the_transactional_lane(self):
+        clock = FakeClock(1000.0, advance=False)
+        limiter = self._limiter(clock, rate=10, burst=1, transactional_share=0.25)
+
+        bulk_waits = [limiter.acquire(BULK) for _ in range(12)]
+        transactional_waits = [limiter.acquire(TRANSACTIONAL) for _ in range(2)]
+
+        self.assertAlmostEqual(bulk_waits[-1], 1.5)
+        self.assertAlmostEqual(transactional_waits[0], 0)
+        self.assertAlmostEqual(transactional_waits[1], 0.4)
+
+    @override_settings(
+        EMAIL_BACKEND="api.tests.test_mailer.CountingBackend",
+        EMAIL_RATE_LIMITS={"api.tests.test_mailer.CountingBackend": {"rate": 5, "burst": 2}},
+        SEND_EMAILS=True,
+    )
+    def test_every_pooled_send_takes_a_token_in_its_lane(self):
+        limiter = get_rate_limiter()
+        self.assertEqual((limiter.rate, limiter.burst), (5, 2))
+        pool = PooledEmailConnection(idle_timeout=60)
+        self.addCleanup(pool.close)
+
+        with mock.patch.object(limiter, "acquire") as acquire, mock.patch(
+            "api.mailer.running_in_celery_task", return_value=True
+        ):
+            pool.send_messages(
+                [EmailMessage("Subject", "Body", "from@example.com", [f"to{index}@example.com"]) for index in range(3)],
+                BULK,
+            )
+
+        self.assertEqual(acquire.call_args_list, [mock.call(BULK)] * 3)
+
+    @override_settings(
+        EMAIL_BACKEND="api.tests.test_mailer.CountingBackend",
+        EMAIL_RATE_LIMITS={"api.tests.test_mailer.CountingBackend": {"rate": 5, "burst": 2}},
+        SEND_EMAILS=True,
+    )
+    def test_request_threads_are_not_paced(self):
+        limiter = get_rate_limiter()
+        pool = PooledEmailConnection(idle_timeout=60)
+        self.addCleanup(pool.close)
+
+        with mock.patch.object(limiter, "acquire") as acquire:
+            sent = pool.send_messages(
+                [EmailMessage("Subject", "Body", "from@example.com", [f"to{index}@example.com"]) for index in range(3)]
+            )
+
+        self.assertEqual(sent, 3)
+        acquire.assert_not_called()
+
+    def test_backends_without_limits_are_not_paced(self):
+        self.assertIsNone(get_rate_limiter())
+
+    def test_only_celery_tasks_count_as_workers(self):
+        self.assertFalse(running_in_celery_task())
+        with mock.patch("api.outbox.drain_email_outbox", side_effect=running_in_celery_task):
+            self.assertTrue(CeleryEmailManager.drain_email_outbox.apply().get())
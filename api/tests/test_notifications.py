@@ -0,0 +1,108 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core import mail
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from api.models import (
+    Buyer,
+    PendingNotification,
+    RequestForQuotation,
+    RequestForQuotationItems,
+    Supplier,
+)
+from api.notifications import flush_pending_notifications
+from api.task import CeleryNotificationManager
+
+
+@override_settings(USE_CELERY=True, SEND_EMAILS=True, FRONTEND_URL="http://localhost:3000")
+class ResponseAlertCoalescingTests(APITestCase):
+    def setUp(self):
+        self.buyer = Buyer.objects.create(
+            user=User.objects.create_user("alerts@example.com", email="alerts@example.com", password="strongpassword123"),
+            subscription_expiry_date=timezone.now() + timedelta(days=30),
+            company_name="Alert Co",
+        )
+        self.rfq = RequestForQuotation.objects.create(buyer=self.buyer, title="Alert RFQ")
+        self.items = [
+            RequestForQuotationItems.objects.create(request_for_quotation=self.rfq, product_name=f"Part {index}", quantity=1)
+            for index in range(2)
+        ]
+        self.suppliers = [
+            Supplier.objects.create(
+                buyer=self.buyer, company_name=f"Vendor {index}", person_of_contact="Contact", email=f"v{index}@example.com"
+            )
+            for index in range(3)
+        ]
+
+    def _quote(self, supplier):
+        response = self.client.post(
+            reverse("create-rfq-response"),
+            {
+                "rfq_id": self.rfq.id,
+                "supplier_id": str(supplier.id),
+                "items": [{"rfq_item_id": item.id, "quantity": 1, "price": 2} for item in self.items],
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, 200)
+
+    def test_alerts_are_held_and_flushed_as_one_digest(self):
+        for supplier in self.suppliers:
+            self._quote(supplier)
+
+        self.assertEqual(mail.outbox, [])
+        self.assertEqual(PendingNotification.objects.count(), 3)
+        self.assertEqual(flush_pending_notifications(window=300), 0)
+
+        sent = flush_pending_notifications(window=300, now=timezone.now() + timedelta(seconds=301))
+
+        self.assertEqual(sent, 1)
+        self.assertEqual(len(mail.outbox), 1)
+        digest = mail.outbox[0]
+        self.assertEqual((digest.to, digest.cc, digest.subject), (["alerts@example.com"], [], "3 new quotations received"))
+        html = digest.alternatives[0][0]
+        for supplier in self.suppliers:
+            self.assertIn(supplier.company_name, html)
+        self.assertIn(f"/rfq/{self.rfq.id}/items?item_id={self.items[0].id}", html)
+        self.assertFalse(PendingNotification.objects.exists())
+
+    def test_a_lone_alert_keeps_the_single_response_email(self):
+        self._quote(self.suppliers[0])
+
+        self.assertEqual(flush_pending_notifications(window=0), 1)
+
+        self.assertEqual(mail.outbox[0].subject, "New quotation received")
+        self.assertEqual(mail.outbox[0].cc, ["v0@example.com"])
+
+    def test_a_failed_send_keeps_the_alerts_for_a_retry(self):
+        for supplier in self.suppliers[:2]:
+            self._quote(supplier)
+        now = timezone.now() + timedelta(seconds=301)
+
+        with mock.patch("api.notifications.send_email_messages", side_effect=Exception("SMTP down")):
+            self.assertEqual(flush_pending_notifications(window=300, now=now), 0)
+
+        self.assertEqual(mail.outbox, [])
+        self.assertEqual(
+            list(PendingNotification.objects.values_list("attempts", "last_error")), [(1, "SMTP down")] * 2
+        )
+        self.assertEqual(flush_pending_notifications(window=300, now=now + timedelta(seconds=59)), 0)
+
+        self.assertEqual(flush_pending_notifications(window=300, now=now + timedelta(seconds=60)), 1)
+        self.assertEqual(mail.outbox[0].subject, "2 new quotations received")
+        self.assertFalse(PendingNotification.objects.exists())
+
+    @override_settings(USE_CELERY=False)
+    def test_alerts_are_sent_immediately_without_celery(self):
+        self._quote(self.suppliers[0])
+
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertFalse(PendingNotification.objects.exists())
+
+    def test_flush_runs_on_the_email_queue(self):
+        self.assertEqual(CeleryNotificationManager.flush_pending_notifications.queue, "email_queue")
@@ -0,0 +1,83 @@
+from datetime import date, timedelta
+
+from django.contrib.auth.models import User
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from api.models import Buyer, RequestForQuotation, RequestForQuotationItems
+
+
+class CursorPaginationTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("cursor@example.com", password="strongpassword123")
+        self.buyer = Buyer.objects.create(
+            user=self.user,
+            subscription_expiry_date=timezone.now() + timedelta(days=30),
+            company_name="Cursor Co",
+        )
+        self.client.force_authenticate(user=self.user)
+        created = timezone.now() - timedelta(days=30)
+        self.rfqs = []
+        for index in range(13):
+            rfq = RequestForQuotation.objects.create(buyer=self.buyer, title=f"RFQ {index % 4}")
+            # Every delivery date but the last few is shared by two RFQs, and
+            # the remaining RFQs have none
+            RequestForQuotationItems.objects.create(
+                request_for_quotation=rfq,
+                product_name="Bolt",
+                quantity=1,
+                expected_delivery_date=date(2030, 1, 1) + timedelta(days=index // 2) if index < 9 else None,
+            )
+            # Pairs of RFQs share a creation time so pages split ties on id
+            RequestForQuotation.objects.filter(id=rfq.id).update(created=created + timedelta(hours=index // 2))
+            self.rfqs.append(rfq)
+
+    def _walk(self, url_name, params, page_key, args=()):
+        ids, cursor, pages = [], "", 0
+        while cursor is not None:
+            response = self.client.get(reverse(url_name, args=args), {**params, "cursor": cursor})
+            self.assertEqual(response.status_code, 200)
+            payload = response.json()
+            meta = payload.get("meta") or payload.get("pagination")
+            ids += [row[page_key] for row in payload.get("data", payload.get("items"))]
+            cursor = meta["next_cursor"]
+            self.assertEqual(meta["has_more"], cursor is not None)
+            pages += 1
+        return ids, pages
+
+    def test_rfq_list_cursor_pages_match_offset_pages_for_every_sort(self):
+        for sort in ("latest_activity", "created_desc", "created_asc", "delivery_date_asc", "delivery_date_desc", "title"):
+            expected = [
+                row["id"]
+                for row in self.client.get(reverse("get-rfq-list"), {"sort": sort, "limit": 50}).json()["data"]
+            ]
+            ids, pages = self._walk("get-rfq-list", {"sort": sort, "limit": 4}, "id")
+
+            self.assertEqual(ids, expected, sort)
+            self.assertEqual(len(ids), 13)
+            self.assertEqual(pages, 4)
+
+    def test_rfq_items_and_items_feed_support_cursors(self):
+        for _ in range(3):
+            RequestForQuotationItems.objects.create(request_for_quotation=self.rfqs[0], product_name="Nut", quantity=1)
+
+        ids, _ = self._walk("get-rfq-items", {"limit": 2}, "index", args=[self.rfqs[0].id])
+        self.assertEqual(ids, [1, 2, 3, 4])
+
+        expected = [row["rfq_item_id"] for row in self.client.get(reverse("get-rfq"), {"limit": 50}).json()["data"]]
+        ids, _ = self._walk("get-rfq", {"limit": 5}, "rfq_item_id")
+        self.assertEqual(ids, expected)
+        self.assertEqual(len(ids), 16)
+
+    def test_count_modes(self):
+        url = reverse("get-rfq-list")
+        self.assertEqual(self.client.get(url, {"cursor": ""}).json()["meta"]["total_count"], 13)
+        self.assertEqual(self.client.get(url, {"cursor": "", "count": "estimate"}).json()["meta"]["total_count"], 13)
+        self.assertIsNone(self.client.get(url, {"cursor": "", "count": "none"}).json()["meta"]["total_count"])
+        self.assertEqual(self.client.get(url, {"count": "bogus"}).status_code, 400)
+
+    def test_invalid_cursor_is_rejected(self):
+        response = self.client.get(reverse("get-rfq-list"), {"cursor": "not-a-cursor"})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("Invalid cursor", response.json()["error"])
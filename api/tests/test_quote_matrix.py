@@ -0,0 +1,94 @@
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from api.models import (
+    Buyer,
+    RequestForQuotation,
+    RequestForQuotationItemResponse,
+    RequestForQuotationItems,
+    Supplier,
+)
+
+
+class QuoteMatrixTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("matrix@example.com", password="strongpassword123")
+        self.buyer = Buyer.objects.create(
+            user=self.user,
+            subscription_expiry_date=timezone.now() + timedelta(days=30),
+            company_name="Matrix Co",
+        )
+        self.client.force_authenticate(user=self.user)
+        self.rfq = RequestForQuotation.objects.create(buyer=self.buyer, title="Matrix RFQ")
+
+    def _supplier(self, name):
+        return Supplier.objects.create(
+            buyer=self.buyer, company_name=name, person_of_contact="Contact", email=f"{name.lower()}@example.com"
+        )
+
+    def _item(self, name):
+        return RequestForQuotationItems.objects.create(request_for_quotation=self.rfq, product_name=name, quantity=10)
+
+    def _quote(self, item, supplier, price, lead_time, **kwargs):
+        return RequestForQuotationItemResponse.objects.create(
+            request_for_quotation_item=item, supplier=supplier, quantity=10, price=price, lead_time=lead_time, **kwargs
+        )
+
+    def _get(self):
+        response = self.client.get(reverse("get-rfq-quote-matrix", args=[self.rfq.id]))
+        self.assertEqual(response.status_code, 200)
+        return response.json()["data"]
+
+    def test_matrix_is_columnar_with_best_offers(self):
+        alpha, beta, idle = self._supplier("Alpha"), self._supplier("Beta"), self._supplier("Idle")
+        self.rfq.suppliers.set([alpha, beta, idle])
+        bolt, nut, washer = self._item("Bolt"), self._item("Nut"), self._item("Washer")
+        self._quote(bolt, alpha, price=5, lead_time=9)
+        self._quote(bolt, beta, price=4, lead_time=12)
+        self._quote(nut, beta, price=1, lead_time=None, order_status=RequestForQuotationItemResponse.ORDER_PLACED)
+
+        data = self._get()
+
+        self.assertEqual(data["suppliers"]["company_name"], ["Alpha", "Beta", "Idle"])
+        items = data["items"]
+        self.assertEqual(items["id"], [bolt.id, nut.id, washer.id])
+        self.assertEqual(items["status"], ["Open", "Closed", "Open"])
+        self.assertEqual(items["best_price"], [4.0, 1.0, None])
+        self.assertEqual(items["best_price_supplier"], [1, 1, None])
+        self.assertEqual(items["best_lead_time"], [9, None, None])
+        self.assertEqual(items["best_lead_time_supplier"], [0, None, None])
+        quotes = data["quotes"]
+        self.assertEqual(list(zip(quotes["item"], quotes["supplier"], quotes["price"])), [(0, 0, 5.0), (0, 1, 4.0), (1, 1, 1.0)])
+        self.assertEqual(quotes["order_status"], ["Pending", "Pending", "Placed"])
+
+    def test_query_count_does_not_grow_with_matrix_size(self):
+        def count_queries():
+            with CaptureQueriesContext(connection) as context:
+                self._get()
+            return len(context.captured_queries)
+
+        supplier = self._supplier("First")
+        self.rfq.suppliers.add(supplier)
+        self._quote(self._item("First"), supplier, price=1, lead_time=1)
+        small = count_queries()
+
+        suppliers = [self._supplier(f"Vendor{index}") for index in range(8)]
+        self.rfq.suppliers.add(*suppliers)
+        for index in range(12):
+            item = self._item(f"Part {index}")
+            for supplier in suppliers[: index % 8 + 1]:
+                self._quote(item, supplier, price=index + 1, lead_time=index)
+        self.assertEqual(count_queries(), small)
+
+    def test_other_buyers_rfq_is_rejected(self):
+        other = User.objects.create_user("intruder@example.com", password="strongpassword123")
+        Buyer.objects.create(user=other, subscription_expiry_date=timezone.now() + timedelta(days=30))
+        self.client.force_authenticate(user=other)
+        response = self.client.get(reverse("get-rfq-quote-matrix", args=[self.rfq.id]))
+        self.assertEqual(response.status_code, 400)
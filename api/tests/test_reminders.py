@@ -0,0 +1,118 @@
+from datetime import date, timedelta
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core import mail
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from api.models import (
+    Buyer,
+    RequestForQuotation,
+    RequestForQuotationItemResponse,
+    RequestForQuotationItems,
+    Supplier,
+)
+from api.reminders import pending_quote_lines, send_rfq_reminders
+
+
+@override_settings(USE_CELERY=False, SEND_EMAILS=True, FRONTEND_URL="http://localhost:3000")
+class ReminderTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("remind@example.com", password="strongpassword123")
+        self.buyer = Buyer.objects.create(
+            user=self.user,
+            subscription_expiry_date=timezone.now() + timedelta(days=30),
+            company_name="Remind Co",
+        )
+        self.client.force_authenticate(user=self.user)
+        self.alpha, self.beta = [
+            Supplier.objects.create(
+                buyer=self.buyer, company_name=name, person_of_contact=name, email=f"{name.lower()}@example.com"
+            )
+            for name in ("Alpha", "Beta")
+        ]
+        self.first_rfq, self.first_items = self._rfq(["Bolt", "Nut"], [self.alpha, self.beta])
+        self.second_rfq, self.second_items = self._rfq(["Gear", "Shaft"], [self.alpha])
+        RequestForQuotationItemResponse.objects.create(
+            request_for_quotation_item=self.first_items[0], supplier=self.alpha, quantity=1, price=1
+        )
+        self.second_items[1].status = RequestForQuotationItems.CLOSE
+        self.second_items[1].save()
+
+    def _rfq(self, products, suppliers):
+        rfq = RequestForQuotation.objects.create(buyer=self.buyer, title="Reminder RFQ")
+        rfq.suppliers.set(suppliers)
+        items = [
+            RequestForQuotationItems.objects.create(
+                request_for_quotation=rfq, product_name=product, quantity=5, expected_delivery_date=date(2030, 1, 1)
+            )
+            for product in products
+        ]
+        return rfq, items
+
+    def _remind(self, **payload):
+        response = self.client.post(reverse("send-rfq-reminders-to-suppliers"), payload, format="json")
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_pending_lines_skip_quoted_and_closed_items(self):
+        lines = {(line["supplier_id"], line["id"]) for line in pending_quote_lines(self.buyer)}
+        self.assertEqual(
+            lines,
+            {
+                (self.alpha.id, self.first_items[1].id),
+                (self.alpha.id, self.second_items[0].id),
+                (self.beta.id, self.first_items[0].id),
+                (self.beta.id, self.first_items[1].id),
+            },
+        )
+
+    def test_buyer_wide_sweep_sends_one_digest_per_supplier(self):
+        payload = self._remind(scope="all")
+
+        self.assertEqual((payload["suppliers_reminded"], payload["pending_items"]), (2, 4))
+        self.assertEqual(len(mail.outbox), 2)
+        alpha_mail = next(message for message in mail.outbox if message.to == ["alpha@example.com"])
+        html = alpha_mail.alternatives[0][0]
+        self.assertIn("Nut", html)
+        self.assertIn("Gear", html)
+        self.assertNotIn("Bolt", html)
+        self.assertIn(f"/rfq-response/{self.second_rfq.id}/{self.alpha.id}", html)
+        self.assertEqual(alpha_mail.subject, "Reminder: 2 items are awaiting your quote")
+
+    def test_item_and_rfq_scopes(self):
+        item = self._remind(rfq_item_id=self.first_items[0].id)
+        self.assertEqual(item["message"], "Reminders sent to 1 suppliers.")
+        self.assertEqual(mail.outbox[0].subject, "Reminder: Quote Request for Bolt")
+
+        rfq = self._remind(rfq_id=self.first_rfq.id)
+        self.assertEqual((rfq["suppliers_reminded"], rfq["pending_items"]), (2, 3))
+
+        closed = self._remind(rfq_item_id=self.second_items[1].id)
+        self.assertEqual(closed["message"], "All suppliers have already quoted for this item.")
+
+    def test_sweep_query_count_does_not_grow_with_rfqs(self):
+        with CaptureQueriesContext(connection) as small:
+            self._remind(scope="all")
+        for _ in range(5):
+            self._rfq(["Pin", "Spring"], [self.alpha, self.beta])
+        with CaptureQueriesContext(connection) as large:
+            self._remind(scope="all")
+        self.assertEqual(len(large.captured_queries), len(small.captured_queries))
+
+    @override_settings(USE_CELERY=True)
+    def test_celery_task_carries_ids_and_the_worker_finds_the_lines(self):
+        with mock.patch("api.task.CeleryEmailManager.send_rfq_reminders.delay") as delay:
+            payload = self._remind(rfq_id=self.first_rfq.id)
+
+        self.assertEqual((payload["suppliers_reminded"], payload["pending_items"]), (2, 3))
+        delay.assert_called_once_with(self.buyer.id, rfq_item_id=None, rfq_id=self.first_rfq.id)
+        self.assertEqual(mail.outbox, [])
+
+        self.assertEqual(send_rfq_reminders(*delay.call_args.args, **delay.call_args.kwargs), 2)
+        self.assertEqual(sorted(message.to[0] for message in mail.outbox), ["alpha@example.com", "beta@example.com"])
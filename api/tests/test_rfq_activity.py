@@ -0,0 +1,110 @@
+from datetime import date, timedelta
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from api.models import (
+    Buyer,
+    RequestForQuotation,
+    RequestForQuotationItemResponse,
+    RequestForQuotationItems,
+    Supplier,
+)
+from api.rfq_activity import repair_rfq_activity
+
+
+class RFQActivityCounterTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("activity@example.com", password="strongpassword123")
+        self.buyer = Buyer.objects.create(
+            user=self.user,
+            subscription_expiry_date=timezone.now() + timedelta(days=30),
+            company_name="Activity Co",
+        )
+        self.client.force_authenticate(user=self.user)
+        self.supplier = Supplier.objects.create(
+            buyer=self.buyer,
+            company_name="Vendor",
+            person_of_contact="Contact",
+            email="vendor@example.com",
+        )
+
+    def _rfq(self, title, deliveries):
+        rfq = RequestForQuotation.objects.create(buyer=self.buyer, title=title)
+        items = [
+            RequestForQuotationItems.objects.create(
+                request_for_quotation=rfq,
+                product_name="Bolt",
+                quantity=1,
+                expected_delivery_date=delivery,
+            )
+            for delivery in deliveries
+        ]
+        return rfq, items
+
+    def _quote(self, item):
+        return RequestForQuotationItemResponse.objects.create(
+            request_for_quotation_item=item, supplier=self.supplier, quantity=1, price=10
+        )
+
+    def test_counters_follow_item_and_response_writes(self):
+        rfq, items = self._rfq("Fasteners", [date(2030, 2, 1), date(2030, 1, 1)])
+        rfq.refresh_from_db()
+        self.assertEqual((rfq.item_count, rfq.open_item_count, rfq.quotes_count), (2, 2, 0))
+        self.assertEqual(rfq.earliest_delivery_date, date(2030, 1, 1))
+
+        response = self._quote(items[0])
+        items[1].status = RequestForQuotationItems.CLOSE
+        items[1].save()
+        rfq.refresh_from_db()
+        self.assertEqual((rfq.item_count, rfq.open_item_count, rfq.quotes_count), (2, 1, 1))
+        self.assertEqual(rfq.latest_response_update, response.updated)
+        self.assertGreaterEqual(rfq.latest_activity, response.updated)
+
+        response.delete()
+        items[0].delete()
+        rfq.refresh_from_db()
+        self.assertEqual((rfq.item_count, rfq.open_item_count, rfq.quotes_count), (1, 0, 0))
+        self.assertEqual(rfq.earliest_delivery_date, date(2030, 1, 1))
+
+    def test_list_filters_and_sorts_on_counters(self):
+        quoted, quoted_items = self._rfq("Quoted", [date(2030, 3, 1)])
+        pending, _ = self._rfq("Pending", [date(2030, 1, 1)])
+        closed, closed_items = self._rfq("Closed", [None])
+        self._quote(quoted_items[0])
+        closed_items[0].status = RequestForQuotationItems.CLOSE
+        closed_items[0].save()
+
+        def ids(**params):
+            response = self.client.get(reverse("get-rfq-list"), params)
+            self.assertEqual(response.status_code, 200)
+            return [row["id"] for row in response.json()["data"]]
+
+        self.assertEqual(ids(status="open", sort="created_asc"), [quoted.id, pending.id])
+        self.assertEqual(ids(status="closed"), [closed.id])
+        self.assertEqual(ids(response_state="responded"), [quoted.id])
+        self.assertEqual(ids(sort="delivery_date_asc"), [pending.id, quoted.id, closed.id])
+        self.assertEqual(ids(sort="latest_activity")[0], closed.id)
+
+        summary = self.client.get(reverse("get-rfq-list")).json()["meta"]["summary"]
+        self.assertEqual(summary, {"total_rfqs": 3, "total_items": 3, "open_items": 2, "total_quotes": 1})
+
+    def test_repair_fixes_drifted_counters(self):
+        rfq, items = self._rfq("Drifted", [date(2030, 1, 1)])
+        self._quote(items[0])
+        self._rfq("Healthy", [None])
+        # Queryset updates skip the signals that maintain the counters
+        RequestForQuotationItems.objects.filter(id=items[0].id).update(status=RequestForQuotationItems.CLOSE)
+        RequestForQuotation.objects.filter(id=rfq.id).update(quotes_count=7)
+
+        self.assertEqual(repair_rfq_activity(self.buyer), (2, 1))
+        rfq.refresh_from_db()
+        self.assertEqual((rfq.open_item_count, rfq.quotes_count), (0, 1))
+
+        out = StringIO()
+        call_command("repair_rfq_activity", buyer_id=self.buyer.id, stdout=out)
+        self.assertIn("Checked 2 RFQs, repaired 0", out.getvalue())
@@ -0,0 +1,194 @@
+import csv
+import gzip
+import os
+import shutil
+import tempfile
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from openpyxl import load_workbook
+
+from api.export_writers import CSV_GZ, XLSX, write_export
+from api.exports import EXPORT_COLUMNS, iter_cached_rfq_export_rows, iter_rfq_export_rows
+from api.models import (
+    Buyer,
+    RequestForQuotation,
+    RequestForQuotationItems,
+    RequestForQuotationItemResponse,
+    RequestForQuotationMetaData,
+    RFQExportChunk,
+    Supplier,
+    SupplierCategory,
+)
+
+
+class RFQExportRowsTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("export@example.com", password="strongpassword123")
+        self.buyer = Buyer.objects.create(
+            user=self.user,
+            subscription_expiry_date=timezone.now() + timedelta(days=30),
+            company_name="Export Co",
+        )
+
+    def _create_rfq(self, supplier_count=2, item_count=2):
+        rfq = RequestForQuotation.objects.create(buyer=self.buyer, title="Export RFQ")
+        RequestForQuotationMetaData.objects.create(
+            request_for_quotation=rfq,
+            terms_conditions="Old terms",
+            payment_terms="Old payment",
+        )
+        RequestForQuotationMetaData.objects.create(
+            request_for_quotation=rfq,
+            terms_conditions="Terms",
+            payment_terms="Net 30",
+            shipping_terms="FOB",
+        )
+        items = [
+            RequestForQuotationItems.objects.create(
+                request_for_quotation=rfq,
+                product_name=f"Product {index}",
+                quantity=10,
+                uom="pcs",
+            )
+            for index in range(item_count)
+        ]
+        suppliers = []
+        for index in range(supplier_count):
+            supplier = Supplier.objects.create(
+                buyer=self.buyer,
+                company_name=f"Supplier {index}",
+                person_of_contact="Contact",
+                email=f"supplier{index}@example.com",
+            )
+            SupplierCategory.objects.create(buyer=self.buyer, supplier=supplier, name="Metals")
+            SupplierCategory.objects.create(buyer=self.buyer, supplier=supplier, name="Old", active=False)
+            rfq.suppliers.add(supplier)
+            suppliers.append(supplier)
+        return rfq, items, suppliers
+
+    def test_rows_cover_every_supplier_item_pair(self):
+        rfq, items, suppliers = self._create_rfq()
+        RequestForQuotationItemResponse.objects.create(
+            request_for_quotation_item=items[0],
+            supplier=suppliers[0],
+            quantity=10,
+            price=4.5,
+            lead_time=3,
+            order_status=RequestForQuotationItemResponse.ORDER_PLACED,
+        )
+
+        rows = list(iter_rfq_export_rows(self.buyer))
+
+        self.assertEqual(len(rows), 4)
+        self.assertEqual(list(rows[0].keys()), EXPORT_COLUMNS)
+        quoted = [row for row in rows if row["Supplier Price"] is not None]
+        self.assertEqual(len(quoted), 1)
+        self.assertEqual(quoted[0]["Supplier Name"], "Supplier 0")
+        self.assertEqual(quoted[0]["Product Name"], "Product 0")
+        self.assertEqual(quoted[0]["Order Status"], "Placed")
+        self.assertEqual(quoted[0]["Supplier Categories"], "Metals")
+        self.assertEqual(quoted[0]["Terms & Conditions"], "Net 30")
+        self.assertEqual(quoted[0]["Payment Terms"], "Terms")
+
+    def test_query_count_does_not_grow_with_dataset(self):
+        self._create_rfq(supplier_count=1, item_count=1)
+        with CaptureQueriesContext(connection) as small:
+            list(iter_rfq_export_rows(self.buyer))
+
+        for _ in range(3):
+            self._create_rfq(supplier_count=4, item_count=5)
+        with CaptureQueriesContext(connection) as large:
+            rows = list(iter_rfq_export_rows(self.buyer))
+
+        self.assertEqual(len(rows), 1 + 3 * 20)
+        self.assertEqual(len(small.captured_queries), len(large.captured_queries))
+
+
+    def test_cached_export_matches_direct_export(self):
+        self._create_rfq()
+        self._create_rfq(supplier_count=1, item_count=3)
+
+        first_run = list(iter_cached_rfq_export_rows(self.buyer))
+        second_run = list(iter_cached_rfq_export_rows(self.buyer))
+
+        self.assertEqual(first_run, list(iter_rfq_export_rows(self.buyer)))
+        self.assertEqual(second_run, first_run)
+        self.assertEqual(RFQExportChunk.objects.count(), 2)
+
+    def test_cached_export_only_rebuilds_changed_rfqs(self):
+        unchanged_rfq, _, _ = self._create_rfq()
+        changed_rfq, changed_items, changed_suppliers = self._create_rfq()
+        list(iter_cached_rfq_export_rows(self.buyer))
+        unchanged_chunk = RFQExportChunk.objects.get(rfq=unchanged_rfq)
+        changed_chunk = RFQExportChunk.objects.get(rfq=changed_rfq)
+
+        RequestForQuotationItemResponse.objects.create(
+            request_for_quotation_item=changed_items[1],
+            supplier=changed_suppliers[1],
+            quantity=5,
+            price=9.0,
+        )
+        rows = list(iter_cached_rfq_export_rows(self.buyer))
+
+        self.assertEqual(
+            RFQExportChunk.objects.get(rfq=unchanged_rfq).updated,
+            unchanged_chunk.updated,
+        )
+        self.assertNotEqual(RFQExportChunk.objects.get(rfq=changed_rfq).version, changed_chunk.version)
+        self.assertEqual([row["Supplier Price"] for row in rows].count(9.0), 1)
+        self.assertEqual(rows, list(iter_rfq_export_rows(self.buyer)))
+
+    def test_deleting_a_category_rebuilds_the_chunk(self):
+        _, _, suppliers = self._create_rfq()
+        list(iter_cached_rfq_export_rows(self.buyer))
+
+        # Not the most recently updated category, so max(updated) stays the same
+        SupplierCategory.objects.get(supplier=suppliers[0], name="Metals").delete()
+        rows = list(iter_cached_rfq_export_rows(self.buyer))
+
+        self.assertEqual(rows, list(iter_rfq_export_rows(self.buyer)))
+        self.assertEqual(
+            {row["Supplier Name"]: row["Supplier Categories"] for row in rows},
+            {"Supplier 0": "", "Supplier 1": "Metals"},
+        )
+
+class ExportWriterTests(SimpleTestCase):
+    columns = ["Product Name", "Quantity", "Supplier Price"]
+    rows = [
+        {"Product Name": "Bolt", "Quantity": 10, "Supplier Price": 1.5},
+        {"Product Name": "Nut", "Quantity": 20, "Supplier Price": None},
+    ]
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(lambda: shutil.rmtree(self.directory, ignore_errors=True))
+
+    def test_xlsx_writer_streams_rows_from_generator(self):
+        path = os.path.join(self.directory, "export.xlsx")
+        count = write_export(iter(self.rows), path, self.columns, XLSX)
+
+        self.assertEqual(count, 2)
+        sheet = load_workbook(path).active
+        values = [list(row) for row in sheet.iter_rows(values_only=True)]
+        self.assertEqual(values[0], self.columns)
+        self.assertEqual(values[1], ["Bolt", 10, 1.5])
+        self.assertEqual(values[2], ["Nut", 20, None])
+
+    def test_csv_gz_writer_compresses_rows(self):
+        path = os.path.join(self.directory, "export.csv.gz")
+        count = write_export(iter(self.rows), path, self.columns, CSV_GZ)
+
+        self.assertEqual(count, 2)
+        with gzip.open(path, "rt", newline="") as export_file:
+            values = list(csv.reader(export_file))
+        self.assertEqual(values, [self.columns, ["Bolt", "10", "1.5"], ["Nut", "20", ""]])
+
+    def test_unknown_format_is_rejected(self):
+        with self.assertRaises(ValueError):
+            write_export(iter(self.rows), os.path.join(self.directory, "export.txt"), self.columns, "txt")
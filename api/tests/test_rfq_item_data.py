@@ -0,0 +1,82 @@
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from api.models import (
+    Buyer,
+    RequestForQuotation,
+    RequestForQuotationItemResponse,
+    RequestForQuotationItems,
+    RequestForQuotationMetaData,
+    Supplier,
+)
+
+
+class RFQItemDataTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("compare@example.com", password="strongpassword123")
+        self.buyer = Buyer.objects.create(
+            user=self.user,
+            subscription_expiry_date=timezone.now() + timedelta(days=30),
+            company_name="Compare Co",
+        )
+        self.client.force_authenticate(user=self.user)
+
+    def _item(self, supplier_count, quoted_count):
+        rfq = RequestForQuotation.objects.create(buyer=self.buyer, title="Compare RFQ")
+        RequestForQuotationMetaData.objects.create(request_for_quotation=rfq, payment_terms="30 days")
+        item = RequestForQuotationItems.objects.create(request_for_quotation=rfq, product_name="Bolt", quantity=10)
+        suppliers = [
+            Supplier.objects.create(
+                buyer=self.buyer,
+                company_name=f"Vendor {index}",
+                person_of_contact="Contact",
+                email=f"vendor{rfq.id}-{index}@example.com",
+            )
+            for index in range(supplier_count)
+        ]
+        rfq.suppliers.set(suppliers)
+        for supplier in suppliers[:quoted_count]:
+            RequestForQuotationItemResponse.objects.create(
+                request_for_quotation_item=item, supplier=supplier, quantity=10, price=4
+            )
+        return item
+
+    def _get(self, item):
+        response = self.client.get(reverse("rfq-item-data", args=[item.id]))
+        self.assertEqual(response.status_code, 200)
+        return response.json()["data"]
+
+    def test_quoted_suppliers_come_first_and_status_follows_orders(self):
+        item = self._item(supplier_count=3, quoted_count=2)
+
+        data = self._get(item)
+
+        self.assertEqual(data["status"], "Open")
+        self.assertEqual(data["buyer"]["payment_terms"], "30 days")
+        rows = [(row["company_name"], row["price"]) for row in data["suppliers"]]
+        self.assertEqual(sorted(rows[:2]), [("Vendor 0", 4.0), ("Vendor 1", 4.0)])
+        self.assertEqual(rows[2], ("Vendor 2", None))
+
+        placed = RequestForQuotationItemResponse.objects.filter(request_for_quotation_item=item).first()
+        placed.order_status = RequestForQuotationItemResponse.ORDER_PLACED
+        placed.save()
+        data = self._get(item)
+        self.assertEqual(data["status"], "Closed")
+        self.assertIn("Placed", [row["order_status"] for row in data["suppliers"]])
+
+    def test_query_count_does_not_grow_with_suppliers(self):
+        small = self._item(supplier_count=3, quoted_count=2)
+        large = self._item(supplier_count=30, quoted_count=20)
+        self._get(small)
+
+        with CaptureQueriesContext(connection) as small_queries:
+            self._get(small)
+        with CaptureQueriesContext(connection) as large_queries:
+            self._get(large)
+        self.assertEqual(len(large_queries.captured_queries), len(small_queries.captured_queries))
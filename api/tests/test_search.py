@@ -0,0 +1,211 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection
+from django.db.backends.postgresql.base import DatabaseWrapper as PostgresDatabaseWrapper
+from django.test import SimpleTestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from api.models import (
+    Buyer,
+    RequestForQuotation,
+    RequestForQuotationItemResponse,
+    RequestForQuotationItems,
+    SearchDocument,
+    Supplier,
+    SupplierCategory,
+)
+from api.search import search_ids
+
+
+class SupplierSearchIndexTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("search@example.com", password="strongpassword123")
+        self.buyer = Buyer.objects.create(
+            user=self.user,
+            subscription_expiry_date=timezone.now() + timedelta(days=30),
+            company_name="Search Co",
+        )
+
+    def _supplier(self, name, **fields):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Supplier.objects.create(
+                buyer=self.buyer,
+                company_name=name,
+                person_of_contact=fields.pop("person_of_contact", "Contact"),
+                email="sales@example.com",
+                **fields,
+            )
+
+    def _search(self, term):
+        return search_ids(SearchDocument.SUPPLIER, self.buyer, term)
+
+    def test_documents_follow_supplier_and_category_writes(self):
+        supplier = self._supplier("Forge", phone_no="9876543210")
+        with self.captureOnCommitCallbacks(execute=True):
+            category = SupplierCategory.objects.create(buyer=self.buyer, supplier=supplier, name="Castings")
+
+        self.assertEqual(self._search("casting"), [str(supplier.id)])
+        self.assertEqual(self._search("765432"), [str(supplier.id)])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            category.active = False
+            category.save()
+        self.assertEqual(self._search("casting"), [])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            supplier.company_name = "Anvil Works"
+            supplier.save()
+        self.assertEqual(self._search("anvil"), [str(supplier.id)])
+        self.assertEqual(self._search("forge"), [])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            supplier.delete()
+        self.assertFalse(SearchDocument.objects.exists())
+
+    def test_search_is_scoped_to_buyer_and_handles_short_terms(self):
+        supplier = self._supplier("Ox Metals", person_of_contact="Ravi")
+        other_user = User.objects.create_user("other-search@example.com", password="strongpassword123")
+        other_buyer = Buyer.objects.create(user=other_user, subscription_expiry_date=timezone.now())
+        with self.captureOnCommitCallbacks(execute=True):
+            Supplier.objects.create(buyer=other_buyer, company_name="Ox Metals", person_of_contact="Contact")
+
+        self.assertEqual(self._search("metals"), [str(supplier.id)])
+        self.assertEqual(self._search("ox"), [str(supplier.id)])
+        self.assertEqual(self._search('"metals'), [])
+
+    def test_rebuild_command_restores_documents(self):
+        supplier = self._supplier("Rebuild Steel")
+        SupplierCategory.objects.create(buyer=self.buyer, supplier=supplier, name="Sheets")
+        SearchDocument.objects.all().delete()
+        output = StringIO()
+
+        call_command("rebuild_search_index", kind=SearchDocument.SUPPLIER, stdout=output)
+
+        self.assertIn("Rebuilt 1 search documents", output.getvalue())
+        self.assertEqual(self._search("sheets"), [str(supplier.id)])
+
+
+class RFQSearchIndexTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("rfq-search@example.com", password="strongpassword123")
+        self.buyer = Buyer.objects.create(
+            user=self.user,
+            subscription_expiry_date=timezone.now() + timedelta(days=30),
+            company_name="RFQ Search Co",
+        )
+        self.client.force_authenticate(user=self.user)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.supplier = Supplier.objects.create(
+                buyer=self.buyer, company_name="Apex Castings", person_of_contact="Contact"
+            )
+            self.rfq = RequestForQuotation.objects.create(buyer=self.buyer, title="Quarterly restock")
+            self.rfq.suppliers.add(self.supplier)
+            self.item = RequestForQuotationItems.objects.create(
+                request_for_quotation=self.rfq,
+                product_name="Hex bolt",
+                specifications="Grade 8.8 zinc plated",
+                quantity=100,
+            )
+            self.other_rfq = RequestForQuotation.objects.create(buyer=self.buyer, title="Office chairs")
+            RequestForQuotationItems.objects.create(
+                request_for_quotation=self.other_rfq, product_name="Chair", quantity=4
+            )
+
+    def _list(self, **params):
+        response = self.client.get(reverse("get-rfq-list"), params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def _ids(self, **params):
+        return [row["id"] for row in self._list(**params)["data"]]
+
+    def test_renaming_or_removing_a_supplier_refreshes_its_rfqs(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.supplier.company_name = "Summit Foundry"
+            self.supplier.save()
+
+        self.assertEqual(self._ids(q="apex"), [])
+        self.assertEqual(self._ids(q="summit"), [self.rfq.id])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.supplier.delete()
+
+        self.assertEqual(self._ids(q="summit"), [])
+        self.assertEqual(self._ids(q="restock"), [self.rfq.id])
+
+    def test_search_covers_title_items_and_suppliers(self):
+        self.assertEqual(self._ids(q="restock"), [self.rfq.id])
+        self.assertEqual(self._ids(q="zinc"), [self.rfq.id])
+        self.assertEqual(self._ids(q="apex"), [self.rfq.id])
+        self.assertEqual(self._ids(q="chair"), [self.other_rfq.id])
+        self.assertEqual(self._ids(q=str(self.other_rfq.id)), [self.other_rfq.id])
+
+    def test_documents_follow_item_and_supplier_link_changes(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.item.product_name = "Flange"
+            self.item.save()
+            self.rfq.suppliers.remove(self.supplier)
+            self.other_rfq.suppliers.add(self.supplier)
+
+        self.assertEqual(self._ids(q="flange"), [self.rfq.id])
+        self.assertEqual(self._ids(q="hex bolt"), [])
+        self.assertEqual(self._ids(q="apex"), [self.other_rfq.id])
+
+    def test_filters_and_annotations_apply_to_search_results(self):
+        RequestForQuotationItemResponse.objects.create(
+            request_for_quotation_item=self.item, supplier=self.supplier, quantity=100, price=1.5
+        )
+
+        payload = self._list(q="o", response_state="responded", sort="latest_activity")
+
+        self.assertEqual([row["id"] for row in payload["data"]], [self.rfq.id])
+        self.assertEqual(payload["data"][0]["quotes_count"], 1)
+        self.assertEqual(payload["data"][0]["status"], "open")
+        self.assertEqual(payload["meta"]["total_count"], 1)
+        self.assertEqual(self._ids(status="closed"), [])
+
+    def test_page_queries_do_not_grow_with_matches(self):
+        def count_queries():
+            with CaptureQueriesContext(connection) as context:
+                self._list(q="bulk", limit=5)
+            return len(context.captured_queries)
+
+        def add_rfqs(count):
+            with self.captureOnCommitCallbacks(execute=True):
+                for index in range(count):
+                    rfq = RequestForQuotation.objects.create(buyer=self.buyer, title=f"Bulk order {index}")
+                    RequestForQuotationItems.objects.create(request_for_quotation=rfq, product_name="Nut", quantity=1)
+
+        add_rfqs(6)
+        small = count_queries()
+        add_rfqs(30)
+
+        self.assertEqual(count_queries(), small)
+        self.assertEqual(self._list(q="bulk", limit=5)["meta"]["total_count"], 36)
+
+
+class TrigramLookupTests(SimpleTestCase):
+    def _sql(self, vendor_connection):
+        queryset = SearchDocument.objects.filter(document__trigram_icontains="50%_bolt")
+        return queryset.query.get_compiler(connection=vendor_connection).as_sql()
+
+    def test_postgresql_uses_ilike_the_trigram_index_can_serve(self):
+        pg_connection = PostgresDatabaseWrapper({**connection.settings_dict, "ENGINE": "django.db.backends.postgresql"}, "pg")
+
+        sql, params = self._sql(pg_connection)
+
+        self.assertIn('"search_documents"."document" ILIKE %s', sql)
+        self.assertNotIn("UPPER", sql)
+        self.assertEqual(params[-1], "%50\\%\\_bolt%")
+
+    def test_other_databases_fall_back_to_icontains(self):
+        sql, params = self._sql(connection)
+
+        self.assertIn("LIKE", sql)
+        self.assertEqual(params[-1], "%50\\%\\_bolt%")
@@ -0,0 +1,178 @@
+from datetime import timedelta
+from importlib import import_module
+from io import StringIO
+
+from django.apps import apps
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from api.models import (
+    Buyer,
+    RequestForQuotationItemResponse,
+    Supplier,
+    SupplierScorecard,
+)
+
+
+@override_settings(USE_CELERY=False, SEND_EMAILS=False, FRONTEND_URL="http://localhost:3000")
+class SupplierScorecardTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("scores@example.com", password="strongpassword123")
+        self.buyer = Buyer.objects.create(
+            user=self.user,
+            subscription_expiry_date=timezone.now() + timedelta(days=30),
+            company_name="Score Co",
+        )
+        self.client.force_authenticate(user=self.user)
+        self.suppliers = [
+            Supplier.objects.create(
+                buyer=self.buyer,
+                company_name=f"Supplier {index}",
+                person_of_contact="Contact",
+                email=f"supplier{index}@example.com",
+            )
+            for index in range(3)
+        ]
+
+    def _create_rfq(self, suppliers, item_count=2):
+        response = self.client.post(
+            reverse("create-rfq"),
+            {
+                "title": "Scorecard RFQ",
+                "items": [
+                    {"product_name": f"Product {index}", "quantity": 10, "uom": "pcs"}
+                    for index in range(item_count)
+                ],
+                "suppliers": [str(supplier.id) for supplier in suppliers],
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def _quote(self, rfq_id, supplier, items, price=2.0):
+        response = self.client.post(
+            reverse("create-rfq-response"),
+            {
+                "rfq_id": rfq_id,
+                "supplier_id": str(supplier.id),
+                "items": [
+                    {"rfq_item_id": item["id"], "quantity": 10, "price": price, "supplier_lead_time": 3}
+                    for item in items
+                ],
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, 200)
+
+    def _stats(self, **params):
+        response = self.client.get(reverse("get-supplier-stats-data"), params)
+        self.assertEqual(response.status_code, 200)
+        return {row["company_name"]: row for row in response.json()["data"]}
+
+    def test_scorecards_track_requests_quotes_and_orders(self):
+        rfq = self._create_rfq(self.suppliers[:2])
+        self._quote(rfq["rfq_id"], self.suppliers[0], rfq["created_items"])
+        self._quote(rfq["rfq_id"], self.suppliers[1], rfq["created_items"][:1], price=3.0)
+        response = RequestForQuotationItemResponse.objects.filter(supplier=self.suppliers[0]).first()
+        order = self.client.post(
+            reverse("rfq-item-data", args=[response.request_for_quotation_item_id]),
+            {"response_id": response.id},
+            format="json",
+        )
+        self.assertEqual(order.status_code, 200)
+
+        stats = self._stats()
+
+        self.assertEqual(stats["Supplier 0"]["quotes_requested"], 2)
+        self.assertEqual(stats["Supplier 0"]["quotes_received"], 2)
+        self.assertEqual(stats["Supplier 0"]["quotes_value"], 40.0)
+        self.assertEqual(stats["Supplier 0"]["order_placed"], 1)
+        self.assertEqual(stats["Supplier 0"]["total_order_value"], 20.0)
+        self.assertEqual(stats["Supplier 0"]["success_percent"], "50.0%")
+        self.assertEqual(stats["Supplier 0"]["contribution_percent"], "100.0%")
+        self.assertEqual(stats["Supplier 1"]["quotes_received"], 1)
+        self.assertEqual(stats["Supplier 1"]["contribution_percent"], "--")
+        self.assertEqual(stats["Supplier 2"]["quotes_requested"], 0)
+        self.assertEqual(stats["Supplier 2"]["quotes_value"], "--")
+
+    def test_rebuild_command_matches_incremental_updates(self):
+        rfq = self._create_rfq(self.suppliers)
+        self._quote(rfq["rfq_id"], self.suppliers[2], rfq["created_items"])
+        incremental = self._stats()
+
+        SupplierScorecard.objects.all().delete()
+        output = StringIO()
+        call_command("rebuild_supplier_scorecards", buyer_id=self.buyer.id, stdout=output)
+
+        self.assertIn("Rebuilt 3 supplier scorecards", output.getvalue())
+        self.assertEqual(self._stats(), incremental)
+
+    def test_migration_backfill_matches_incremental_updates(self):
+        rfq = self._create_rfq(self.suppliers)
+        self._quote(rfq["rfq_id"], self.suppliers[0], rfq["created_items"])
+        response = RequestForQuotationItemResponse.objects.filter(supplier=self.suppliers[0]).first()
+        self.client.post(
+            reverse("rfq-item-data", args=[response.request_for_quotation_item_id]),
+            {"response_id": response.id},
+            format="json",
+        )
+        incremental = self._stats()
+
+        SupplierScorecard.objects.all().delete()
+        import_module("api.migrations.0038_backfill_supplier_scorecards").backfill_supplier_scorecards(apps, None)
+
+        self.assertEqual(SupplierScorecard.objects.count(), 3)
+        self.assertEqual(self._stats(), incremental)
+
+    def test_live_aggregation_matches_scorecards(self):
+        rfq = self._create_rfq(self.suppliers[:2], item_count=3)
+        self._quote(rfq["rfq_id"], self.suppliers[0], rfq["created_items"])
+        self._quote(rfq["rfq_id"], self.suppliers[1], rfq["created_items"][1:], price=5.0)
+        response = RequestForQuotationItemResponse.objects.filter(supplier=self.suppliers[1]).first()
+        self.client.post(
+            reverse("rfq-item-data", args=[response.request_for_quotation_item_id]),
+            {"response_id": response.id},
+            format="json",
+        )
+
+        self.assertEqual(self._stats(source="live"), self._stats())
+
+    def test_live_aggregation_query_count_is_constant(self):
+        def count_queries():
+            with CaptureQueriesContext(connection) as context:
+                stats = self._stats(source="live")
+            return len(context.captured_queries), len(stats)
+
+        rfq = self._create_rfq(self.suppliers)
+        self._quote(rfq["rfq_id"], self.suppliers[0], rfq["created_items"])
+        Supplier.objects.bulk_create(
+            Supplier(
+                buyer=self.buyer,
+                company_name=f"Bulk {index}",
+                person_of_contact="Contact",
+                email=f"bulk{index}@example.com",
+            )
+            for index in range(7)
+        )
+        small_queries, small_rows = count_queries()
+
+        Supplier.objects.bulk_create(
+            Supplier(
+                buyer=self.buyer,
+                company_name=f"Bulk {index}",
+                person_of_contact="Contact",
+                email=f"bulk{index}@example.com",
+            )
+            for index in range(7, 10_000)
+        )
+        large_queries, large_rows = count_queries()
+
+        self.assertEqual((small_rows, large_rows), (10, 10_003))
+        self.assertEqual(small_queries, large_queries)
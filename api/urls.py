@@ -21,6 +21,8 @@ urlpatterns = [
     path('get-rfq-response/<int:rfq_id>/<str:supplier_id>/', views.GetRFQResponsePageData.as_view(),name="get-rfq-response"),
     path('create-rfq-response/', views.CreateRFQResponse.as_view(),name="create-rfq-response"),
     path('rfq-item-data/<int:rfq_item_id>', views.RFQItemData.as_view(),name="rfq-item-data"),
+    path('get-rfq-quote-matrix/<int:rfq_id>/', views.GetRFQQuoteMatrix.as_view(),name="get-rfq-quote-matrix"),
+    path('place-bulk-orders/<int:rfq_id>/', views.PlaceBulkOrders.as_view(),name="place-bulk-orders"),
     path('send-rfq-data-file/', views.GetAllRFQDataEmail.as_view(),name="send-rfq-data-file"),
     path('get-supplier-stats-data/', views.GetSuppliersStatsData.as_view(),name="get-supplier-stats-data"),
     path('import-suppliers/', views.BulkImportSuppliers.as_view(),name="bulk-import-suppliers"),
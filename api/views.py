@@ -14,7 +14,7 @@ from django.core.exceptions import ValidationError
 from django.core.files.uploadedfile import TemporaryUploadedFile
 from django.core.paginator import Paginator
 from django.core.validators import validate_email
-from django.db import transaction
+from django.db import IntegrityError, transaction
 from django.db.models import (
     Count,
     Avg,
@@ -23,15 +23,16 @@ from django.db.models import (
     ExpressionWrapper,
     FloatField,
     Q,
-    DurationField,
     Case,
+    Exists,
     When,
     Value,
-    Max,
-    Min,
     IntegerField,
+    OuterRef,
+    Prefetch,
+    Subquery,
 )
-from django.db.models.functions import Cast, Coalesce, Greatest
+from django.db.models.functions import Cast
 from django.http import FileResponse
 from django.shortcuts import render
 from django.utils import timezone
@@ -43,11 +44,14 @@ from rest_framework.views import APIView
 from uuid import UUID
 
 from authentication.utils import return_400
-from api.helper import check_string
+from api.helper import RFQ_RESPONSE_UNIQUE_CONSTRAINTS, check_string, violated_unique_constraint
 from api.ab_testing import pick_subscription_variant, calculate_initial_expiry
+from api.caching import buyer_cache_key, bump_buyer_data_version_on_commit, get_or_compute
+from api.email_payloads import send_purchase_orders
 from api.models import (
     AuditLog,
     Buyer,
+    EmailOutbox,
     Supplier,
     RequestForQuotation,
     RequestForQuotationItems,
@@ -55,9 +59,36 @@ from api.models import (
     SupplierCategory,
     RequestForQuotationItemResponse,
     RFQItemAttachment,
+    SearchDocument,
 )
+from api.notifications import (
+    RFQ_RESPONSE_ALERT_WINDOW,
+    record_rfq_response_alert,
+    rfq_redirect_url,
+    rfq_response_alert,
+)
+from api.outbox import drain_email_outbox, enqueue_emails
+from api.pagination import (
+    count_rows,
+    order_by_expressions,
+    paginate_keyset,
+    parse_count_mode,
+)
+from api.rollups import get_dashboard_rollup_stats
+from api.scorecards import (
+    compute_supplier_stats_rows,
+    get_supplier_stats_rows,
+    record_order_placed,
+    record_orders_placed,
+    record_quotes_received,
+    record_quotes_requested,
+    serialize_supplier_stats,
+)
+from api.reminders import pending_quote_lines, send_reminder_digests
+from api.rfq_activity import refresh_rfq_activity
+from api.search import search_ids
 from api.task import CeleryEmailManager
-from .helper import EmailManager, format_date_for_timezone, get_buyer_timezone
+from .helper import EmailManager
 
 try:
     import magic  # type: ignore
@@ -479,57 +510,68 @@ class CreateRFQ(APIView):
             }
             RequestForQuotationMetaData(**meta_data, request_for_quotation=rfq).save()
 
-            created_items = []
-            for index, item in enumerate(items, start=1):
+            rfq_items = []
+            for item in items:
                 product_name = (item.get("product_name") or "").strip()
                 quantity = item.get("quantity")
-                uom = (item.get("uom") or "").strip()
-                specifications = (item.get("specifications") or "").strip()
                 if not product_name or quantity is None:
                     raise ValidationError("Each item must include product_name and quantity.")
-
-                rfq_item = RequestForQuotationItems(
-                    request_for_quotation=rfq,
-                    product_name=product_name,
-                    quantity=float(quantity),
-                    uom=uom,
-                    specifications=specifications,
-                )
-                rfq_item.expected_delivery_date = _parse_expected_delivery_date(item.get("expected_delivery_date"))
-                rfq_item.save()
-
-                created_items.append(
-                    {
-                        "id": rfq_item.id,
-                        "index": index,
-                        "product_name": product_name,
-                    }
+                rfq_items.append(
+                    RequestForQuotationItems(
+                        request_for_quotation=rfq,
+                        product_name=product_name,
+                        quantity=float(quantity),
+                        uom=(item.get("uom") or "").strip(),
+                        specifications=(item.get("specifications") or "").strip(),
+                        expected_delivery_date=_parse_expected_delivery_date(item.get("expected_delivery_date")),
+                    )
                 )
+            # bulk_create skips the item signals; the RFQ's own save already
+            # bumped the buyer cache and queued its search document refresh
+            RequestForQuotationItems.objects.bulk_create(rfq_items)
+            refresh_rfq_activity([rfq.id])
+            created_items = [
+                {
+                    "id": rfq_item.id,
+                    "index": index,
+                    "product_name": rfq_item.product_name,
+                }
+                for index, rfq_item in enumerate(rfq_items, start=1)
+            ]
 
-            email_obj = {
-                "to": [],
-                "cc": [],
-                "bcc": [],
-                "subject": f"New Quotation Requested From {rfq.buyer.company_name if rfq.buyer.company_name else rfq.buyer.user.first_name} ",
-                "items": items,
-                "rfq_id": rfq.id,
-                "total_no_of_items": len(items),
+            suppliers_by_id = {
+                str(supplier.id): supplier for supplier in buyer.suppliers.filter(id__in=suppliers)
             }
-            for supplier in suppliers:
-                sup = buyer.suppliers.filter(id=supplier)
-                if sup.exists():
-                    sup = sup.last()
-                    rfq.suppliers.add(sup)
-                    email_obj["to"] = [sup.email]
-                    email_obj["url"] = f"{settings.FRONTEND_URL}/rfq-response/{rfq.id}/{sup.id}"
-                    email_obj["supplier_name"] = sup.company_name
-                    email_obj["company_name"] = rfq.buyer.company_name
-                    if settings.USE_CELERY:
-                        CeleryEmailManager.send_rfq_created_email.delay(email_obj)
-                    else:
-                        EmailManager.send_rfq_created_email(email_obj)
+            invited_suppliers = []
+            for supplier_id in suppliers:
+                supplier = suppliers_by_id.pop(str(supplier_id), None)
+                if supplier:
+                    invited_suppliers.append(supplier)
+            RequestForQuotation.suppliers.through.objects.bulk_create(
+                [
+                    RequestForQuotation.suppliers.through(requestforquotation_id=rfq.id, supplier_id=supplier.id)
+                    for supplier in invited_suppliers
+                ],
+                ignore_conflicts=True,
+            )
+            invited_supplier_ids = [supplier.id for supplier in invited_suppliers]
+
+            if invited_suppliers:
+                # Outbox rows commit or roll back with the RFQ and a drain is
+                # started on commit; the beat drainer picks up anything it misses
+                enqueue_emails(
+                    EmailOutbox.RFQ_CREATED,
+                    [{"rfq_id": rfq.id, "supplier_id": str(supplier.id)} for supplier in invited_suppliers],
+                )
+                if settings.USE_CELERY:
+                    transaction.on_commit(CeleryEmailManager.drain_email_outbox.delay)
+                else:
+                    transaction.on_commit(drain_email_outbox)
+            record_quotes_requested(buyer, invited_supplier_ids, len(created_items))
             return Response({"success": True, "rfq_id": rfq.id, "created_items": created_items})
         except Exception as error:
+            # Discard the partial RFQ and its queued emails along with it
+            transaction.set_rollback(True)
             return return_400({"success":False,"error":f"{error}"})
 
 
@@ -545,40 +587,16 @@ class GetRFQList(APIView):
             sort = (request.GET.get("sort") or "created_desc").lower()
             page = int(request.GET.get("page", 1))
             limit = int(request.GET.get("limit", 10))
+            cursor = request.GET.get("cursor")
+            count_mode = parse_count_mode(request.GET.get("count"))
 
             buyer_rfqs = RequestForQuotation.objects.filter(buyer=buyer)
-            rfqs = (
-                buyer_rfqs
-                .annotate(
-                    item_count=Count("request_for_quotation_items", distinct=True),
-                    open_item_count=Count(
-                        "request_for_quotation_items",
-                        filter=Q(request_for_quotation_items__status=RequestForQuotationItems.OPEN),
-                        distinct=True,
-                    ),
-                    quotes_count=Count(
-                        "request_for_quotation_items__request_for_quotation_item_response",
-                        distinct=True,
-                    ),
-                    latest_item_update=Max("request_for_quotation_items__updated"),
-                    latest_response_update=Max("request_for_quotation_items__request_for_quotation_item_response__updated"),
-                    earliest_delivery_date=Min("request_for_quotation_items__expected_delivery_date"),
-                )
-                .annotate(
-                    latest_activity=Greatest(
-                        Coalesce("latest_item_update", "updated"),
-                        Coalesce("latest_response_update", "updated"),
-                        "updated",
-                    )
-                )
-            )
 
+            # Filters and sorts read the RFQ's activity counters, so the list
+            # never joins items or responses
+            rfqs = buyer_rfqs
             if search:
-                search_filter = (
-                    Q(title__icontains=search)
-                    | Q(request_for_quotation_items__product_name__icontains=search)
-                    | Q(suppliers__company_name__icontains=search)
-                )
+                search_filter = Q(id__in=search_ids(SearchDocument.RFQ, buyer, search))
                 if search.isdigit():
                     search_filter |= Q(id=int(search))
                 rfqs = rfqs.filter(search_filter)
@@ -593,20 +611,27 @@ class GetRFQList(APIView):
             elif response_state == "responded":
                 rfqs = rfqs.filter(quotes_count__gt=0)
 
-            rfqs = rfqs.distinct()
-
+            # Every sort ends on id so cursor pages seek on a unique key
             sort_map = {
-                "latest_activity": "-latest_activity",
-                "created_desc": "-created",
-                "created_asc": "created",
-                "delivery_date_asc": "earliest_delivery_date",
-                "delivery_date_desc": "-earliest_delivery_date",
-                "title": "title",
+                "latest_activity": ("-latest_activity", "-id"),
+                "created_desc": ("-created", "-id"),
+                "created_asc": ("created", "id"),
+                "delivery_date_asc": ("earliest_delivery_date", "id"),
+                "delivery_date_desc": ("-earliest_delivery_date", "-id"),
+                "title": ("title", "id"),
             }
-            rfqs = rfqs.order_by(sort_map.get(sort, "-latest_activity"))
+            ordering = sort_map.get(sort, sort_map["latest_activity"])
 
-            paginator = Paginator(rfqs, limit)
-            page_obj = paginator.get_page(page)
+            if cursor is not None:
+                page_rfqs, next_cursor, _ = paginate_keyset(rfqs, ordering, cursor, limit)
+                page_meta = {"next_cursor": next_cursor, "has_more": next_cursor is not None}
+                total_count = count_rows(rfqs, count_mode)
+            else:
+                paginator = Paginator(rfqs.order_by(*order_by_expressions(ordering)), limit)
+                page_obj = paginator.get_page(page)
+                page_rfqs = page_obj.object_list
+                page_meta = {"page": page_obj.number, "has_more": page_obj.has_next()}
+                total_count = paginator.count
 
             serialized = [
                 {
@@ -623,23 +648,21 @@ class GetRFQList(APIView):
                     if rfq.earliest_delivery_date
                     else None,
                 }
-                for rfq in page_obj.object_list
+                for rfq in page_rfqs
             ]
 
-            item_summary = RequestForQuotationItems.objects.filter(
-                request_for_quotation__buyer=buyer
-            ).aggregate(
-                total_items=Count("id"),
-                open_items=Count("id", filter=Q(status=RequestForQuotationItems.OPEN)),
-                total_quotes=Count("request_for_quotation_item_response", distinct=True),
+            item_summary = buyer_rfqs.aggregate(
+                total_rfqs=Count("id"),
+                total_items=Sum("item_count"),
+                open_items=Sum("open_item_count"),
+                total_quotes=Sum("quotes_count"),
             )
-            total_rfqs = buyer_rfqs.count()
+            total_rfqs = item_summary["total_rfqs"]
             meta = {
-                "page": page_obj.number,
+                **page_meta,
                 "page_size": limit,
-                "has_more": page_obj.has_next(),
                 "has_rfqs": total_rfqs > 0,
-                "total_count": paginator.count,
+                "total_count": total_count,
                 "summary": {
                     "total_rfqs": total_rfqs,
                     "total_items": item_summary.get("total_items") or 0,
@@ -677,6 +700,8 @@ class GetRFQItems(APIView):
             except (TypeError, ValueError):
                 limit = 10
             limit = max(1, min(limit, 100))
+            cursor = request.GET.get("cursor")
+            count_mode = parse_count_mode(request.GET.get("count"))
             try:
                 pin_item_id = int(pin_item_param) if pin_item_param else None
             except (TypeError, ValueError):
@@ -712,17 +737,25 @@ class GetRFQItems(APIView):
                         output_field=IntegerField(),
                     )
                 )
-                items_queryset = items_queryset.order_by("pin_position", "created")
+                ordering = ("pin_position", "created", "id")
             else:
-                items_queryset = items_queryset.order_by("created")
+                ordering = ("created", "id")
 
-            paginator = Paginator(items_queryset, limit)
-            page_obj = paginator.get_page(page)
-            start_index = (page_obj.number - 1) * limit
+            if cursor is not None:
+                page_items, next_cursor, start_index = paginate_keyset(items_queryset, ordering, cursor, limit)
+                page_meta = {"next_cursor": next_cursor, "has_more": next_cursor is not None}
+                total_count = count_rows(items_queryset, count_mode)
+            else:
+                paginator = Paginator(items_queryset.order_by(*order_by_expressions(ordering)), limit)
+                page_obj = paginator.get_page(page)
+                page_items = page_obj.object_list
+                start_index = (page_obj.number - 1) * limit
+                page_meta = {"page": page_obj.number, "has_more": page_obj.has_next()}
+                total_count = paginator.count
             has_open_item = items_queryset.filter(status=RequestForQuotationItems.OPEN).exists()
 
             items = []
-            for offset, item in enumerate(page_obj.object_list, start=1):
+            for offset, item in enumerate(page_items, start=1):
                 attachments = [
                     {
                         "id": attachment.id,
@@ -762,14 +795,15 @@ class GetRFQItems(APIView):
             }
 
             meta = {
-                "page": page_obj.number,
+                **page_meta,
                 "page_size": limit,
-                "has_more": page_obj.has_next(),
-                "total_count": paginator.count,
+                "total_count": total_count,
                 "pin_item_id": pin_item_id,
             }
 
             return Response({"success": True, "rfq": rfq_info, "items": items, "meta": meta})
+        except ValidationError as error:
+            return return_400({"success": False, "error": str(error)})
         except Exception as error:
             logger.exception("Failed to fetch RFQ items: %s", error)
             return return_400({"success": False, "error": "Unable to fetch RFQ items right now."})
@@ -962,6 +996,9 @@ class GetRFQ(APIView):
             search = request.GET.get("q", None)
             page = int(request.GET.get("page", 1))
             limit = int(request.GET.get("limit", 10))
+            cursor = request.GET.get("cursor")
+            count_mode = parse_count_mode(request.GET.get("count"))
+            ordering = ("-created", "-id")
 
             rfq_item_query = RequestForQuotationItems.objects.filter(
                 request_for_quotation__buyer=buyer
@@ -969,7 +1006,7 @@ class GetRFQ(APIView):
                 'request_for_quotation'
             ).annotate(
                 quotes_count=Count('request_for_quotation_item_response')
-            ).order_by("-created")
+            ).order_by(*order_by_expressions(ordering))
 
             if search:
                 rfq_item_query = rfq_item_query.filter(
@@ -990,8 +1027,20 @@ class GetRFQ(APIView):
                 'created'
             )
 
-            paginator = Paginator(rfq_item_query, limit)
-            rfq_items = paginator.get_page(page)
+            if cursor is not None:
+                rfq_items, next_cursor, _ = paginate_keyset(rfq_item_query, ordering, cursor, limit)
+                pagination = {
+                    "next_cursor": next_cursor,
+                    "has_more": next_cursor is not None,
+                    "total_count": count_rows(rfq_item_query, count_mode),
+                }
+            else:
+                paginator = Paginator(rfq_item_query, limit)
+                rfq_items = paginator.get_page(page)
+                pagination = {
+                    "max_page": paginator.num_pages,
+                    "page_number": page
+                }
 
             data = [
                 {
@@ -1014,10 +1063,7 @@ class GetRFQ(APIView):
             return Response({
                 "success": True,
                 "data": data,
-                "pagination": {
-                    "max_page": paginator.num_pages,
-                    "page_number": page
-                }
+                "pagination": pagination
             })
 
         except Exception as error:
@@ -1273,110 +1319,84 @@ class GetSuppliers(APIView):
         try:
             buyer = request.user.buyer
             search = request.GET.get("q", "")
-            
-            # Get all suppliers for the buyer
-            all_suppliers = buyer.suppliers.all()
-            
+
             # Define time thresholds
-            now = datetime.now()
+            now = timezone.now()
             recent_supplier_threshold = now - timedelta(hours=1)  # Suppliers added in the last hour
             recent_rfq_threshold = now - timedelta(days=5)        # RFQs from the last 5 days
-            
-            # Create a dictionary to track processed suppliers
-            processed_suppliers = {}
-            result_data = []
-            
-            # STEP 1: First prioritize very recently added suppliers (last hour)
-            recent_suppliers = all_suppliers.filter(created__gte=recent_supplier_threshold).order_by('-created')
-            
-            if search:
-                recent_suppliers = recent_suppliers.filter(
-                    Q(company_name__icontains=search) |
-                    Q(person_of_contact__icontains=search) |
-                    Q(phone_no__icontains=search) |
-                    Q(email__icontains=search) |
-                    Q(categories__name__icontains=search, categories__active=True)
+
+            # Latest recent RFQ of the buyer each supplier was invited to
+            latest_recent_rfq = RequestForQuotation.objects.filter(
+                buyer=buyer,
+                suppliers=OuterRef("pk"),
+                created__gte=recent_rfq_threshold,
+            ).order_by("-created").values("created")[:1]
+
+            # Rank suppliers added in the last hour first (newest first), then
+            # suppliers of recent RFQs (latest RFQ first), then everyone else
+            suppliers = buyer.suppliers.annotate(
+                recent_rfq_created=Subquery(latest_recent_rfq),
+            ).annotate(
+                priority=Case(
+                    When(created__gte=recent_supplier_threshold, then=Value(0)),
+                    When(recent_rfq_created__isnull=False, then=Value(1)),
+                    default=Value(2),
+                    output_field=IntegerField(),
+                ),
+                priority_time=Case(
+                    When(created__gte=recent_supplier_threshold, then=F("created")),
+                    When(recent_rfq_created__isnull=False, then=F("recent_rfq_created")),
+                ),
+            ).order_by(
+                "priority",
+                F("priority_time").desc(nulls_last=True),
+                Case(When(priority__lt=2, then=F("created"))).desc(nulls_last=True),
+                "created",
+                "id",
+            ).prefetch_related(
+                Prefetch(
+                    "categories",
+                    queryset=SupplierCategory.objects.filter(active=True).order_by("id"),
+                    to_attr="active_categories",
                 )
-                
-            for supplier in recent_suppliers:
-                result_data.append({
+            )
+
+            if search:
+                suppliers = suppliers.filter(id__in=search_ids(SearchDocument.SUPPLIER, buyer, search))
+
+            # Paginate only when asked to, so existing callers keep the full list
+            meta = None
+            if "page" in request.GET or "limit" in request.GET:
+                page = int(request.GET.get("page") or 1)
+                limit = int(request.GET.get("limit") or 50)
+                paginator = Paginator(suppliers, limit)
+                page_obj = paginator.get_page(page)
+                suppliers = page_obj.object_list
+                meta = {
+                    "page": page_obj.number,
+                    "page_size": limit,
+                    "has_more": page_obj.has_next(),
+                    "total_count": paginator.count,
+                }
+
+            result_data = [
+                {
                     "supplier_id": supplier.id,
                     "company": supplier.company_name,
                     "person": supplier.person_of_contact,
                     "phone": supplier.phone_no,
                     "email": supplier.email,
                     "categories": [
-                        {"category_id": category.id, "category_name": category.name} 
-                        for category in supplier.categories.filter(active=True)
+                        {"category_id": category.id, "category_name": category.name}
+                        for category in supplier.active_categories
                     ],
                     "remark": supplier.remark
-                })
-                processed_suppliers[supplier.id] = True
-            
-            # STEP 2: Then process suppliers from recent RFQs
-            rfq_list = RequestForQuotation.objects.filter(
-                created__gte=recent_rfq_threshold, 
-                buyer=buyer
-            ).order_by('-created')
-            
-            for rfq in rfq_list:
-                # Filter suppliers based on search query if provided
-                if search:
-                    suppliers_rfq = rfq.suppliers.filter(
-                        Q(company_name__icontains=search) |
-                        Q(person_of_contact__icontains=search) |
-                        Q(phone_no__icontains=search) |
-                        Q(email__icontains=search) |
-                        Q(categories__name__icontains=search, categories__active=True)
-                    )
-                else:
-                    suppliers_rfq = rfq.suppliers.all().order_by('-created')
-                
-                # Add each supplier to the result if not already added
-                for supplier in suppliers_rfq:
-                    if not processed_suppliers.get(supplier.id, False):
-                        result_data.append({
-                            "supplier_id": supplier.id,
-                            "company": supplier.company_name,
-                            "person": supplier.person_of_contact,
-                            "phone": supplier.phone_no,
-                            "email": supplier.email,
-                            "categories": [
-                                {"category_id": category.id, "category_name": category.name} 
-                                for category in supplier.categories.filter(active=True)
-                            ],
-                            "remark": supplier.remark
-                        })
-                        processed_suppliers[supplier.id] = True
-            
-            # STEP 3: Finally process any remaining suppliers
-            if search:
-                remaining_suppliers = all_suppliers.filter(
-                    Q(company_name__icontains=search) |
-                    Q(person_of_contact__icontains=search) |
-                    Q(phone_no__icontains=search) |
-                    Q(email__icontains=search) |
-                    Q(categories__name__icontains=search, categories__active=True)
-                )
-            else:
-                remaining_suppliers = all_suppliers
-                
-            for supplier in remaining_suppliers:
-                if not processed_suppliers.get(supplier.id, False):
-                    result_data.append({
-                        "supplier_id": supplier.id,
-                        "company": supplier.company_name,
-                        "person": supplier.person_of_contact,
-                        "phone": supplier.phone_no,
-                        "email": supplier.email,
-                        "categories": [
-                            {"category_id": category.id, "category_name": category.name} 
-                            for category in supplier.categories.filter(active=True)
-                        ],
-                        "remark": supplier.remark
-                    })
-                    processed_suppliers[supplier.id] = True
-            
+                }
+                for supplier in suppliers
+            ]
+
+            if meta is not None:
+                return Response({"success": True, "data": result_data, "meta": meta})
             return Response({"success": True, "data": result_data})
             
         except Exception as error:
@@ -1452,63 +1472,87 @@ class CreateRFQResponse(APIView):
         """
         try:
             data = request.data
-            rfq = RequestForQuotation.objects.filter(id=data.get("rfq_id"))
-            if rfq.exists():
-                rfq = rfq.last()
-            else:
+            rfq = RequestForQuotation.objects.select_related("buyer__user").filter(id=data.get("rfq_id")).last()
+            if not rfq:
                 raise Exception("Invalid RFQ id")
-            supplier = rfq.buyer.suppliers.filter(id=data.get("supplier_id"))
-            if supplier.exists():
-                supplier = supplier.last()
-            else:
+            supplier = rfq.buyer.suppliers.filter(id=data.get("supplier_id")).last()
+            if not supplier:
                 raise Exception("Invalid supplier id")
             items = data.get("items")
             if not items:
                 raise Exception("Items not provided")
-            body = []
+            try:
+                item_ids = [int(item.get("rfq_item_id")) for item in items]
+            except (TypeError, ValueError):
+                raise Exception("Invalid RFQ item id!")
             focus_item_id = None
-            for _,item in enumerate(items):
-                rfq_item = rfq.request_for_quotation_items.filter(id=item.get("rfq_item_id"))
-                if not rfq_item.exists():
-                   raise Exception("Invalid RFQ item id!")
-                rfq_item = rfq_item.last()
-                if rfq_item.request_for_quotation_item_response.filter(supplier=supplier).exists():
-                    continue
-                # body.append(f"{index+1}.{rfq_item.product_name}({item.get('quantity')} {rfq_item.uom})\tPrice : ₹{item.get('price')} \t Lead Time : {item.get('supplier_lead_time')}\t Remarks : {item.get('supplier_remarks')}\n")
-                rfq_response = RequestForQuotationItemResponse(request_for_quotation_item=rfq_item,supplier=supplier)
-                rfq_response.quantity = item.get("quantity")
-                rfq_response.price = item.get("price")
-                rfq_response.bought_quantity = item.get("quantity")
-                rfq_response.bought_price = item.get("price")
-                rfq_response.lead_time = item.get("supplier_lead_time")
-                rfq_response.remarks = item.get("supplier_remarks")
-                rfq_response.save()
-                if not focus_item_id:
-                    focus_item_id = rfq_item.id
-            email_obj = {
-                "to" : [supplier.buyer.user.email],
-                "cc" : [supplier.email],
-                "subject": "New quotation received",
-                "supplier_name":str(supplier.company_name),
-                "url":self._build_rfq_redirect_url(rfq.id, focus_item_id)
-            }
-            if settings.USE_CELERY:
-                CeleryEmailManager.new_rfq_response_alert.delay(email_obj)
+            created_responses = []
+            with transaction.atomic():
+                # Lock the quoted items so an order placed meanwhile cannot
+                # slip past the placed-order check below
+                responses = RequestForQuotationItemResponse.objects.filter(request_for_quotation_item=OuterRef("pk"))
+                rfq_items = (
+                    rfq.request_for_quotation_items.select_for_update()
+                    .filter(id__in=item_ids)
+                    .annotate(
+                        order_placed=Exists(responses.filter(order_status=RequestForQuotationItemResponse.ORDER_PLACED)),
+                        already_quoted=Exists(responses.filter(supplier=supplier)),
+                    )
+                    .in_bulk()
+                )
+                if len(rfq_items) != len(set(item_ids)):
+                    raise Exception("Invalid RFQ item id!")
+                # Items the supplier already quoted are skipped, as before
+                quoted_item_ids = {item_id for item_id, rfq_item in rfq_items.items() if rfq_item.already_quoted}
+                for item_id, item in zip(item_ids, items):
+                    if item_id in quoted_item_ids:
+                        continue
+                    if rfq_items[item_id].order_placed:
+                        raise Exception("Order already placed for this item")
+                    try:
+                        quantity = float(item.get("quantity"))
+                        price = float(item.get("price"))
+                    except (TypeError, ValueError):
+                        raise Exception("Quantity and price are required for every item.")
+                    quoted_item_ids.add(item_id)
+                    created_responses.append(
+                        RequestForQuotationItemResponse(
+                            request_for_quotation_item=rfq_items[item_id],
+                            supplier=supplier,
+                            quantity=quantity,
+                            price=price,
+                            bought_quantity=quantity,
+                            bought_price=price,
+                            lead_time=item.get("supplier_lead_time"),
+                            remarks=item.get("supplier_remarks"),
+                        )
+                    )
+                    if not focus_item_id:
+                        focus_item_id = item_id
+                # bulk_create skips the response signals, so refresh what they maintain
+                RequestForQuotationItemResponse.objects.bulk_create(created_responses)
+                if created_responses:
+                    refresh_rfq_activity([rfq.id])
+                    bump_buyer_data_version_on_commit(rfq.buyer_id)
+                record_quotes_received(rfq.buyer, supplier, created_responses)
+            # Alerts are coalesced into one digest per buyer by a periodic
+            # task; without Celery there is nothing to flush them, so send now
+            if settings.USE_CELERY and RFQ_RESPONSE_ALERT_WINDOW > 0:
+                record_rfq_response_alert(rfq, supplier, focus_item_id, len(created_responses))
             else:
-                EmailManager.new_rfq_response_alert(email_obj)
+                email_obj = rfq_response_alert(supplier, rfq.buyer, rfq_redirect_url(rfq.id, focus_item_id))
+                if settings.USE_CELERY:
+                    CeleryEmailManager.new_rfq_response_alert.delay(email_obj)
+                else:
+                    EmailManager.new_rfq_response_alert(email_obj)
             return Response({"success":True})    
+        except IntegrityError as error:
+            if violated_unique_constraint(error, RequestForQuotationItemResponse) in RFQ_RESPONSE_UNIQUE_CONSTRAINTS:
+                return return_400({"success":False,"error":"These items were already quoted or ordered."})
+            return return_400({"success":False,"error":f"{error}"})
         except Exception as error:
             return return_400({"success":False,"error":f"{error}"})
 
-    def _build_rfq_redirect_url(self, rfq_id, item_id):
-        base_url = getattr(settings, "FRONTEND_URL", "").rstrip("/")
-        if not base_url:
-            base_url = ""
-        rfq_url = f"{base_url}/rfq/{rfq_id}/items"
-        if item_id:
-            return f"{rfq_url}?item_id={item_id}"
-        return rfq_url
-
 class RFQItemData(APIView):
     """
         API to get and update RFQ Item responses
@@ -1521,11 +1565,17 @@ class RFQItemData(APIView):
         """
         try:
             buyer = request.user.buyer
-            rfq_item = RequestForQuotationItems.objects.get(id=rfq_item_id)
-            if rfq_item.request_for_quotation.buyer!=buyer:
+            rfq_item = RequestForQuotationItems.objects.select_related("request_for_quotation").get(id=rfq_item_id)
+            if rfq_item.request_for_quotation.buyer_id!=buyer.id:
                 raise Exception("Invalid RFQ Item ID for this buyer")
             rfq = rfq_item.request_for_quotation
             meta_data = rfq.request_for_quotation_meta_data.last()
+            # One query for every response of the item, keyed by supplier
+            responses = {}
+            order_placed = False
+            for res in rfq_item.request_for_quotation_item_response.order_by("id"):
+                responses[res.supplier_id] = res
+                order_placed = order_placed or res.order_status == RequestForQuotationItemResponse.ORDER_PLACED
             data = {
                 "item_id":rfq_item.id,
                 "product_name": rfq_item.product_name,
@@ -1542,13 +1592,12 @@ class RFQItemData(APIView):
                     "shipping_terms": meta_data.shipping_terms,
                     "currency":buyer.currency,
                 },
-                "status": "Closed" if rfq_item.request_for_quotation_item_response.filter(order_status=RequestForQuotationItemResponse.ORDER_PLACED).exists() else "Open",
+                "status": "Closed" if order_placed or rfq_item.status == RequestForQuotationItems.CLOSE else "Open",
                 "suppliers":[]
             }
             for supplier in rfq.suppliers.all():
-                res = rfq_item.request_for_quotation_item_response.filter(supplier=supplier)
-                if res.exists():
-                    res = res.last()
+                res = responses.get(supplier.id)
+                if res:
                     data["suppliers"].insert(0,{
                         "company_name":supplier.company_name,
                         "supplier_id": supplier.id,
@@ -1591,46 +1640,218 @@ class RFQItemData(APIView):
                 raise Exception("Invalid RFQ Item ID for this buyer")
             if not data.get("response_id"):
                 raise Exception("Response ID not provided!")
-            response = RequestForQuotationItemResponse.objects.get(id=data.get("response_id"))
-            meta_data = rfq_item.request_for_quotation.request_for_quotation_meta_data.last()
-
-            # Update quantity and price if provided in the request
-            if data.get("bought_quantity"):
-                response.bought_quantity = data.get("bought_quantity")
-            if data.get("bought_price"):
-                response.bought_price = data.get("bought_price")
-            
-            buyer_timezone = get_buyer_timezone(buyer)
-            email_obj = {
-                "to" : [response.supplier.email],
-                "cc" : [buyer.user.email],
-                "subject" : f"Purchase order from {buyer.company_name}",
-                "product_name": rfq_item.product_name,
-                "supplier_name": response.supplier.company_name,
-                "purchase_price": "{0} {1}".format(response.bought_price ,
-                                                   buyer.currency if buyer.currency else "(currency not set)"),
-                "quantity": str(response.bought_quantity) + ' ' + str(rfq_item.uom),
-                "lead_time": response.lead_time if response.lead_time else "",
-                "buyer_name": buyer.company_name,
-                "order_date": format_date_for_timezone(timezone.now(), buyer_timezone),
-                "shipping_terms": meta_data.shipping_terms,
-                "currency": buyer.currency,
-                "terms_and_conditions": meta_data.terms_conditions,
-                "payment_terms": meta_data.payment_terms,
-            }
+            with transaction.atomic():
+                # Lock the item and its responses so concurrent or repeated
+                # orders are serialized and only the first one is placed
+                rfq_item = RequestForQuotationItems.objects.select_for_update().get(id=rfq_item.id)
+                responses = {
+                    res.id: res
+                    for res in rfq_item.request_for_quotation_item_response.select_for_update().select_related("supplier")
+                }
+                response = responses.get(int(data.get("response_id")))
+                if not response:
+                    raise Exception("Invalid response id for this RFQ item")
+                if any(res.order_status == RequestForQuotationItemResponse.ORDER_PLACED for res in responses.values()):
+                    raise Exception("Order already placed for this item")
+
+                # Update quantity and price if provided in the request
+                if data.get("bought_quantity"):
+                    response.bought_quantity = data.get("bought_quantity")
+                if data.get("bought_price"):
+                    response.bought_price = data.get("bought_price")
+                response.order_status = RequestForQuotationItemResponse.ORDER_PLACED
+                response.save()
+                rfq_item.status = RequestForQuotationItems.CLOSE
+                rfq_item.save()
+                record_order_placed(buyer, response.supplier, response)
             if settings.USE_CELERY:
-                CeleryEmailManager.send_purchase_order.delay(email_obj)
+                CeleryEmailManager.send_purchase_orders.delay([response.id])
             else:
-                EmailManager.send_purchase_order(email_obj)
-            
-            response.order_status = RequestForQuotationItemResponse.ORDER_PLACED
-            response.save()
-            rfq_item.status = RequestForQuotationItems.CLOSE
-            rfq_item.save()
+                send_purchase_orders([response.id])
             return Response({"success":True})
+        except IntegrityError:
+            return return_400({"success":False,"error":"Order already placed for this item"})
         except Exception as error:
             return return_400({"success":False,"error":f"{error}"})
 
+class PlaceBulkOrders(APIView):
+    """
+        Award many RFQ items in one call
+        1. POST => Place an order on one response per item and send one
+           purchase order email per supplier
+    """
+    permission_classes = (IsAuthenticated,)
+    def post(self, request, rfq_id):
+        """
+            Body: {"orders": [{"rfq_item_id", "response_id", "bought_quantity", "bought_price"}]}
+        """
+        try:
+            buyer = request.user.buyer
+            orders = request.data.get("orders")
+            if not isinstance(orders, list) or not orders:
+                raise Exception("At least one order is required.")
+            rfq = RequestForQuotation.objects.filter(id=rfq_id, buyer=buyer).first()
+            if not rfq:
+                return return_400({"success": False, "error": "RFQ not found."})
+            try:
+                item_ids = [int(order.get("rfq_item_id")) for order in orders]
+                response_ids = [int(order.get("response_id")) for order in orders]
+            except (AttributeError, TypeError, ValueError):
+                raise Exception("Each order must include rfq_item_id and response_id.")
+            if len(set(item_ids)) != len(item_ids):
+                raise Exception("Each item can only be ordered once.")
+
+            now = timezone.now()
+            with transaction.atomic():
+                placed = RequestForQuotationItemResponse.objects.filter(
+                    request_for_quotation_item=OuterRef("pk"), order_status=RequestForQuotationItemResponse.ORDER_PLACED
+                )
+                rfq_items = (
+                    rfq.request_for_quotation_items.select_for_update()
+                    .filter(id__in=item_ids)
+                    .annotate(order_placed=Exists(placed))
+                    .in_bulk()
+                )
+                responses = RequestForQuotationItemResponse.objects.select_related("supplier").in_bulk(response_ids)
+                supplier_orders = {}
+                for item_id, response_id, order in zip(item_ids, response_ids, orders):
+                    rfq_item = rfq_items.get(item_id)
+                    response = responses.get(response_id)
+                    if not rfq_item:
+                        raise Exception(f"Invalid RFQ item id {item_id}")
+                    if not response or response.request_for_quotation_item_id != item_id or not response.supplier:
+                        raise Exception(f"Invalid response id {response_id} for RFQ item {item_id}")
+                    if rfq_item.order_placed:
+                        raise Exception(f"Order already placed for {rfq_item.product_name}")
+                    if order.get("bought_quantity"):
+                        response.bought_quantity = order.get("bought_quantity")
+                    if order.get("bought_price"):
+                        response.bought_price = order.get("bought_price")
+                    # bulk_update skips auto_now, and rollups read `updated`
+                    response.order_status = RequestForQuotationItemResponse.ORDER_PLACED
+                    response.updated = now
+                    rfq_item.status = RequestForQuotationItems.CLOSE
+                    rfq_item.updated = now
+                    supplier_orders.setdefault(response.supplier, []).append((rfq_item, response))
+
+                RequestForQuotationItemResponse.objects.bulk_update(
+                    [response for lines in supplier_orders.values() for _, response in lines],
+                    ["order_status", "bought_quantity", "bought_price", "updated"],
+                )
+                RequestForQuotationItems.objects.bulk_update(
+                    [rfq_item for lines in supplier_orders.values() for rfq_item, _ in lines],
+                    ["status", "updated"],
+                )
+                refresh_rfq_activity([rfq.id])
+                bump_buyer_data_version_on_commit(buyer.id)
+                for supplier, lines in supplier_orders.items():
+                    record_orders_placed(buyer, supplier, [response for _, response in lines])
+
+            placed_response_ids = [response.id for lines in supplier_orders.values() for _, response in lines]
+            if settings.USE_CELERY:
+                CeleryEmailManager.send_purchase_orders.delay(placed_response_ids)
+            else:
+                send_purchase_orders(placed_response_ids)
+            return Response({"success": True, "orders_placed": len(orders)})
+        except IntegrityError:
+            return return_400({"success": False, "error": "Order already placed for this item"})
+        except Exception as error:
+            return return_400({"success": False, "error": f"{error}"})
+
+class GetRFQQuoteMatrix(APIView):
+    """
+        Items x suppliers quote comparison for a whole RFQ
+        1. GET => Columnar matrix of every quote of the RFQ
+    """
+    permission_classes = (IsAuthenticated,)
+    def get(self, request, rfq_id):
+        """
+            The payload is columnar: `items` and `suppliers` are parallel
+            arrays, and `quotes` holds one entry per quote in parallel arrays
+            that point into them by index, so empty cells cost nothing.
+        """
+        try:
+            buyer = request.user.buyer
+            rfq = RequestForQuotation.objects.filter(id=rfq_id, buyer=buyer).first()
+            if not rfq:
+                return return_400({"success": False, "error": "RFQ not found."})
+
+            items = list(
+                rfq.request_for_quotation_items.order_by("id").values_list("id", "product_name", "quantity", "uom", "status")
+            )
+            responses = list(
+                RequestForQuotationItemResponse.objects.filter(
+                    request_for_quotation_item__request_for_quotation=rfq, supplier__isnull=False
+                )
+                .order_by("id")
+                .values_list("id", "request_for_quotation_item_id", "supplier_id", "price", "quantity", "lead_time", "order_status")
+            )
+            suppliers = list(
+                Supplier.objects.filter(
+                    Q(request_for_quotations=rfq)
+                    | Q(request_for_quotation_responses__request_for_quotation_item__request_for_quotation=rfq)
+                )
+                .distinct()
+                .order_by("company_name", "created", "id")
+                .values_list("id", "company_name")
+            )
+
+            item_index = {item[0]: index for index, item in enumerate(items)}
+            supplier_index = {supplier[0]: index for index, supplier in enumerate(suppliers)}
+            quotes = {
+                "item": [],
+                "supplier": [],
+                "response_id": [],
+                "price": [],
+                "quantity": [],
+                "lead_time": [],
+                "order_status": [],
+            }
+            best_price = [None] * len(items)
+            best_price_supplier = [None] * len(items)
+            best_lead_time = [None] * len(items)
+            best_lead_time_supplier = [None] * len(items)
+            closed = [item[4] == RequestForQuotationItems.CLOSE for item in items]
+            for response_id, item_id, supplier_id, price, quantity, lead_time, order_status in responses:
+                row, column = item_index[item_id], supplier_index[supplier_id]
+                placed = order_status == RequestForQuotationItemResponse.ORDER_PLACED
+                quotes["item"].append(row)
+                quotes["supplier"].append(column)
+                quotes["response_id"].append(response_id)
+                quotes["price"].append(price)
+                quotes["quantity"].append(quantity)
+                quotes["lead_time"].append(lead_time)
+                quotes["order_status"].append("Placed" if placed else "Pending")
+                closed[row] = closed[row] or placed
+                if price is not None and (best_price[row] is None or price < best_price[row]):
+                    best_price[row], best_price_supplier[row] = price, column
+                if lead_time is not None and (best_lead_time[row] is None or lead_time < best_lead_time[row]):
+                    best_lead_time[row], best_lead_time_supplier[row] = lead_time, column
+
+            data = {
+                "rfq_id": rfq.id,
+                "title": rfq.get_display_title(),
+                "items": {
+                    "id": [item[0] for item in items],
+                    "product_name": [item[1] for item in items],
+                    "quantity": [item[2] for item in items],
+                    "uom": [item[3] for item in items],
+                    "status": ["Closed" if item_closed else "Open" for item_closed in closed],
+                    "best_price": best_price,
+                    "best_price_supplier": best_price_supplier,
+                    "best_lead_time": best_lead_time,
+                    "best_lead_time_supplier": best_lead_time_supplier,
+                },
+                "suppliers": {
+                    "id": [supplier[0] for supplier in suppliers],
+                    "company_name": [supplier[1] for supplier in suppliers],
+                },
+                "quotes": quotes,
+            }
+            return Response({"success": True, "data": data})
+        except Exception as error:
+            return return_400({"success": False, "error": f"{error}"})
+
 class GetAllRFQDataEmail(APIView):
     """
         Get the all the rfq and create an csv of the same
@@ -1658,38 +1879,11 @@ class GetSuppliersStatsData(APIView):
     def get(self,request):
         try:
             buyer = request.user.buyer
-            suppliers_list = buyer.suppliers.all()
-            data = []
-            total_suppliers_order_value = 0
-            for supplier in suppliers_list:
-                 # Count the total number of RFQ items requested from this supplier
-                quotes_requested_count = RequestForQuotationItems.objects.filter(
-                    request_for_quotation__suppliers=supplier,
-                    request_for_quotation__buyer=buyer
-                ).count()
-                
-                quotes_received = supplier.request_for_quotation_responses.all()
-                order_placed = quotes_received.filter(order_status=RequestForQuotationItemResponse.ORDER_PLACED)
-                quotes_value = supplier.request_for_quotation_responses.aggregate(total=Sum(F('price') * F('quantity')))['total']
-                total_order_value = supplier.request_for_quotation_responses.filter(order_status=RequestForQuotationItemResponse.ORDER_PLACED).aggregate(total=Sum(F('price') * F('quantity')))['total']
-                if total_order_value:
-                    total_suppliers_order_value = total_suppliers_order_value + total_order_value
-                data.append({
-                    "supplier_id":supplier.id,
-                    "company_name":supplier.company_name,
-                    "quotes_requested":quotes_requested_count,
-                    "quotes_received":quotes_received.count(),
-                    "quotes_value":quotes_value if quotes_value else "--",
-                    "order_placed":order_placed.count(),
-                    "total_order_value":total_order_value if total_order_value else 0.00,
-                    "success_percent":f"{round(((order_placed.count()/quotes_received.count())*100),2) if quotes_received.count() else 0.00}%",
-                })
-            if total_suppliers_order_value>0:
-                for d in data:
-                    if d['total_order_value']:
-                        d["contribution_percent"] = f"{round((d['total_order_value']/total_suppliers_order_value),2)*100}%"
-                    else:
-                        d["contribution_percent"] = "--"
+            if (request.GET.get("source") or "").lower() == "live":
+                rows = compute_supplier_stats_rows(buyer)
+            else:
+                rows = get_supplier_stats_rows(buyer)
+            data = serialize_supplier_stats(rows)
             return Response({"success":True, "data":data})
 
         except Exception as error:
@@ -1697,63 +1891,63 @@ class GetSuppliersStatsData(APIView):
 
 class SendRFQReminder(APIView):
     """
-    Send reminders to suppliers who haven't quoted for a specific RFQ item.
+    Send reminders to suppliers who haven't quoted yet, for one RFQ item
+    (`rfq_item_id`), a whole RFQ (`rfq_id`) or every open RFQ of the buyer
+    (`scope: "all"`). Each supplier gets one digest of all its pending lines.
     """
     permission_classes = (IsAuthenticated,)
 
     def post(self, request):
         try:
+            buyer = request.user.buyer
             rfq_item_id = request.data.get('rfq_item_id')
-            if not rfq_item_id:
+            rfq_id = request.data.get('rfq_id')
+            if rfq_item_id:
+                owner_id = (
+                    RequestForQuotationItems.objects.filter(id=rfq_item_id)
+                    .values_list("request_for_quotation__buyer_id", flat=True)
+                    .first()
+                )
+                if owner_id is None:
+                    raise RequestForQuotationItems.DoesNotExist
+            elif rfq_id:
+                owner_id = RequestForQuotation.objects.filter(id=rfq_id).values_list("buyer_id", flat=True).first()
+                if owner_id is None:
+                    raise ValueError("Invalid RFQ ID")
+            elif request.data.get('scope') == "all":
+                owner_id = buyer.id
+            else:
                 raise ValueError("RFQ item ID is required")
-
-            rfq_item = RequestForQuotationItems.objects.get(id=rfq_item_id)
-            rfq = rfq_item.request_for_quotation
-            buyer = request.user.buyer
-
-            if rfq.buyer != buyer:
+            if owner_id != buyer.id:
                 raise ValueError("You don't have permission to send reminders for this RFQ")
 
-            suppliers_to_remind = []
-            buyer_timezone = get_buyer_timezone(buyer)
-            for supplier in rfq.suppliers.all():
-                if not RequestForQuotationItemResponse.objects.filter(
-                    request_for_quotation_item=rfq_item,
-                    supplier=supplier
-                ).exists():
-                    suppliers_to_remind.append(supplier)
-
-            if not suppliers_to_remind:
-                return Response({"success": True, "message": "All suppliers have already quoted for this item."})
-
-            rfq_response_url = f"{settings.FRONTEND_URL}/rfq-response/{rfq.id}/"
-
-            for supplier in suppliers_to_remind:
-                email_obj = {
-                    "to": [supplier.email],
-                    "cc": [buyer.user.email],
-                    "subject": f"Reminder: Quote Request for {rfq_item.product_name}",
-                    "company_name": buyer.company_name,
-                    "supplier_name": supplier.person_of_contact,
-                    "product_name": rfq_item.product_name,
-                    "quantity": rfq_item.quantity,
-                    "uom": rfq_item.uom,
-                    "specifications": rfq_item.specifications,
-                    "expected_delivery_date": format_date_for_timezone(
-                        rfq_item.expected_delivery_date, buyer_timezone
-                    )
-                    or "Not specified",
-                    "rfq_response_url": rfq_response_url + str(supplier.id)
-                }
-
-                if settings.USE_CELERY:
-                    CeleryEmailManager.send_rfq_reminder.delay(email_obj)
+            lines = pending_quote_lines(buyer, rfq_item_id=rfq_item_id, rfq_id=rfq_id)
+            if settings.USE_CELERY:
+                # The worker finds the lines again, so only ids go on the queue
+                supplier_ids = list(lines.values_list("supplier_id", flat=True))
+                pending_items = len(supplier_ids)
+                suppliers_reminded = len(set(supplier_ids))
+            else:
+                lines = list(lines)
+                pending_items = len(lines)
+                suppliers_reminded = len({line["supplier_id"] for line in lines})
+            if not pending_items:
+                if rfq_item_id:
+                    message = "All suppliers have already quoted for this item."
                 else:
-                    EmailManager.send_rfq_reminder(email_obj)
+                    message = "All suppliers have already quoted."
+                return Response({"success": True, "message": message})
+
+            if settings.USE_CELERY:
+                CeleryEmailManager.send_rfq_reminders.delay(buyer.id, rfq_item_id=rfq_item_id, rfq_id=rfq_id)
+            else:
+                send_reminder_digests(buyer, lines)
 
             return Response({
                 "success": True,
-                "message": f"Reminders sent to {len(suppliers_to_remind)} suppliers."
+                "message": f"Reminders sent to {suppliers_reminded} suppliers.",
+                "suppliers_reminded": suppliers_reminded,
+                "pending_items": pending_items,
             })
 
         except RequestForQuotationItems.DoesNotExist:
@@ -1763,140 +1957,17 @@ class SendRFQReminder(APIView):
 
 class DashboardStats(APIView):
     permission_classes = (IsAuthenticated,)
+    FILTERS = ("today", "7days", "30days", "90days", "all")
 
     def get(self, request):
         try:
             filter_type = request.GET.get('filter', 'all')
+            if filter_type not in self.FILTERS:
+                filter_type = 'all'
             buyer = request.user.buyer
 
-            # Define the date range based on the filter
-            end_date = timezone.now()
-            if filter_type == 'today':
-                start_date = end_date.replace(hour=0, minute=0, second=0, microsecond=0)
-            elif filter_type == '7days':
-                start_date = end_date - timezone.timedelta(days=7)
-            elif filter_type == '30days':
-                start_date = end_date - timezone.timedelta(days=30)
-            elif filter_type == '90days':
-                start_date = end_date - timezone.timedelta(days=90)
-            else:  # 'all'
-                start_date = None
-
-            # Apply date filter if applicable
-            date_filter = Q() if start_date is None else Q(created__gte=start_date, created__lte=end_date)
-
-            # 1. RFQs
-            rfqs = RequestForQuotation.objects.filter(buyer=buyer).filter(date_filter)
-            rfq_items = RequestForQuotationItems.objects.filter(request_for_quotation__in=rfqs)
-            
-            # 1.1 Open RFQs count
-            open_rfqs_count = rfqs.filter(request_for_quotation_items__status=RequestForQuotationItems.OPEN).distinct().count()
-
-            # 1.2 Total RFQs count
-            total_rfqs_count = rfqs.count()
-
-            # 1.3 Average item SLA
-            avg_sla = rfq_items.filter(status=RequestForQuotationItems.CLOSE).annotate(
-                sla=ExpressionWrapper(
-                    F('request_for_quotation_item_response__updated') - F('created'),
-                    output_field=DurationField()
-                )
-            ).aggregate(avg_sla=Avg('sla'))['avg_sla']
-
-            # 1.4 RFQs count by product
-            rfqs_by_product = rfq_items.values('product_name').annotate(count=Count('id'))
-
-            # 1.5 Total purchase value
-            total_purchase_value = RequestForQuotationItemResponse.objects.filter(
-                request_for_quotation_item__in=rfq_items,
-                order_status=RequestForQuotationItemResponse.ORDER_PLACED
-            ).aggregate(total=Sum(F('price') * F('quantity')))['total'] or 0
-
-            # 2. Suppliers
-            suppliers = Supplier.objects.filter(buyer=buyer)
-
-            # 2.1 Total suppliers count
-            total_suppliers_count = suppliers.count()
-
-            # 2.2 Suppliers by tag - count
-            suppliers_by_tag = suppliers.values('categories__name').annotate(count=Count('id'))
-
-            # 2.3 Suppliers by product count
-            suppliers_by_product = RequestForQuotationItemResponse.objects.filter(
-                request_for_quotation_item__in=rfq_items
-            ).values('request_for_quotation_item__product_name').annotate(
-                supplier_count=Count('supplier', distinct=True)
-            ).values('request_for_quotation_item__product_name', 'supplier_count')
-
-            # 2.4 Suppliers by response% - FIXED: add condition to avoid division by zero
-            suppliers_response = suppliers.annotate(
-                total_rfqs=Count('request_for_quotations'),
-                responded_rfqs=Count('request_for_quotation_responses')
-            ).annotate(
-                response_rate=Case(
-                    When(total_rfqs__gt=0, 
-                         then=ExpressionWrapper(
-                             F('responded_rfqs') * 100.0 / F('total_rfqs'),
-                             output_field=FloatField()
-                         )),
-                    default=Value(0.0),
-                    output_field=FloatField()
-                )
-            )
-
-            # 2.5 & 2.6 Purchase count and value by supplier
-            supplier_purchases = RequestForQuotationItemResponse.objects.filter(
-                request_for_quotation_item__in=rfq_items,
-                order_status=RequestForQuotationItemResponse.ORDER_PLACED
-            ).values('supplier__company_name').annotate(
-                count=Count('id'),
-                value=Sum(F('price') * F('quantity'))
-            ).order_by('-value')
-
-            # 2.7 Lead time by suppliers
-            lead_time_by_suppliers = suppliers.annotate(
-                avg_lead_time=Avg(
-                    Cast('request_for_quotation_responses__lead_time', output_field=FloatField())
-                )
-            ).exclude(avg_lead_time__isnull=True).order_by('avg_lead_time').values('company_name', 'avg_lead_time')
-
-            # FIXED: calculate percentages safely, avoiding division by zero
-            total_purchase_count = sum(item['count'] for item in supplier_purchases)
-            
-            for item in supplier_purchases:
-                if total_purchase_count > 0:
-                    item['count_percentage'] = (item['count'] / total_purchase_count) * 100
-                else:
-                    item['count_percentage'] = 0.0
-                    
-                if total_purchase_value > 0:
-                    item['value_percentage'] = (item['value'] / total_purchase_value) * 100
-                else:
-                    item['value_percentage'] = 0.0
-
-            response_data = {
-                "rfqs": {
-                    "open_rfqs_count": open_rfqs_count,
-                    "total_rfqs_count": total_rfqs_count,
-                    "average_item_sla_in_hours": avg_sla.total_seconds() / 3600 if avg_sla else 0,  # FIXED: return 0 instead of None
-                    "rfqs_by_product": list(rfqs_by_product),
-                    "total_purchase_value": total_purchase_value
-                },
-                "suppliers": {
-                    "total_suppliers_count": total_suppliers_count,
-                    "suppliers_by_tag": list(suppliers_by_tag),
-                    "suppliers_by_product": list(suppliers_by_product),
-                    "suppliers_by_response_rate": list(suppliers_response.values('company_name', 'response_rate')),
-                    "purchase_by_supplier": list(supplier_purchases),
-                    "lead_time_by_suppliers": [
-                        {
-                            "company_name": item['company_name'],
-                            "avg_lead_time_days": item['avg_lead_time']
-                        }
-                        for item in lead_time_by_suppliers
-                    ]
-                }
-            }
+            cache_key = buyer_cache_key(buyer.id, "dashboard-stats", filter_type)
+            response_data = get_or_compute(cache_key, lambda: self._compute_stats(buyer, filter_type))
 
             return Response({"success": True, "data": response_data})
 
@@ -1909,6 +1980,98 @@ class DashboardStats(APIView):
             # Return a more informative error response
             return return_400({"success": False, "error": str(error), "message": "Error generating dashboard statistics"})
 
+    @staticmethod
+    def _compute_stats(buyer, filter_type):
+        # Windows are whole days, ending today, as rollups are bucketed per day
+        today = timezone.localdate()
+        if filter_type == 'today':
+            start_day = today
+        elif filter_type == '7days':
+            start_day = today - timezone.timedelta(days=7)
+        elif filter_type == '30days':
+            start_day = today - timezone.timedelta(days=30)
+        elif filter_type == '90days':
+            start_day = today - timezone.timedelta(days=90)
+        else:  # 'all'
+            start_day = None
+
+        # 1. RFQs and the windowed supplier metrics (1.1-1.5, 2.3, 2.5 & 2.6) come
+        # from the daily rollups, with today's rows aggregated live
+        rollup_stats = get_dashboard_rollup_stats(buyer, start_day)
+        total_purchase_value = rollup_stats["total_purchase_value"]
+        supplier_purchases = rollup_stats["purchase_by_supplier"]
+
+        # 2. Suppliers
+        suppliers = Supplier.objects.filter(buyer=buyer)
+
+        # 2.1 Total suppliers count
+        total_suppliers_count = suppliers.count()
+
+        # 2.2 Suppliers by tag - count
+        suppliers_by_tag = suppliers.values('categories__name').annotate(count=Count('id'))
+
+        # 2.4 Suppliers by response% - FIXED: add condition to avoid division by zero
+        suppliers_response = suppliers.annotate(
+            total_rfqs=Count('request_for_quotations'),
+            responded_rfqs=Count('request_for_quotation_responses')
+        ).annotate(
+            response_rate=Case(
+                When(total_rfqs__gt=0, 
+                     then=ExpressionWrapper(
+                         F('responded_rfqs') * 100.0 / F('total_rfqs'),
+                         output_field=FloatField()
+                     )),
+                default=Value(0.0),
+                output_field=FloatField()
+            )
+        )
+
+        # 2.7 Lead time by suppliers
+        lead_time_by_suppliers = suppliers.annotate(
+            avg_lead_time=Avg(
+                Cast('request_for_quotation_responses__lead_time', output_field=FloatField())
+            )
+        ).exclude(avg_lead_time__isnull=True).order_by('avg_lead_time').values('company_name', 'avg_lead_time')
+
+        # FIXED: calculate percentages safely, avoiding division by zero
+        total_purchase_count = sum(item['count'] for item in supplier_purchases)
+
+        for item in supplier_purchases:
+            if total_purchase_count > 0:
+                item['count_percentage'] = (item['count'] / total_purchase_count) * 100
+            else:
+                item['count_percentage'] = 0.0
+
+            if total_purchase_value > 0:
+                item['value_percentage'] = (item['value'] / total_purchase_value) * 100
+            else:
+                item['value_percentage'] = 0.0
+
+        response_data = {
+            "rfqs": {
+                "open_rfqs_count": rollup_stats["open_rfqs_count"],
+                "total_rfqs_count": rollup_stats["total_rfqs_count"],
+                "average_item_sla_in_hours": rollup_stats["average_item_sla_in_hours"],
+                "rfqs_by_product": rollup_stats["rfqs_by_product"],
+                "total_purchase_value": total_purchase_value
+            },
+            "suppliers": {
+                "total_suppliers_count": total_suppliers_count,
+                "suppliers_by_tag": list(suppliers_by_tag),
+                "suppliers_by_product": rollup_stats["suppliers_by_product"],
+                "suppliers_by_response_rate": list(suppliers_response.values('company_name', 'response_rate')),
+                "purchase_by_supplier": supplier_purchases,
+                "lead_time_by_suppliers": [
+                    {
+                        "company_name": item['company_name'],
+                        "avg_lead_time_days": item['avg_lead_time']
+                    }
+                    for item in lead_time_by_suppliers
+                ]
+            }
+        }
+        return response_data
+
 
 class GetSubscriptionStatus(APIView):
     permission_classes = (IsAuthenticated,)
@@ -0,0 +1,143 @@
+"""
+Measure email throughput of one connection per message (message.send())
+against the pooled batch API (api.mailer.send_email_messages).
+
+Backends:
+    locmem  Django's in-memory backend, isolating the Python-side cost.
+    smtp    Django's SMTP backend against a local SMTP stand-in started by
+            this script. --greeting-ms delays each new session's greeting to
+            mimic the TLS handshake of a remote server.
+
+Usage:
+    python benchmarks/bench_email_batch.py
+    python benchmarks/bench_email_batch.py --batches 1 50 500 --greeting-ms 50
+"""
+import argparse
+import os
+import socketserver
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "vms_backend.settings_test")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.conf import settings  # noqa: E402
+from django.core.mail import EmailMultiAlternatives  # noqa: E402
+
+from api.mailer import pool, send_email_messages  # noqa: E402
+
+BACKENDS = {
+    "locmem": "django.core.mail.backends.locmem.EmailBackend",
+    "smtp": "django.core.mail.backends.smtp.EmailBackend",
+}
+
+
+class SMTPStandIn(socketserver.StreamRequestHandler):
+    """Just enough ESMTP to accept messages and count sessions."""
+
+    greeting_delay = 0
+    sessions = 0
+
+    def reply(self, line):
+        self.wfile.write(f"{line}\r\n".encode())
+
+    def handle(self):
+        SMTPStandIn.sessions += 1
+        time.sleep(self.greeting_delay)
+        self.reply("220 localhost ESMTP stand-in")
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode(errors="replace").strip().upper()
+            if command.startswith("EHLO"):
+                self.wfile.write(b"250-localhost\r\n250 8BITMIME\r\n")
+            elif command == "DATA":
+                self.reply("354 End data with <CR><LF>.<CR><LF>")
+                while self.rfile.readline() not in (b".\r\n", b""):
+                    pass
+                self.reply("250 OK")
+            elif command == "QUIT":
+                self.reply("221 Bye")
+                return
+            else:
+                self.reply("250 OK")
+
+
+def build_messages(count):
+    messages = []
+    for index in range(count):
+        message = EmailMultiAlternatives(
+            subject=f"New Quotation Requested {index}",
+            body="Please view this email with an HTML-compatible email client.",
+            from_email="rfq@example.com",
+            to=[f"supplier{index}@example.com"],
+        )
+        message.attach_alternative("<p>" + "Quote request line. " * 200 + "</p>", "text/html")
+        messages.append(message)
+    return messages
+
+
+def send_one_by_one(messages):
+    for message in messages:
+        message.send()
+
+
+def send_pooled(messages):
+    send_email_messages(messages)
+    pool.close()
+
+
+STRATEGIES = {"per-message": send_one_by_one, "pooled": send_pooled}
+
+
+def run_case(strategy, count):
+    messages = build_messages(count)
+    SMTPStandIn.sessions = 0
+    started = time.perf_counter()
+    STRATEGIES[strategy](messages)
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batches", type=int, nargs="+", default=[1, 50, 500])
+    parser.add_argument("--backends", nargs="+", choices=BACKENDS, default=list(BACKENDS))
+    parser.add_argument("--greeting-ms", type=float, default=0)
+    args = parser.parse_args()
+
+    SMTPStandIn.greeting_delay = args.greeting_ms / 1000
+    server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), SMTPStandIn)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    settings.SEND_EMAILS = True
+    settings.EMAIL_HOST, settings.EMAIL_PORT = server.server_address
+    settings.EMAIL_USE_TLS = False
+    settings.EMAIL_HOST_USER = settings.EMAIL_HOST_PASSWORD = ""
+    # Measure connection reuse, not the provider rate limit
+    settings.EMAIL_RATE_LIMITS = {}
+
+    print(f"{'backend':<7} {'strategy':<12} {'batch':>6} {'sessions':>9} {'seconds':>8} {'msg/s':>9}")
+    try:
+        for backend in args.backends:
+            settings.EMAIL_BACKEND = BACKENDS[backend]
+            for count in args.batches:
+                for strategy in STRATEGIES:
+                    elapsed = run_case(strategy, count)
+                    sessions = SMTPStandIn.sessions if backend == "smtp" else "-"
+                    print(
+                        f"{backend:<7} {strategy:<12} {count:>6} {sessions:>9} "
+                        f"{elapsed:>8.3f} {count / elapsed:>9.0f}"
+                    )
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Compare sending one new-quote alert per response against the coalesced
+per-buyer digest, counting rendered emails and SMTP connections.
+
+Emails are rendered with the real templates and handed to a counting email
+backend, so nothing leaves the machine and no database is needed.
+
+Usage:
+    python benchmarks/bench_response_alerts.py
+    python benchmarks/bench_response_alerts.py --buyers 10 --responses 5 40
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "vms_backend.settings_test")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.conf import settings  # noqa: E402
+from django.contrib.auth.models import User  # noqa: E402
+from django.core.mail.backends.base import BaseEmailBackend  # noqa: E402
+
+from api.helper import EmailManager  # noqa: E402
+from api.models import Buyer, PendingNotification, RequestForQuotation, Supplier  # noqa: E402
+from api.notifications import (  # noqa: E402
+    build_rfq_response_digest,
+    rfq_redirect_url,
+    rfq_response_alert,
+    send_rfq_response_digest,
+)
+
+
+class CountingEmailBackend(BaseEmailBackend):
+    """Opens one simulated SMTP connection per send call, like the SMTP backend."""
+
+    connections = 0
+    messages = 0
+
+    def send_messages(self, email_messages):
+        CountingEmailBackend.connections += 1
+        CountingEmailBackend.messages += len(email_messages)
+        for message in email_messages:
+            message.message()
+        return len(email_messages)
+
+
+def generate_alerts(buyer_count, responses_per_buyer):
+    for buyer_index in range(buyer_count):
+        buyer = Buyer(
+            id=buyer_index + 1,
+            company_name=f"Buyer {buyer_index}",
+            user=User(email=f"buyer{buyer_index}@example.com"),
+        )
+        rfq = RequestForQuotation(id=buyer_index + 1, title=f"Morning RFQ {buyer_index}")
+        yield buyer, [
+            PendingNotification(
+                buyer=buyer,
+                request_for_quotation=rfq,
+                rfq_item_id=index + 1,
+                supplier=Supplier(company_name=f"Supplier {index}", email=f"supplier{index}@example.com"),
+                quotes_count=3,
+            )
+            for index in range(responses_per_buyer)
+        ]
+
+
+def send_immediately(alerts):
+    for buyer, notifications in alerts:
+        for notification in notifications:
+            url = rfq_redirect_url(notification.request_for_quotation.id, notification.rfq_item_id)
+            EmailManager.new_rfq_response_alert(rfq_response_alert(notification.supplier, buyer, url))
+
+
+def send_coalesced(alerts):
+    for buyer, notifications in alerts:
+        send_rfq_response_digest(build_rfq_response_digest(buyer, notifications))
+
+
+STRATEGIES = {"immediate": send_immediately, "coalesced": send_coalesced}
+
+
+def run_case(strategy, buyer_count, responses_per_buyer):
+    CountingEmailBackend.connections = CountingEmailBackend.messages = 0
+    alerts = list(generate_alerts(buyer_count, responses_per_buyer))
+    started = time.perf_counter()
+    STRATEGIES[strategy](alerts)
+    elapsed = time.perf_counter() - started
+    return CountingEmailBackend.messages, CountingEmailBackend.connections, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--buyers", type=int, default=5)
+    parser.add_argument("--responses", type=int, nargs="+", default=[1, 10, 40])
+    args = parser.parse_args()
+
+    settings.EMAIL_BACKEND = f"{__name__}.CountingEmailBackend"
+    settings.SEND_EMAILS = True
+
+    print(f"{'strategy':<10} {'buyers':>7} {'responses':>10} {'emails':>7} {'smtp':>6} {'seconds':>8}")
+    for responses in args.responses:
+        for strategy in STRATEGIES:
+            emails, connections, elapsed = run_case(strategy, args.buyers, responses)
+            print(f"{strategy:<10} {args.buyers:>7} {args.buyers * responses:>10} {emails:>7} {connections:>6} {elapsed:>8.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Compare rendering the RFQ created email in full for every supplier against
+rendering it once per RFQ and personalizing it per supplier.
+
+Usage:
+    python benchmarks/bench_rfq_created_render.py
+    python benchmarks/bench_rfq_created_render.py --items 300 --suppliers 10 60
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "vms_backend.settings_test")
+
+import django  # noqa: E402
+
+django.setup()
+
+from api.email_templates import PersonalizedEmail, render_email  # noqa: E402
+from api.helper import RFQ_CREATED_RECIPIENT_FIELDS  # noqa: E402
+
+TEMPLATE = "RFQ_Created_Email_Template.html"
+
+
+def email_objs(item_count, supplier_count):
+    items = [
+        {
+            "product_name": f"Product {index}",
+            "quantity": 100,
+            "uom": "pcs",
+            "specifications": "Grade A, cold rolled",
+            "expected_delivery_date": "2030-01-15",
+        }
+        for index in range(item_count)
+    ]
+    return [
+        {
+            "to": [f"supplier{index}@example.com"],
+            "items": items,
+            "rfq_id": 1,
+            "total_no_of_items": item_count,
+            "company_name": "Buyer Co",
+            "supplier_name": f"Supplier {index}",
+            "url": f"https://app.example.com/rfq-response/1/{index}",
+        }
+        for index in range(supplier_count)
+    ]
+
+
+def render_each(objs):
+    return [render_email(TEMPLATE, email_obj) for email_obj in objs]
+
+
+def render_once(objs):
+    shared = PersonalizedEmail(TEMPLATE, objs[0], RFQ_CREATED_RECIPIENT_FIELDS)
+    return [shared.personalize(email_obj) for email_obj in objs]
+
+
+STRATEGIES = {"per-supplier": (render_each, lambda count: count), "render-once": (render_once, lambda count: 1)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=300)
+    parser.add_argument("--suppliers", type=int, nargs="+", default=[1, 10, 60])
+    args = parser.parse_args()
+
+    render_email(TEMPLATE, email_objs(1, 1)[0])  # compile the template outside the timings
+    print(f"{'strategy':<13} {'items':>6} {'suppliers':>10} {'renders':>8} {'seconds':>8}")
+    for suppliers in args.suppliers:
+        objs = email_objs(args.items, suppliers)
+        outputs = {}
+        for strategy, (render, renders) in STRATEGIES.items():
+            started = time.perf_counter()
+            outputs[strategy] = render(objs)
+            elapsed = time.perf_counter() - started
+            print(f"{strategy:<13} {args.items:>6} {suppliers:>10} {renders(suppliers):>8} {elapsed:>8.3f}")
+        assert outputs["per-supplier"] == outputs["render-once"]
+
+
+if __name__ == "__main__":
+    main()
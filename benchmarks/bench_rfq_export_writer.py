@@ -0,0 +1,114 @@
+"""
+Compare the streaming RFQ export writers against the old pandas path.
+
+Each case runs in a fresh subprocess so peak RSS is measured in isolation.
+The pandas baseline only runs with --with-pandas, and never above
+--pandas-max-rows: it holds every row in memory and needs more than 20 GB at
+1M rows.
+
+Usage:
+    python benchmarks/bench_rfq_export_writer.py
+    python benchmarks/bench_rfq_export_writer.py --rows 10000 100000
+    python benchmarks/bench_rfq_export_writer.py --with-pandas
+"""
+import argparse
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api.export_writers import CSV_GZ, XLSX, write_export  # noqa: E402
+
+COLUMNS = [
+    "RFQ Item Id", "Date", "Terms & Conditions", "Payment Terms", "Shipping Terms",
+    "Product Name", "Quantity", "UOM", "Specification", "Expected Delivery",
+    "RFQ Status", "Supplier Name", "Supplier POC", "Supplier Phone", "Supplier Email",
+    "Supplier Categories", "Supplier Price", "Supplier Quantity", "Lead Time",
+    "Seller Remarks", "Quote Received On", "Order Status", "Order Placed On",
+]
+WRITERS = (XLSX, CSV_GZ)
+PANDAS = "pandas"
+
+
+def generate_rows(count):
+    for index in range(count):
+        yield {
+            "RFQ Item Id": index // 50,
+            "Date": "01-Jan-2025",
+            "Terms & Conditions": "Net 30",
+            "Payment Terms": "Standard terms apply",
+            "Shipping Terms": "FOB",
+            "Product Name": f"Product {index % 500}",
+            "Quantity": 100.0,
+            "UOM": "pcs",
+            "Specification": "Grade A, cold rolled",
+            "Expected Delivery": "15-Jan-2025",
+            "RFQ Status": "Open",
+            "Supplier Name": f"Supplier {index % 40}",
+            "Supplier POC": "Contact Person",
+            "Supplier Phone": "+91 98765 43210",
+            "Supplier Email": f"supplier{index % 40}@example.com",
+            "Supplier Categories": "Metals , Fasteners",
+            "Supplier Price": 12.5,
+            "Supplier Quantity": 100.0,
+            "Lead Time": 7,
+            "Seller Remarks": None,
+            "Quote Received On": "02-Jan-2025",
+            "Order Status": "Pending",
+            "Order Placed On": None,
+        }
+
+
+def run_case(writer, rows, directory):
+    extension = XLSX if writer == PANDAS else writer
+    path = os.path.join(directory, f"export_{writer.replace('.', '_')}_{rows}.{extension}")
+    started = time.perf_counter()
+    if writer == PANDAS:
+        import pandas as pd
+
+        data = list(generate_rows(rows))
+        pd.DataFrame(data).to_excel(path, index=False)
+    else:
+        write_export(generate_rows(rows), path, COLUMNS, writer)
+    elapsed = time.perf_counter() - started
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    size_mb = os.path.getsize(path) / (1024 * 1024)
+    print(f"{writer},{rows},{elapsed:.2f},{peak_mb:.1f},{size_mb:.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--writers", nargs="+", choices=WRITERS, default=list(WRITERS))
+    parser.add_argument("--with-pandas", action="store_true", help="Also time the old pandas path.")
+    parser.add_argument("--pandas-max-rows", type=int, default=100_000)
+    parser.add_argument("--case", nargs=2, metavar=("WRITER", "ROWS"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        if args.case:
+            run_case(args.case[0], int(args.case[1]), directory)
+            return
+
+        print(f"{'writer':<8} {'rows':>9} {'seconds':>9} {'peak MB':>9} {'file MB':>9}")
+        for rows in args.rows:
+            writers = list(args.writers)
+            if args.with_pandas and rows <= args.pandas_max_rows:
+                writers.insert(0, PANDAS)
+            for writer in writers:
+                output = subprocess.run(
+                    [sys.executable, __file__, "--case", writer, str(rows)],
+                    capture_output=True,
+                    text=True,
+                    check=True,
+                ).stdout.strip()
+                name, count, seconds, peak, size = output.split(",")
+                print(f"{name:<8} {int(count):>9} {seconds:>9} {peak:>9} {size:>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -15,9 +15,28 @@ app.conf.update(
 app.config_from_object('django.conf:settings', namespace = 'CELERY')
 
 # Celery Beat Settings
-app.conf.beat_schedule = {}
+# The schedule only runs with a beat process next to the workers, e.g.
+#   celery -A vms_backend worker -Q celery,email_queue
+#   celery -A vms_backend beat
+app.conf.beat_schedule = {
+    "refresh-dashboard-rollups": {
+        "task": "api.task.refresh_dashboard_rollups",
+        "schedule": settings.DASHBOARD_ROLLUP_INTERVAL,
+    },
+    "flush-pending-notifications": {
+        "task": "api.task.flush_pending_notifications",
+        "schedule": settings.NOTIFICATION_FLUSH_INTERVAL,
+    },
+    "drain-email-outbox": {
+        "task": "api.task.drain_email_outbox",
+        "schedule": settings.EMAIL_OUTBOX_DRAIN_INTERVAL,
+        "options": {"queue": "email_queue"},
+    },
+}
 
 app.autodiscover_tasks()
+# autodiscover_tasks only finds `tasks` modules; the api tasks live in api/task.py
+app.conf.imports = ("api.task",)
 
 @app.task(bind = True)
 def debug_task(self):
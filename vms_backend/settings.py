@@ -132,6 +132,39 @@ DATABASES = {
 }
 
 
+# Cache
+# Shared across worker processes so write-driven invalidation reaches every worker.
+# Run `python manage.py createcachetable` when using the database backend.
+# The database backend culls 1 / CULL_FREQUENCY of its keys once it holds
+# MAX_ENTRIES, expired or not. Cached results can be culled; buyer data
+# versions, single-flight locks and email rate slots live in the separate
+# "coordination" cache, sized so that it only ever drops expired keys.
+
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv('CACHE_BACKEND', 'django.core.cache.backends.db.DatabaseCache'),
+        'LOCATION': os.getenv('CACHE_LOCATION', 'django_cache'),
+        'OPTIONS': {
+            'MAX_ENTRIES': int(os.getenv('CACHE_MAX_ENTRIES', 20000)),
+            'CULL_FREQUENCY': int(os.getenv('CACHE_CULL_FREQUENCY', 10)),
+        },
+    },
+    'coordination': {
+        'BACKEND': os.getenv('COORDINATION_CACHE_BACKEND', 'django.core.cache.backends.db.DatabaseCache'),
+        'LOCATION': os.getenv('COORDINATION_CACHE_LOCATION', 'django_cache_coordination'),
+        'OPTIONS': {
+            'MAX_ENTRIES': int(os.getenv('COORDINATION_CACHE_MAX_ENTRIES', 1000000)),
+            'CULL_FREQUENCY': int(os.getenv('COORDINATION_CACHE_CULL_FREQUENCY', 10)),
+        },
+    },
+}
+DASHBOARD_CACHE_TIMEOUT = int(os.getenv("DASHBOARD_CACHE_TIMEOUT", 300))
+DASHBOARD_ROLLUP_INTERVAL = int(os.getenv("DASHBOARD_ROLLUP_INTERVAL", 600))
+# Seconds a buyer's first new-quote alert waits for others to join its digest
+RFQ_RESPONSE_ALERT_WINDOW = int(os.getenv("RFQ_RESPONSE_ALERT_WINDOW", 300))
+NOTIFICATION_FLUSH_INTERVAL = int(os.getenv("NOTIFICATION_FLUSH_INTERVAL", 60))
+
+
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
 
@@ -192,6 +225,24 @@ DEFAULT_FROM_EMAIL='VMS Support'
 DEFAULT_EMAIL_CC_LIST = []
 DEFAULT_EMAIL_BCC_LIST = [""]
 SEND_EMAILS = True
+# Seconds a worker keeps an idle SMTP connection open for the next send
+EMAIL_CONNECTION_IDLE_TIMEOUT = int(os.getenv("EMAIL_CONNECTION_IDLE_TIMEOUT", 30))
+# Sends per second and burst size per email backend, shared by all workers
+# through the cache; a backend without an entry is not paced
+EMAIL_RATE_LIMITS = {
+    "django.core.mail.backends.smtp.EmailBackend": {
+        "rate": float(os.getenv("EMAIL_SEND_RATE", 10)),
+        "burst": int(os.getenv("EMAIL_SEND_BURST", 20)),
+    },
+}
+# Share of the send rate kept for transactional emails over bulk fan-outs
+EMAIL_TRANSACTIONAL_SHARE = float(os.getenv("EMAIL_TRANSACTIONAL_SHARE", 0.2))
+# Transactional email outbox drained by Celery beat
+EMAIL_OUTBOX_DRAIN_INTERVAL = int(os.getenv("EMAIL_OUTBOX_DRAIN_INTERVAL", 10))
+EMAIL_OUTBOX_BATCH_SIZE = int(os.getenv("EMAIL_OUTBOX_BATCH_SIZE", 100))
+EMAIL_OUTBOX_MAX_ATTEMPTS = int(os.getenv("EMAIL_OUTBOX_MAX_ATTEMPTS", 5))
+# Seconds before the first retry of a failed email; doubles on each attempt
+EMAIL_OUTBOX_RETRY_BACKOFF = int(os.getenv("EMAIL_OUTBOX_RETRY_BACKOFF", 60))
 
 SUBSCRIPTION_GRACE_PERIOD_DAYS = int(os.getenv("SUBSCRIPTION_GRACE_PERIOD_DAYS", 3))
 SUBSCRIPTION_PAYWALL_PERCENT = int(os.getenv("SUBSCRIPTION_PAYWALL_PERCENT", 10))
@@ -202,6 +253,10 @@ RFQ_ATTACHMENT_MAX_FILES_PER_ITEM = int(os.getenv("RFQ_ATTACHMENT_MAX_FILES_PER_
 RFQ_ATTACHMENT_STORAGE_QUOTA_MB = int(os.getenv("RFQ_ATTACHMENT_STORAGE_QUOTA_MB", 100))
 RFQ_ATTACHMENT_VIRUS_SCAN_ENABLED = get_bool_env("RFQ_ATTACHMENT_VIRUS_SCAN_ENABLED", False)
 
+# RFQ Export Settings
+RFQ_EXPORT_FORMAT = os.getenv("RFQ_EXPORT_FORMAT", "xlsx")  # "xlsx" or "csv.gz"
+RFQ_EXPORT_CHUNK_SIZE = int(os.getenv("RFQ_EXPORT_CHUNK_SIZE", 200))
+
 # Media / Storage Settings
 USE_S3_FOR_MEDIA = get_bool_env("USE_S3_FOR_MEDIA", False)
 MEDIA_URL = "/media/"
@@ -60,3 +60,13 @@ MIGRATION_MODULES = {
 }
 
 MEDIA_ROOT = os.path.join(BASE_DIR, 'tmp_test_media')
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    "coordination": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "coordination",
+    },
+}